@@ -6,6 +6,7 @@ from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.v1.services import ServiceMixin
+from src.api.v2.services.cache_keys import CacheEvent
 from src.db.cache import AbstractCache, get_cache
 from src.db.db import get_async_session
 from src.models import DishCreate, DishList, DishRead, DishUpdate
@@ -62,6 +63,11 @@ class DishService(ServiceMixin):
         await self.cache.delete(name="menu-list")
         await self.cache.delete(name="submenu-list")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(
+            CacheEvent.DISH_CREATE,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+        )
         return DishRead.from_orm(new_dish)
 
     async def update(self, dish_id: uuid_pkg.UUID, data: DishUpdate) -> DishRead:
@@ -74,6 +80,11 @@ class DishService(ServiceMixin):
             )
         await self.cache.delete(name=f"{dish_id}")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(
+            CacheEvent.DISH_UPDATE,
+            submenu_id=updated_dish.submenu_id,
+            dish_id=dish_id,
+        )
         return DishRead.from_orm(updated_dish)
 
     async def delete(
@@ -83,12 +94,20 @@ class DishService(ServiceMixin):
         dish_id: uuid_pkg.UUID,
     ) -> bool:
         """Удалить блюдо."""
-        is_deleted = await self.repository.delete(dish_id=dish_id)
+        parents = await self.repository.delete(dish_id=dish_id)
         await self.cache.delete(name=f"{dish_id}")
         await self.cache.delete(name=f"{submenu_id}")
         await self.cache.delete(name=f"{menu_id}")
         await self.cache.delete(name=self.cache_key)
-        return is_deleted
+        if parents:
+            real_menu_id, real_submenu_id = parents
+            await self.invalidate(
+                CacheEvent.DISH_DELETE,
+                menu_id=real_menu_id,
+                submenu_id=real_submenu_id,
+                dish_id=dish_id,
+            )
+        return True
 
 
 async def get_dish_service(
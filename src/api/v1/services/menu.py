@@ -6,6 +6,7 @@ from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.v1.services import ServiceMixin
+from src.api.v2.services.cache_keys import CacheEvent
 from src.db.cache import AbstractCache, get_cache
 from src.db.db import get_async_session
 from src.models import MenuCreate, MenuList, MenuRead, MenuUpdate
@@ -52,6 +53,7 @@ class MenuService(ServiceMixin):
         """Создать меню."""
         new_menu = await self.repository.add(data=data)
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(CacheEvent.MENU_CREATE)
         return MenuRead.from_orm(new_menu)
 
     async def update(self, menu_id: uuid_pkg.UUID, data: MenuUpdate) -> MenuRead:
@@ -64,6 +66,7 @@ class MenuService(ServiceMixin):
             )
         await self.cache.delete(name=f"{menu_id}")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(CacheEvent.MENU_UPDATE, menu_id=menu_id)
         return MenuRead.from_orm(updated_menu)
 
     async def delete(self, menu_id: uuid_pkg.UUID) -> bool:
@@ -71,6 +74,7 @@ class MenuService(ServiceMixin):
         is_deleted = await self.repository.delete(menu_id=menu_id)
         await self.cache.delete(name=f"{menu_id}")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(CacheEvent.MENU_DELETE, menu_id=menu_id)
         return is_deleted
 
 
@@ -1,5 +1,7 @@
+import uuid as uuid_pkg
 from dataclasses import dataclass
 
+from src.api.v2.services.cache_keys import invalidation_tags
 from src.db import dummy_cache
 from src.db.cache import AbstractCache
 from src.repositories import AbstractRepository
@@ -13,3 +15,11 @@ class ServiceMixin:
     def __post_init__(self):
         if self.cache is None:
             self.cache = dummy_cache.DummyCache()
+
+    async def invalidate(self, event: str, **ids: uuid_pkg.UUID) -> None:
+        """Сбросить ключи v2, устаревшие после записи через v1.
+
+        Кэш у версий общий, поэтому запись через v1 должна сбрасывать
+        те же теги, что и запись через v2.
+        """
+        await self.cache.invalidate_tags(*invalidation_tags(event, **ids))
@@ -6,6 +6,7 @@ from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.api.v1.services import ServiceMixin
+from src.api.v2.services.cache_keys import CacheEvent
 from src.db.cache import AbstractCache, get_cache
 from src.db.db import get_async_session
 from src.models import (
@@ -61,6 +62,7 @@ class SubmenuService(ServiceMixin):
         await self.cache.delete(name=f"{menu_id}")
         await self.cache.delete(name="menu-list")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(CacheEvent.SUBMENU_CREATE, menu_id=menu_id)
         return SubmenuRead.from_orm(new_submenu)
 
     async def update(
@@ -77,15 +79,26 @@ class SubmenuService(ServiceMixin):
             )
         await self.cache.delete(name=f"{submenu_id}")
         await self.cache.delete(name=self.cache_key)
+        await self.invalidate(
+            CacheEvent.SUBMENU_UPDATE,
+            menu_id=updated_submenu.parent_id,
+            submenu_id=submenu_id,
+        )
         return SubmenuRead.from_orm(updated_submenu)
 
     async def delete(self, menu_id: uuid_pkg.UUID, submenu_id: uuid_pkg.UUID) -> bool:
         """Удалить подменю."""
-        is_deleted = await self.repository.delete(submenu_id=submenu_id)
+        parent_id = await self.repository.delete(submenu_id=submenu_id)
         await self.cache.delete(name=f"{submenu_id}")
         await self.cache.delete(name=f"{menu_id}")
         await self.cache.delete(name=self.cache_key)
-        return is_deleted
+        if parent_id:
+            await self.invalidate(
+                CacheEvent.SUBMENU_DELETE,
+                menu_id=parent_id,
+                submenu_id=submenu_id,
+            )
+        return True
 
 
 async def get_submenu_service(
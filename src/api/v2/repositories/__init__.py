@@ -1,3 +1,8 @@
+from .pagination import *
+from .bulk import *
+from .soft_delete import *
+from .update import *
+from .imports import *
 from .dish import *
 from .menu import *
 from .submenu import *
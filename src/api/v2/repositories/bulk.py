@@ -0,0 +1,41 @@
+import uuid as uuid_pkg
+from collections.abc import Sequence
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+__all__ = ("upsert",)
+
+# Строк в одном INSERT: asyncpg принимает не больше 32767 параметров
+UPSERT_BATCH_SIZE = 1000
+
+
+async def upsert(
+    session: AsyncSession,
+    model: type,
+    values: list[dict],
+    update_columns: Sequence[str],
+    owner_column: str,
+) -> list[uuid_pkg.UUID]:
+    """Вставить или обновить строки многострочным INSERT ... ON CONFLICT (id).
+
+    Существующая строка обновляется, только если принадлежит тому же
+    родителю (owner_column), чужие строки не переносятся. Возвращает id
+    записанных строк.
+    """
+    written: list[uuid_pkg.UUID] = []
+    while values:
+        batch, values = values[:UPSERT_BATCH_SIZE], values[UPSERT_BATCH_SIZE:]
+        statement = insert(model).values(batch)
+        statement = statement.on_conflict_do_update(
+            index_elements=[model.id],
+            set_={
+                **{column: statement.excluded[column] for column in update_columns},
+                "updated_at": text("current_timestamp(0)"),
+            },
+            where=getattr(model, owner_column) == statement.excluded[owner_column],
+        ).returning(model.id)
+        results = await session.execute(statement)
+        written.extend(results.scalars().all())
+    return written
@@ -1,8 +1,20 @@
 import uuid as uuid_pkg
+from collections.abc import AsyncIterator, Sequence
 
-from sqlalchemy import select
+from sqlalchemy import bindparam, not_, select
+from sqlalchemy.engine import Row, RowMapping
+from sqlalchemy.sql import Select
 
-from src.models import Dish, DishCreate, DishUpdate
+from src.api.v2.repositories import (
+    Cursor,
+    page_params,
+    paginate,
+    restore,
+    soft_delete,
+    update_returning,
+    upsert,
+)
+from src.models import Dish, DishCreate, DishUpdate, Menu, Submenu
 
 __all__ = ("DishRepository",)
 
@@ -12,16 +24,92 @@ from src.repositories import AbstractRepository
 class DishRepository(AbstractRepository):
     model: type[Dish] = Dish  # type: ignore
 
-    async def list(self, submenu_id: uuid_pkg.UUID) -> list[Dish]:
-        statement = select(self.model).where(
-            self.model.submenu_id == submenu_id,
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые блюда, у которых не удалены подменю и меню."""
+        return (
+            statement.join(Submenu, Submenu.id == Dish.submenu_id)
+            .join(Menu, Menu.id == Dish.menu_id)
+            .where(
+                not_(Dish.is_removed),
+                not_(Submenu.is_removed),
+                not_(Menu.is_removed),
+            )
+        )
+
+    async def list_all(self) -> list[Dish]:
+        results = await self.session.execute(self.visible(select(self.model)))
+        dishes: list[Dish] = results.scalars().all()
+        return dishes
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[Sequence[RowMapping]]:
+        """Все блюда порциями по batch_size через серверный курсор."""
+        statement = (
+            self.visible(
+                select(
+                    self.model.id,
+                    self.model.menu_id,
+                    self.model.submenu_id,
+                    self.model.title,
+                    self.model.description,
+                    self.model.price,
+                ),
+            )
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=batch_size)
+        )
+        results = await self.session.stream(statement)
+        async for rows in results.mappings().partitions():
+            yield rows
+
+    async def upsert_many(self, values: list[dict]) -> list[uuid_pkg.UUID]:
+        return await upsert(
+            session=self.session,
+            model=self.model,
+            values=values,
+            # Запись поверх удалённого блюда восстанавливает его
+            update_columns=("title", "description", "price", "is_removed"),
+            owner_column="submenu_id",
+        )
+
+    async def delete_many(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        dish_ids: Sequence[uuid_pkg.UUID],
+    ) -> list[uuid_pkg.UUID]:
+        """Пометить блюда подменю удалёнными одним запросом.
+
+        Подменю чужого меню ничего не удаляет: иначе сброс кэша по
+        menu_id из адреса оставил бы счётчики настоящего меню.
+        """
+        results = await self.session.execute(
+            soft_delete(
+                self.model,
+                self.model.menu_id == menu_id,
+                self.model.submenu_id == submenu_id,
+                self.model.id.in_(dish_ids),
+            ),
+        )
+        return results.scalars().all()
+
+    async def list(
+        self,
+        submenu_id: uuid_pkg.UUID,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Dish]:
+        statement = LIST_AFTER if after is not None else LIST
+        results = await self.session.execute(
+            statement,
+            {"submenu_id": submenu_id, **page_params(limit, after)},
         )
-        results = await self.session.execute(statement)
         dishes: list[Dish] = results.scalars().all()
         return dishes
 
     async def get(self, dish_id: uuid_pkg.UUID) -> Dish | None:
-        dish: Dish | None = await self.session.get(self.model, dish_id)
+        results = await self.session.execute(GET, {"dish_id": dish_id})
+        dish: Dish | None = results.scalar_one_or_none()
         return dish
 
     async def add(self, data: DishCreate) -> Dish:
@@ -30,15 +118,49 @@ class DishRepository(AbstractRepository):
         return new_dish
 
     async def update(self, dish_id: uuid_pkg.UUID, data: DishUpdate) -> Dish | None:
-        if updated_dish := await self.get(dish_id=dish_id):
-            values = data.dict(exclude_unset=True)
-            for k, v in values.items():
-                setattr(updated_dish, k, v)
-            self.session.add(updated_dish)
+        if not (values := data.dict(exclude_unset=True)):
+            return await self.get(dish_id=dish_id)
+        statement = update_returning(
+            self.model,
+            values,
+            self.model.id == dish_id,
+            not_(self.model.is_removed),
+            # UPDATE ... FROM submenu, menu: блюдо скрытого родителя не обновляется
+            Submenu.id == self.model.submenu_id,
+            not_(Submenu.is_removed),
+            Menu.id == self.model.menu_id,
+            not_(Menu.is_removed),
+        )
+        results = await self.session.execute(statement)
+        updated_dish: Dish | None = results.scalar_one_or_none()
         return updated_dish
 
-    async def delete(self, dish_id: uuid_pkg.UUID) -> bool:
-        dish = await self.get(dish_id=dish_id)
-        if dish:
-            await self.session.delete(dish)
-        return True
+    async def delete(self, dish_id: uuid_pkg.UUID) -> Row | None:
+        """Пометить блюдо удалённым, вернуть его menu_id и submenu_id."""
+        results = await self.session.execute(
+            soft_delete(
+                self.model,
+                self.model.id == dish_id,
+                returning=(self.model.menu_id, self.model.submenu_id),
+            ),
+        )
+        return results.one_or_none()
+
+    async def restore(self, submenu_id: uuid_pkg.UUID, dish_id: uuid_pkg.UUID) -> bool:
+        results = await self.session.execute(
+            restore(
+                self.model,
+                self.model.submenu_id == submenu_id,
+                self.model.id == dish_id,
+            ),
+        )
+        return results.scalar_one_or_none() is not None
+
+
+# Горячие запросы строятся один раз, значения передаются параметрами
+GET = DishRepository.visible(select(Dish)).where(Dish.id == bindparam("dish_id"))
+SUBMENU_DISHES = DishRepository.visible(select(Dish)).where(
+    Dish.submenu_id == bindparam("submenu_id"),
+)
+LIST = paginate(SUBMENU_DISHES, Dish)
+LIST_AFTER = paginate(SUBMENU_DISHES, Dish, keyset=True)
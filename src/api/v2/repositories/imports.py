@@ -0,0 +1,223 @@
+import uuid as uuid_pkg
+from dataclasses import dataclass
+
+from sqlalchemy import Integer, Numeric, String, column, delete, select, table, text
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.models import Dish, Menu, Submenu
+
+__all__ = (
+    "IMPORT_COLUMNS",
+    "ImportRepository",
+)
+
+# Промежуточная таблица импорта: строка файла с меню, подменю и блюдом
+IMPORT_COLUMNS = (
+    "line",
+    "menu_id",
+    "menu_title",
+    "menu_description",
+    "submenu_id",
+    "submenu_title",
+    "submenu_description",
+    "dish_id",
+    "dish_title",
+    "dish_description",
+    "dish_price",
+)
+
+staging = table(
+    "import_row",
+    column("line", Integer),
+    column("menu_id", UUID(as_uuid=True)),
+    column("menu_title", String),
+    column("menu_description", String),
+    column("submenu_id", UUID(as_uuid=True)),
+    column("submenu_title", String),
+    column("submenu_description", String),
+    column("dish_id", UUID(as_uuid=True)),
+    column("dish_title", String),
+    column("dish_description", String),
+    column("dish_price", Numeric(8, 2)),
+)
+
+CREATE_STAGING = text(
+    """
+    CREATE TEMP TABLE import_row (
+        line integer NOT NULL,
+        menu_id uuid NOT NULL,
+        menu_title varchar NOT NULL,
+        menu_description varchar NOT NULL,
+        submenu_id uuid,
+        submenu_title varchar,
+        submenu_description varchar,
+        dish_id uuid,
+        dish_title varchar,
+        dish_description varchar,
+        dish_price numeric(8, 2)
+    ) ON COMMIT DROP
+    """,
+)
+
+
+@dataclass
+class ImportRepository:
+    """Загрузка каталога через промежуточную таблицу.
+
+    Строки копируются в import_row протоколом COPY, затем переносятся
+    в menu, submenu и dish тремя INSERT ... SELECT. Таблица живёт до конца
+    транзакции.
+    """
+
+    session: AsyncSession
+
+    async def create_staging(self) -> None:
+        await self.session.execute(CREATE_STAGING)
+
+    async def copy_rows(self, records: list[tuple]) -> None:
+        """Скопировать строки в import_row бинарным COPY asyncpg."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            "import_row",
+            records=records,
+            columns=IMPORT_COLUMNS,
+        )
+
+    async def reject_conflicts(self) -> list[tuple[int, str]]:
+        """Убрать из import_row строки, которые переносят объект к другому родителю.
+
+        Возвращает номера убранных строк с причиной.
+        """
+        # Без статистики планировщик считает временную таблицу пустой
+        await self.session.execute(text("ANALYZE import_row"))
+        other = staging.alias("other")
+        checks = (
+            (
+                "submenu_id is used with another menu in the file",
+                other.c.submenu_id == staging.c.submenu_id,
+                other.c.menu_id != staging.c.menu_id,
+            ),
+            (
+                "dish_id is used with another submenu in the file",
+                other.c.dish_id == staging.c.dish_id,
+                other.c.submenu_id != staging.c.submenu_id,
+            ),
+            (
+                "submenu belongs to another menu",
+                Submenu.id == staging.c.submenu_id,
+                Submenu.parent_id != staging.c.menu_id,
+            ),
+            (
+                "dish belongs to another submenu",
+                Dish.id == staging.c.dish_id,
+                Dish.submenu_id != staging.c.submenu_id,
+            ),
+        )
+        rejected: dict[int, str] = {}
+        for message, same_object, other_parent in checks:
+            # DELETE ... USING: вторая таблица попадает в USING
+            statement = (
+                delete(staging)
+                .where(same_object, other_parent)
+                .returning(staging.c.line)
+            )
+            results = await self.session.execute(statement)
+            for line in results.scalars():
+                rejected.setdefault(line, message)
+        return sorted(rejected.items())
+
+    async def merge(self) -> tuple[list[uuid_pkg.UUID], int, int]:
+        """Перенести import_row в каталог.
+
+        Повторяющиеся объекты берутся из последней строки файла, удалённые
+        объекты из файла восстанавливаются. Возвращает id затронутых меню
+        и число записанных подменю и блюд.
+        """
+        menus = await self.session.execute(
+            self.upsert(
+                Menu,
+                select(
+                    staging.c.menu_id,
+                    staging.c.menu_title,
+                    staging.c.menu_description,
+                    text("false"),
+                )
+                .distinct(staging.c.menu_id)
+                .order_by(staging.c.menu_id, staging.c.line.desc()),
+                columns=("id", "title", "description", "is_removed"),
+                update_columns=("title", "description", "is_removed"),
+            ).returning(Menu.id),
+        )
+        submenus = await self.session.execute(
+            self.upsert(
+                Submenu,
+                select(
+                    staging.c.submenu_id,
+                    staging.c.menu_id,
+                    staging.c.submenu_title,
+                    staging.c.submenu_description,
+                    text("false"),
+                )
+                .where(staging.c.submenu_id.is_not(None))
+                .distinct(staging.c.submenu_id)
+                .order_by(staging.c.submenu_id, staging.c.line.desc()),
+                columns=("id", "parent_id", "title", "description", "is_removed"),
+                update_columns=("title", "description", "is_removed"),
+                owner_column="parent_id",
+            ),
+        )
+        dishes = await self.session.execute(
+            self.upsert(
+                Dish,
+                select(
+                    staging.c.dish_id,
+                    staging.c.menu_id,
+                    staging.c.submenu_id,
+                    staging.c.dish_title,
+                    staging.c.dish_description,
+                    staging.c.dish_price,
+                    text("false"),
+                )
+                .where(staging.c.dish_id.is_not(None))
+                .distinct(staging.c.dish_id)
+                .order_by(staging.c.dish_id, staging.c.line.desc()),
+                columns=(
+                    "id",
+                    "menu_id",
+                    "submenu_id",
+                    "title",
+                    "description",
+                    "price",
+                    "is_removed",
+                ),
+                update_columns=("title", "description", "price", "is_removed"),
+                owner_column="submenu_id",
+            ),
+        )
+        return menus.scalars().all(), submenus.rowcount, dishes.rowcount
+
+    @staticmethod
+    def upsert(
+        model: type,
+        rows,
+        columns: tuple[str, ...],
+        update_columns: tuple[str, ...],
+        owner_column: str | None = None,
+    ):
+        statement = insert(model).from_select(columns, rows, include_defaults=False)
+        return statement.on_conflict_do_update(
+            index_elements=[model.id],
+            set_={
+                **{name: statement.excluded[name] for name in update_columns},
+                "updated_at": text("current_timestamp(0)"),
+            },
+            # Строки с чужим родителем уже убраны в reject_conflicts,
+            # условие защищает от переноса, сделанного параллельно
+            where=(
+                getattr(model, owner_column) == statement.excluded[owner_column]
+                if owner_column
+                else None
+            ),
+        )
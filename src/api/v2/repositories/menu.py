@@ -1,9 +1,19 @@
 import uuid as uuid_pkg
+from collections.abc import AsyncIterator, Sequence
 
 import sqlalchemy as sa
-from sqlalchemy.orm import joinedload
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.sql import Select
 
-from src.models import Dish, Menu, MenuCreate, MenuUpdate, Submenu
+from src.api.v2.repositories import (
+    Cursor,
+    page_params,
+    paginate,
+    restore,
+    soft_delete,
+    update_returning,
+)
+from src.models import Menu, MenuCreate, MenuUpdate
 
 __all__ = ("MenuRepository",)
 
@@ -13,78 +23,51 @@ from src.repositories import AbstractRepository
 class MenuRepository(AbstractRepository):
     model: type[Menu] = Menu  # type: ignore
 
-    async def list(self) -> list[Menu]:
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые меню."""
+        return statement.where(sa.not_(Menu.is_removed))
+
+    async def stream_all(self, batch_size: int) -> AsyncIterator[Sequence[RowMapping]]:
+        """Все меню порциями по batch_size через серверный курсор."""
         statement = (
-            sa.select(
-                self.model.id,
-                self.model.title,
-                self.model.description,
-                sa.func.coalesce(
-                    sa.func.count(
-                        sa.func.distinct(
-                            Submenu.id,
-                        ),
-                    ),
-                    0,
-                ).label("submenus_count"),
-                sa.func.coalesce(
-                    sa.func.count(Dish.id),
-                    0,
-                ).label("dishes_count"),
-            )
-            .outerjoin(
-                Submenu,
-                self.model.id == Submenu.parent_id,
+            self.visible(
+                sa.select(
+                    self.model.id,
+                    self.model.title,
+                    self.model.description,
+                    self.model.submenus_count,
+                    self.model.dishes_count,
+                ),
             )
-            .outerjoin(
-                Dish,
-                Submenu.id == Dish.submenu_id,
-            )
-            .group_by(Menu.id)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=batch_size)
         )
-        results = await self.session.execute(statement)
-        menus: list[Menu] = results.all()
-        return menus
+        results = await self.session.stream(statement)
+        async for rows in results.mappings().partitions():
+            yield rows
 
-    async def get(self, menu_id: uuid_pkg.UUID) -> Menu | None:
-        statement = (
-            sa.select(
-                self.model.id,
-                self.model.title,
-                self.model.description,
-                sa.func.coalesce(
-                    sa.func.count(
-                        sa.func.distinct(
-                            Submenu.id,
-                        ),
-                    ),
-                    0,
-                ).label("submenus_count"),
-                sa.func.coalesce(
-                    sa.func.count(Dish.id),
-                    0,
-                ).label("dishes_count"),
-            )
-            .outerjoin(
-                Submenu,
-                self.model.id == Submenu.parent_id,
-            )
-            .outerjoin(
-                Dish,
-                Submenu.id == Dish.submenu_id,
-            )
-            .where(
-                self.model.id == menu_id,
-            )
-            .group_by(Menu.id)
+    async def delete_many(
+        self, menu_ids: Sequence[uuid_pkg.UUID]
+    ) -> list[uuid_pkg.UUID]:
+        """Пометить меню удалёнными одним запросом, с подменю и блюдами."""
+        results = await self.session.execute(
+            soft_delete(self.model, self.model.id.in_(menu_ids)),
         )
-        results = await self.session.execute(statement=statement)
-        menu: Menu | None = results.one_or_none()
-        return menu
+        return results.scalars().all()
+
+    async def list(
+        self,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Menu]:
+        statement = LIST_AFTER if after is not None else LIST
+        results = await self.session.execute(statement, page_params(limit, after))
+        menus: list[Menu] = results.scalars().all()
+        return menus
 
-    async def __get(self, menu_id: uuid_pkg.UUID) -> Menu | None:
-        statement = sa.select(self.model).where(self.model.id == menu_id)
-        results = await self.session.execute(statement=statement)
+    async def get(self, menu_id: uuid_pkg.UUID) -> Menu | None:
+        results = await self.session.execute(GET, {"menu_id": menu_id})
         menu: Menu | None = results.scalar_one_or_none()
         return menu
 
@@ -94,27 +77,32 @@ class MenuRepository(AbstractRepository):
         return new_menu
 
     async def update(self, menu_id: uuid_pkg.UUID, data: MenuUpdate) -> Menu | None:
-        if updated_menu := await self.__get(menu_id=menu_id):
-            values = data.dict(exclude_unset=True)
-            for k, v in values.items():
-                setattr(updated_menu, k, v)
-            self.session.add(updated_menu)
+        if not (values := data.dict(exclude_unset=True)):
+            return await self.get(menu_id=menu_id)
+        statement = update_returning(
+            self.model,
+            values,
+            self.model.id == menu_id,
+            sa.not_(self.model.is_removed),
+        )
+        results = await self.session.execute(statement)
+        updated_menu: Menu | None = results.scalar_one_or_none()
         return updated_menu
 
     async def delete(self, menu_id: uuid_pkg.UUID) -> bool:
-        statement = (
-            sa.select(
-                self.model,
-            )
-            .options(
-                joinedload(self.model.children),
-                joinedload(self.model.menu_dishes),
-            )
-            .where(
-                self.model.id == menu_id,
-            )
-        )
-        menu = await self.session.scalar(statement)
-        if menu:
-            await self.session.delete(menu)
+        await self.session.execute(soft_delete(self.model, self.model.id == menu_id))
         return True
+
+    async def restore(self, menu_id: uuid_pkg.UUID) -> bool:
+        results = await self.session.execute(
+            restore(self.model, self.model.id == menu_id),
+        )
+        return results.scalar_one_or_none() is not None
+
+
+# Горячие запросы строятся один раз, значения передаются параметрами:
+# ключ кэша компиляции SQLAlchemy вычисляется у объекта запроса однажды,
+# а одинаковый текст SQL попадает в кэш подготовленных запросов asyncpg
+GET = MenuRepository.visible(sa.select(Menu)).where(Menu.id == sa.bindparam("menu_id"))
+LIST = paginate(MenuRepository.visible(sa.select(Menu)), Menu)
+LIST_AFTER = paginate(MenuRepository.visible(sa.select(Menu)), Menu, keyset=True)
@@ -0,0 +1,44 @@
+import uuid as uuid_pkg
+from datetime import datetime
+from typing import Any
+
+import sqlalchemy as sa
+from sqlalchemy.sql import Select
+
+__all__ = (
+    "Cursor",
+    "page_params",
+    "paginate",
+)
+
+# Последняя строка предыдущей страницы: (created_at, id)
+Cursor = tuple[datetime, uuid_pkg.UUID]
+
+
+def paginate(statement: Select, model: type, keyset: bool = False) -> Select:
+    """Страница по ключу (created_at, id), без OFFSET.
+
+    Стоимость не зависит от номера страницы: индекс сразу находит
+    строку после курсора. Размер страницы и курсор - параметры запроса,
+    их значения собирает page_params, поэтому запрос можно построить
+    один раз. Первой странице курсор не нужен: keyset=False.
+    """
+    statement = statement.order_by(model.created_at, model.id)
+    if keyset:
+        after = sa.tuple_(
+            sa.bindparam("after_created_at", type_=model.created_at.type),
+            sa.bindparam("after_id", type_=model.id.type),
+        )
+        statement = statement.where(sa.tuple_(model.created_at, model.id) > after)
+    # LIMIT NULL в Postgres - без ограничения
+    return statement.limit(sa.bindparam("limit", type_=sa.Integer))
+
+
+def page_params(
+    limit: int | None = None, after: Cursor | None = None
+) -> dict[str, Any]:
+    """Значения параметров запроса, построенного paginate."""
+    params: dict[str, Any] = {"limit": limit}
+    if after is not None:
+        params["after_created_at"], params["after_id"] = after
+    return params
@@ -0,0 +1,36 @@
+import sqlalchemy as sa
+from sqlalchemy.sql import Update
+
+__all__ = (
+    "restore",
+    "soft_delete",
+)
+
+
+def soft_delete(model: type, *where, returning: tuple = ()) -> Update:
+    """Пометить строки удалёнными одним UPDATE, вернуть их id или returning.
+
+    Поддерево не трогается: потомки скрываются вместе с родителем
+    на чтении, поэтому стоимость не зависит от размера поддерева.
+    Строки удаляет позже команда purge.
+    """
+    return mark_removed(model, *where, is_removed=True, returning=returning)
+
+
+def restore(model: type, *where) -> Update:
+    """Снять пометку удаления, вернуть id восстановленных строк."""
+    return mark_removed(model, *where, is_removed=False)
+
+
+def mark_removed(
+    model: type,
+    *where,
+    is_removed: bool,
+    returning: tuple = (),
+) -> Update:
+    return (
+        sa.update(model)
+        .where(*where, model.is_removed == (not is_removed))
+        .values(is_removed=is_removed, updated_at=sa.text("current_timestamp(0)"))
+        .returning(*(returning or (model.id,)))
+    )
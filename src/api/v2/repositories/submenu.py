@@ -1,9 +1,20 @@
 import uuid as uuid_pkg
+from collections.abc import AsyncIterator, Sequence
 
-from sqlalchemy import func, select
-from sqlalchemy.orm import joinedload
+from sqlalchemy import bindparam, not_, select
+from sqlalchemy.engine import RowMapping
+from sqlalchemy.sql import Select
 
-from src.models import Submenu, SubmenuCreate, SubmenuUpdate
+from src.api.v2.repositories import (
+    Cursor,
+    page_params,
+    paginate,
+    restore,
+    soft_delete,
+    update_returning,
+    upsert,
+)
+from src.models import Menu, Submenu, SubmenuCreate, SubmenuUpdate
 
 __all__ = ("SubmenuRepository",)
 
@@ -13,49 +24,79 @@ from src.repositories import AbstractRepository
 class SubmenuRepository(AbstractRepository):
     model: type[Submenu] = Submenu  # type: ignore
 
-    async def list(self, menu_id: uuid_pkg.UUID) -> list[Submenu]:
-        statement = (
-            select(
-                self.model.id,
-                self.model.title,
-                self.model.description,
-                func.count(self.model.submenu_dishes).label("dishes_count"),
-            )
-            .outerjoin(
-                self.model.submenu_dishes,
-            )
-            .where(
-                self.model.parent_id == menu_id,
-            )
-            .group_by(self.model.id)
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые подменю не удалённых меню."""
+        return statement.join(Menu, Menu.id == Submenu.parent_id).where(
+            not_(Submenu.is_removed),
+            not_(Menu.is_removed),
         )
-        results = await self.session.execute(statement)
-        submenus: list[Submenu] = results.all()
+
+    async def list_all(self) -> list[Submenu]:
+        results = await self.session.execute(self.visible(select(self.model)))
+        submenus: list[Submenu] = results.scalars().all()
         return submenus
 
-    async def get(self, submenu_id: uuid_pkg.UUID) -> Submenu | None:
+    async def stream_all(self, batch_size: int) -> AsyncIterator[Sequence[RowMapping]]:
+        """Все подменю порциями по batch_size через серверный курсор."""
         statement = (
-            select(
-                self.model.id,
-                self.model.title,
-                self.model.description,
-                func.count(self.model.submenu_dishes).label("dishes_count"),
+            self.visible(
+                select(
+                    self.model.id,
+                    self.model.parent_id.label("menu_id"),
+                    self.model.title,
+                    self.model.description,
+                    self.model.dishes_count,
+                ),
             )
-            .outerjoin(
-                self.model.submenu_dishes,
-            )
-            .where(
-                self.model.id == submenu_id,
-            )
-            .group_by(self.model.id)
+            .order_by(self.model.created_at, self.model.id)
+            .execution_options(yield_per=batch_size)
         )
-        results = await self.session.execute(statement=statement)
-        submenu: Submenu | None = results.one_or_none()
-        return submenu
+        results = await self.session.stream(statement)
+        async for rows in results.mappings().partitions():
+            yield rows
+
+    async def upsert_many(self, values: list[dict]) -> list[uuid_pkg.UUID]:
+        return await upsert(
+            session=self.session,
+            model=self.model,
+            values=values,
+            # Запись поверх удалённого подменю восстанавливает его
+            update_columns=("title", "description", "is_removed"),
+            owner_column="parent_id",
+        )
+
+    async def delete_many(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_ids: Sequence[uuid_pkg.UUID],
+    ) -> list[uuid_pkg.UUID]:
+        """Пометить подменю меню удалёнными одним запросом, с блюдами."""
+        results = await self.session.execute(
+            soft_delete(
+                self.model,
+                self.model.parent_id == menu_id,
+                self.model.id.in_(submenu_ids),
+            ),
+        )
+        return results.scalars().all()
 
-    async def __get(self, submenu_id: uuid_pkg.UUID) -> Submenu | None:
-        statement = select(self.model).where(self.model.id == submenu_id)
-        results = await self.session.execute(statement=statement)
+    async def list(
+        self,
+        menu_id: uuid_pkg.UUID,
+        limit: int | None = None,
+        after: Cursor | None = None,
+    ) -> list[Submenu]:
+        statement = LIST_AFTER if after is not None else LIST
+        results = await self.session.execute(
+            statement,
+            {"menu_id": menu_id, **page_params(limit, after)},
+        )
+        submenus: list[Submenu] = results.scalars().all()
+        return submenus
+
+    async def get(self, submenu_id: uuid_pkg.UUID) -> Submenu | None:
+        results = await self.session.execute(GET, {"submenu_id": submenu_id})
         submenu: Submenu | None = results.scalar_one_or_none()
         return submenu
 
@@ -69,26 +110,49 @@ class SubmenuRepository(AbstractRepository):
         submenu_id: uuid_pkg.UUID,
         data: SubmenuUpdate,
     ) -> Submenu | None:
-        if updated_submenu := await self.__get(submenu_id=submenu_id):
-            values = data.dict(exclude_unset=True)
-            for k, v in values.items():
-                setattr(updated_submenu, k, v)
-            self.session.add(updated_submenu)
+        if not (values := data.dict(exclude_unset=True)):
+            return await self.get(submenu_id=submenu_id)
+        statement = update_returning(
+            self.model,
+            values,
+            self.model.id == submenu_id,
+            not_(self.model.is_removed),
+            # UPDATE ... FROM menu: подменю удалённого меню не обновляется
+            Menu.id == self.model.parent_id,
+            not_(Menu.is_removed),
+        )
+        results = await self.session.execute(statement)
+        updated_submenu: Submenu | None = results.scalar_one_or_none()
         return updated_submenu
 
-    async def delete(self, submenu_id: uuid_pkg.UUID) -> bool:
-        statement = (
-            select(
+    async def delete(self, submenu_id: uuid_pkg.UUID) -> uuid_pkg.UUID | None:
+        """Пометить подменю удалённым, вернуть id его меню, None - если нечего."""
+        results = await self.session.execute(
+            soft_delete(
                 self.model,
-            )
-            .options(
-                joinedload(self.model.submenu_dishes),
-            )
-            .where(
                 self.model.id == submenu_id,
-            )
+                returning=(self.model.parent_id,),
+            ),
         )
-        submenu = await self.session.scalar(statement)
-        if submenu:
-            await self.session.delete(submenu)
-        return True
+        return results.scalar_one_or_none()
+
+    async def restore(self, menu_id: uuid_pkg.UUID, submenu_id: uuid_pkg.UUID) -> bool:
+        results = await self.session.execute(
+            restore(
+                self.model,
+                self.model.parent_id == menu_id,
+                self.model.id == submenu_id,
+            ),
+        )
+        return results.scalar_one_or_none() is not None
+
+
+# Горячие запросы строятся один раз, значения передаются параметрами
+GET = SubmenuRepository.visible(select(Submenu)).where(
+    Submenu.id == bindparam("submenu_id")
+)
+MENU_SUBMENUS = SubmenuRepository.visible(select(Submenu)).where(
+    Submenu.parent_id == bindparam("menu_id"),
+)
+LIST = paginate(MENU_SUBMENUS, Submenu)
+LIST_AFTER = paginate(MENU_SUBMENUS, Submenu, keyset=True)
@@ -0,0 +1,26 @@
+from typing import Any
+
+import sqlalchemy as sa
+from sqlmodel import select
+from sqlmodel.sql.expression import Select
+
+__all__ = ("update_returning",)
+
+
+def update_returning(model: type, values: dict[str, Any], *where) -> Select:
+    """Обновить строку одним UPDATE ... RETURNING и вернуть её объектом модели.
+
+    Пустой RETURNING - строки нет или она скрыта условиями where.
+    """
+    statement = (
+        sa.update(model)
+        .where(*where)
+        .values(**values)
+        .returning(*model.__table__.columns)
+    )
+    # Объект мог уже быть загружен в сессию: перезаписываем его атрибуты
+    return (
+        select(model)
+        .from_statement(statement)
+        .execution_options(populate_existing=True)
+    )
@@ -1,10 +1,24 @@
 import http
 import uuid as uuid_pkg
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from src.api.v2.resources.responses import (
+    PageParams,
+    conditional_response,
+    page_response,
+)
 from src.api.v2.services import DishService, get_dish_service
-from src.models import DishCreate, DishList, DishRead, DishUpdate
+from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    BulkResult,
+    DishBulk,
+    DishCreate,
+    DishList,
+    DishRead,
+    DishUpdate,
+)
 from src.schemas import StatusMessage
 
 router = APIRouter(
@@ -21,10 +35,19 @@ router = APIRouter(
 )
 async def dish_list(
     *,
+    menu_id: uuid_pkg.UUID,
     submenu_id: uuid_pkg.UUID,
+    request: Request,
+    page: PageParams = Depends(),
     dish_service: DishService = Depends(get_dish_service),
-) -> DishList:
-    return await dish_service.get_list(submenu_id=submenu_id)
+) -> Response:
+    dishes, next_cursor = await dish_service.get_list(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        limit=page.limit,
+        cursor=page.cursor,
+    )
+    return page_response(request, dishes, next_cursor)
 
 
 @router.get(
@@ -35,10 +58,18 @@ async def dish_list(
 )
 async def dish_detail(
     *,
+    menu_id: uuid_pkg.UUID,
+    submenu_id: uuid_pkg.UUID,
     dish_id: uuid_pkg.UUID,
+    request: Request,
     dish_service: DishService = Depends(get_dish_service),
-) -> DishRead:
-    return await dish_service.get_detail(dish_id=dish_id)
+) -> Response:
+    dish = await dish_service.get_detail(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        dish_id=dish_id,
+    )
+    return conditional_response(request, dish)
 
 
 @router.post(
@@ -56,6 +87,25 @@ async def dish_create(
     return await dish_service.create(menu_id=menu_id, submenu_id=submenu_id, data=data)
 
 
+@router.post(
+    path="/bulk",
+    response_model=BulkResult,
+    summary="Создать или обновить пакет блюд",
+    status_code=http.HTTPStatus.CREATED,
+)
+async def dish_bulk_upsert(
+    menu_id: uuid_pkg.UUID,
+    submenu_id: uuid_pkg.UUID,
+    data: DishBulk,
+    dish_service: DishService = Depends(get_dish_service),
+) -> BulkResult:
+    return await dish_service.bulk_upsert(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        data=data,
+    )
+
+
 @router.patch(
     path="/{dish_id}",
     response_model=DishRead,
@@ -64,11 +114,16 @@ async def dish_create(
 )
 async def dish_update(
     *,
+    submenu_id: uuid_pkg.UUID,
     dish_id: uuid_pkg.UUID,
     data: DishUpdate,
     dish_service: DishService = Depends(get_dish_service),
 ) -> DishRead:
-    return await dish_service.update(dish_id=dish_id, data=data)
+    return await dish_service.update(
+        submenu_id=submenu_id,
+        dish_id=dish_id,
+        data=data,
+    )
 
 
 @router.delete(
@@ -89,3 +144,41 @@ async def dish_delete(
         dish_id=dish_id,
     )
     return StatusMessage(status=is_deleted, message="The dish has been deleted")
+
+
+@router.post(
+    path="/bulk/delete",
+    response_model=BulkDeleteResult,
+    summary="Удалить несколько блюд",
+    status_code=http.HTTPStatus.OK,
+)
+async def dish_bulk_delete(
+    menu_id: uuid_pkg.UUID,
+    submenu_id: uuid_pkg.UUID,
+    data: BulkDelete,
+    dish_service: DishService = Depends(get_dish_service),
+) -> BulkDeleteResult:
+    return await dish_service.delete_many(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        data=data,
+    )
+
+
+@router.post(
+    path="/{dish_id}/restore",
+    response_model=DishRead,
+    summary="Восстановить удалённое блюдо",
+    status_code=http.HTTPStatus.OK,
+)
+async def dish_restore(
+    menu_id: uuid_pkg.UUID,
+    submenu_id: uuid_pkg.UUID,
+    dish_id: uuid_pkg.UUID,
+    dish_service: DishService = Depends(get_dish_service),
+) -> DishRead:
+    return await dish_service.restore(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        dish_id=dish_id,
+    )
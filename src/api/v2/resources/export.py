@@ -0,0 +1,33 @@
+import http
+
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from src.api.v2.services import ExportService, get_export_service
+
+router = APIRouter(
+    prefix="/export",
+    tags=["export"],
+)
+
+
+@router.get(
+    path="/",
+    summary="Выгрузка всего каталога в NDJSON",
+    status_code=http.HTTPStatus.OK,
+    response_class=StreamingResponse,
+    responses={
+        http.HTTPStatus.OK.value: {
+            "content": {"application/x-ndjson": {}},
+            "description": 'По объекту на строку, тип - в поле "type": '
+            "menu, submenu или dish",
+        },
+    },
+)
+async def catalog_export(
+    export_service: ExportService = Depends(get_export_service),
+) -> StreamingResponse:
+    return StreamingResponse(
+        content=export_service.export(),
+        media_type="application/x-ndjson",
+    )
@@ -0,0 +1,35 @@
+import http
+
+from fastapi import APIRouter, Depends, Request
+
+from src.api.v2.services import ImportService, get_import_service
+from src.models import ImportResult
+
+router = APIRouter(
+    prefix="/import",
+    tags=["import"],
+)
+
+
+@router.post(
+    path="/",
+    response_model=ImportResult,
+    summary="Импорт каталога из CSV",
+    status_code=http.HTTPStatus.OK,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {"text/csv": {"schema": {"type": "string"}}},
+            "description": "Строка - меню и, если заполнены, подменю и блюдо: "
+            "menu_id, menu_title, menu_description, submenu_id, submenu_title, "
+            "submenu_description, dish_id, dish_title, dish_description, "
+            "dish_price. Обязательна только menu_title",
+        },
+    },
+)
+async def catalog_import(
+    request: Request,
+    import_service: ImportService = Depends(get_import_service),
+) -> ImportResult:
+    # Тело читается потоком, без загрузки файла в память
+    return await import_service.import_csv(request.stream())
@@ -1,10 +1,23 @@
 import http
 import uuid as uuid_pkg
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from src.api.v2.resources.responses import (
+    PageParams,
+    conditional_response,
+    page_response,
+)
 from src.api.v2.services import MenuService, get_menu_service
-from src.models import MenuCreate, MenuList, MenuRead, MenuUpdate
+from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    MenuCreate,
+    MenuList,
+    MenuRead,
+    MenuTreeList,
+    MenuUpdate,
+)
 from src.schemas import StatusMessage
 
 router = APIRouter(
@@ -20,9 +33,28 @@ router = APIRouter(
     status_code=http.HTTPStatus.OK,
 )
 async def menu_list(
+    request: Request,
+    page: PageParams = Depends(),
+    menu_service: MenuService = Depends(get_menu_service),
+) -> Response:
+    menus, next_cursor = await menu_service.get_list(
+        limit=page.limit,
+        cursor=page.cursor,
+    )
+    return page_response(request, menus, next_cursor)
+
+
+@router.get(
+    path="/tree",
+    response_model=MenuTreeList,
+    summary="Все меню с подменю и блюдами",
+    status_code=http.HTTPStatus.OK,
+)
+async def menu_tree(
+    request: Request,
     menu_service: MenuService = Depends(get_menu_service),
-) -> MenuList:
-    return await menu_service.get_list()
+) -> Response:
+    return conditional_response(request, await menu_service.get_tree())
 
 
 @router.get(
@@ -33,9 +65,10 @@ async def menu_list(
 )
 async def menu_detail(
     menu_id: uuid_pkg.UUID,
+    request: Request,
     menu_service: MenuService = Depends(get_menu_service),
-) -> MenuRead:
-    return await menu_service.get_detail(menu_id=menu_id)
+) -> Response:
+    return conditional_response(request, await menu_service.get_detail(menu_id=menu_id))
 
 
 @router.post(
@@ -77,3 +110,29 @@ async def menu_delete(
 ):
     is_deleted: bool = await menu_service.delete(menu_id=menu_id)
     return StatusMessage(status=is_deleted, message="The menu has been deleted")
+
+
+@router.post(
+    path="/bulk/delete",
+    response_model=BulkDeleteResult,
+    summary="Удалить несколько меню",
+    status_code=http.HTTPStatus.OK,
+)
+async def menu_bulk_delete(
+    data: BulkDelete,
+    menu_service: MenuService = Depends(get_menu_service),
+) -> BulkDeleteResult:
+    return await menu_service.delete_many(data=data)
+
+
+@router.post(
+    path="/{menu_id}/restore",
+    response_model=MenuRead,
+    summary="Восстановить удалённое меню",
+    status_code=http.HTTPStatus.OK,
+)
+async def menu_restore(
+    menu_id: uuid_pkg.UUID,
+    menu_service: MenuService = Depends(get_menu_service),
+) -> MenuRead:
+    return await menu_service.restore(menu_id=menu_id)
@@ -0,0 +1,85 @@
+import hashlib
+import http
+from dataclasses import dataclass
+
+from fastapi import Query, Request, Response
+
+from src import settings
+
+__all__ = (
+    "NEXT_CURSOR_HEADER",
+    "PageParams",
+    "RawJSONResponse",
+    "conditional_response",
+    "make_etag",
+    "page_response",
+)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class RawJSONResponse(Response):
+    """Ответ с уже сериализованным JSON: отдаётся как есть, без валидации."""
+
+    media_type = "application/json"
+
+
+@dataclass
+class PageParams:
+    """Параметры страницы списка: размер и курсор."""
+
+    limit: int = Query(
+        default=settings.app.page_default_limit,
+        ge=1,
+        le=settings.app.page_max_limit,
+        description="Размер страницы",
+    )
+    cursor: str | None = Query(
+        default=None,
+        description=f"Курсор из заголовка {NEXT_CURSOR_HEADER} прошлой страницы",
+    )
+
+
+def make_etag(content: bytes, *parts: bytes) -> str:
+    """Сильный ETag по содержимому ответа и значимым заголовкам."""
+    digest = hashlib.blake2b(content, digest_size=16)
+    for part in parts:
+        digest.update(part)
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Для GET сравнение слабое: префикс W/ не учитываем
+    candidates = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in candidates
+
+
+def conditional_response(
+    request: Request,
+    content: bytes,
+    headers: dict[str, str] | None = None,
+) -> Response:
+    """Ответить 304 Not Modified, если у клиента актуальная версия.
+
+    Содержимое берётся из кэша, поэтому повторный опрос без изменений
+    не доходит до базы и не передаёт тело ответа.
+    """
+    headers = headers or {}
+    etag = make_etag(content, *(f"{k}:{v}".encode() for k, v in headers.items()))
+    headers.update({"ETag": etag, "Cache-Control": "no-cache"})
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(etag, if_none_match):
+        return Response(status_code=http.HTTPStatus.NOT_MODIFIED, headers=headers)
+    return RawJSONResponse(content=content, headers=headers)
+
+
+def page_response(
+    request: Request,
+    content: bytes,
+    next_cursor: str | None,
+) -> Response:
+    """Страница списка; курсор следующей страницы - в заголовке."""
+    headers = {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
+    return conditional_response(request, content, headers=headers)
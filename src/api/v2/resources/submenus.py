@@ -1,10 +1,19 @@
 import http
 import uuid as uuid_pkg
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from src.api.v2.resources.responses import (
+    PageParams,
+    conditional_response,
+    page_response,
+)
 from src.api.v2.services import SubmenuService, get_submenu_service
 from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    BulkResult,
+    SubmenuBulk,
     SubmenuCreate,
     SubmenuDetail,
     SubmenuList,
@@ -27,9 +36,16 @@ router = APIRouter(
 )
 async def submenu_list(
     menu_id: uuid_pkg.UUID,
+    request: Request,
+    page: PageParams = Depends(),
     submenu_service: SubmenuService = Depends(get_submenu_service),
-) -> SubmenuList:
-    return await submenu_service.get_list(menu_id=menu_id)
+) -> Response:
+    submenus, next_cursor = await submenu_service.get_list(
+        menu_id=menu_id,
+        limit=page.limit,
+        cursor=page.cursor,
+    )
+    return page_response(request, submenus, next_cursor)
 
 
 @router.get(
@@ -40,10 +56,13 @@ async def submenu_list(
 )
 async def submenu_detail(
     *,
+    menu_id: uuid_pkg.UUID,
     submenu_id: uuid_pkg.UUID,
+    request: Request,
     submenu_service: SubmenuService = Depends(get_submenu_service),
-) -> SubmenuDetail:
-    return await submenu_service.get_detail(submenu_id=submenu_id)
+) -> Response:
+    submenu = await submenu_service.get_detail(menu_id=menu_id, submenu_id=submenu_id)
+    return conditional_response(request, submenu)
 
 
 @router.post(
@@ -60,6 +79,20 @@ async def submenu_create(
     return await submenu_service.create(menu_id=menu_id, data=data)
 
 
+@router.post(
+    path="/bulk",
+    response_model=BulkResult,
+    summary="Создать или обновить пакет подменю с блюдами",
+    status_code=http.HTTPStatus.CREATED,
+)
+async def submenu_bulk_upsert(
+    menu_id: uuid_pkg.UUID,
+    data: SubmenuBulk,
+    submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> BulkResult:
+    return await submenu_service.bulk_upsert(menu_id=menu_id, data=data)
+
+
 @router.patch(
     path="/{submenu_id}",
     response_model=SubmenuRead,
@@ -68,11 +101,16 @@ async def submenu_create(
 )
 async def submenu_update(
     *,
+    menu_id: uuid_pkg.UUID,
     submenu_id: uuid_pkg.UUID,
     data: SubmenuUpdate,
     submenu_service: SubmenuService = Depends(get_submenu_service),
 ) -> SubmenuRead:
-    return await submenu_service.update(submenu_id=submenu_id, data=data)
+    return await submenu_service.update(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        data=data,
+    )
 
 
 @router.delete(
@@ -91,3 +129,31 @@ async def submenu_delete(
         submenu_id=submenu_id,
     )
     return StatusMessage(status=is_deleted, message="The submenu has been deleted")
+
+
+@router.post(
+    path="/bulk/delete",
+    response_model=BulkDeleteResult,
+    summary="Удалить несколько подменю",
+    status_code=http.HTTPStatus.OK,
+)
+async def submenu_bulk_delete(
+    menu_id: uuid_pkg.UUID,
+    data: BulkDelete,
+    submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> BulkDeleteResult:
+    return await submenu_service.delete_many(menu_id=menu_id, data=data)
+
+
+@router.post(
+    path="/{submenu_id}/restore",
+    response_model=SubmenuRead,
+    summary="Восстановить удалённое подменю",
+    status_code=http.HTTPStatus.OK,
+)
+async def submenu_restore(
+    menu_id: uuid_pkg.UUID,
+    submenu_id: uuid_pkg.UUID,
+    submenu_service: SubmenuService = Depends(get_submenu_service),
+) -> SubmenuRead:
+    return await submenu_service.restore(menu_id=menu_id, submenu_id=submenu_id)
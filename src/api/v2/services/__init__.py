@@ -1,4 +1,8 @@
+from .cache_keys import *
+from .pagination import *
 from .mixins import *
 from .dish import *
+from .export import *
+from .imports import *
 from .menu import *
 from .submenu import *
@@ -0,0 +1,199 @@
+import uuid as uuid_pkg
+
+__all__ = (
+    "CacheKey",
+    "CacheEvent",
+    "DEPENDENCIES",
+    "TAGS",
+    "cache_tags",
+    "invalidation_tags",
+)
+
+
+class CacheKey:
+    """Шаблоны ключей кэша, вложенные по родителю."""
+
+    # Списки кэшируются постранично, имя списка - тег всех его страниц
+    MENU_LIST = "menus"
+    MENU_PAGE = "menus:page:{limit}:{cursor}"
+    MENU_TREE = "menus:tree"
+    MENU_DETAIL = "menu:{menu_id}"
+    SUBMENU_LIST = "menu:{menu_id}:submenus"
+    SUBMENU_PAGE = "menu:{menu_id}:submenus:page:{limit}:{cursor}"
+    SUBMENU_DETAIL = "submenu:{submenu_id}"
+    DISH_LIST = "submenu:{submenu_id}:dishes"
+    DISH_PAGE = "submenu:{submenu_id}:dishes:page:{limit}:{cursor}"
+    DISH_DETAIL = "dish:{dish_id}"
+    # Теги поддеревьев: сбрасывают все ключи под удалённым родителем
+    MENU_SCOPE = "scope:menu:{menu_id}"
+    SUBMENU_SCOPE = "scope:submenu:{submenu_id}"
+    # Метка недавней записи: пока она есть, ключи собираются с основной базы
+    RECENT_WRITE = "db:recent-write"
+
+
+# Теги, которыми помечается ключ при записи в кэш.
+# Каждый ключ помечен своим именем, чтобы его можно было сбросить точечно,
+# страницы списков - именем списка.
+TAGS: dict[str, tuple[str, ...]] = {
+    CacheKey.MENU_PAGE: (CacheKey.MENU_LIST,),
+    CacheKey.MENU_TREE: (CacheKey.MENU_TREE,),
+    CacheKey.MENU_DETAIL: (
+        CacheKey.MENU_DETAIL,
+        CacheKey.MENU_SCOPE,
+    ),
+    CacheKey.SUBMENU_PAGE: (
+        CacheKey.SUBMENU_LIST,
+        CacheKey.MENU_SCOPE,
+    ),
+    CacheKey.SUBMENU_DETAIL: (
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.MENU_SCOPE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+    CacheKey.DISH_PAGE: (
+        CacheKey.DISH_LIST,
+        CacheKey.MENU_SCOPE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+    CacheKey.DISH_DETAIL: (
+        CacheKey.DISH_DETAIL,
+        CacheKey.MENU_SCOPE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+}
+
+
+class CacheEvent:
+    """События записи, после которых нужно сбросить кэш."""
+
+    MENU_CREATE = "menu.create"
+    MENU_UPDATE = "menu.update"
+    MENU_DELETE = "menu.delete"
+    MENU_RESTORE = "menu.restore"
+    SUBMENU_CREATE = "submenu.create"
+    SUBMENU_UPDATE = "submenu.update"
+    SUBMENU_DELETE = "submenu.delete"
+    SUBMENU_RESTORE = "submenu.restore"
+    SUBMENU_BULK = "submenu.bulk"
+    DISH_CREATE = "dish.create"
+    DISH_UPDATE = "dish.update"
+    DISH_DELETE = "dish.delete"
+    DISH_RESTORE = "dish.restore"
+    DISH_BULK = "dish.bulk"
+    CATALOG_IMPORT = "catalog.import"
+
+
+# Карта зависимостей: какие теги устаревают после события.
+# Счётчики подменю и блюд есть в меню и подменю, поэтому создание
+# и удаление затрагивают родителей, а обновление - только сам объект.
+DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    CacheEvent.MENU_CREATE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.MENU_UPDATE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.MENU_DELETE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_TREE,
+        CacheKey.MENU_SCOPE,
+    ),
+    # Пока меню было удалено, под ним могли закэшироваться пустые списки
+    # и ответы 404 - восстановление сбрасывает всё поддерево
+    CacheEvent.MENU_RESTORE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.MENU_TREE,
+        CacheKey.MENU_SCOPE,
+    ),
+    CacheEvent.SUBMENU_CREATE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.SUBMENU_UPDATE: (
+        CacheKey.SUBMENU_LIST,
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.SUBMENU_DELETE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.MENU_TREE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+    CacheEvent.SUBMENU_RESTORE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.MENU_TREE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+    # Пакет подменю с блюдами: всё под меню, включая обновлённые объекты
+    CacheEvent.SUBMENU_BULK: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_TREE,
+        CacheKey.MENU_SCOPE,
+    ),
+    CacheEvent.DISH_CREATE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.DISH_LIST,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.DISH_UPDATE: (
+        CacheKey.DISH_LIST,
+        CacheKey.DISH_DETAIL,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.DISH_DELETE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.DISH_LIST,
+        CacheKey.DISH_DETAIL,
+        CacheKey.MENU_TREE,
+    ),
+    CacheEvent.DISH_RESTORE: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.SUBMENU_DETAIL,
+        CacheKey.DISH_LIST,
+        CacheKey.DISH_DETAIL,
+        CacheKey.MENU_TREE,
+    ),
+    # Пакет блюд: всё под подменю, включая обновлённые блюда
+    CacheEvent.DISH_BULK: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_DETAIL,
+        CacheKey.SUBMENU_LIST,
+        CacheKey.MENU_TREE,
+        CacheKey.SUBMENU_SCOPE,
+    ),
+    # Импорт каталога: всё под каждым затронутым меню
+    CacheEvent.CATALOG_IMPORT: (
+        CacheKey.MENU_LIST,
+        CacheKey.MENU_TREE,
+        CacheKey.MENU_SCOPE,
+    ),
+}
+
+
+def cache_tags(key: str, **ids: uuid_pkg.UUID) -> list[str]:
+    """Получить теги для ключа кэша."""
+    return [template.format(**ids) for template in TAGS[key]]
+
+
+def invalidation_tags(event: str, **ids: uuid_pkg.UUID) -> list[str]:
+    """Получить теги, которые устаревают после события."""
+    return [template.format(**ids) for template in DEPENDENCIES[event]]
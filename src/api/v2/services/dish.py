@@ -1,14 +1,33 @@
 import uuid as uuid_pkg
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.v2.services import ServiceMixin
+from src import settings
+from src.api.v2.services import (
+    CacheEvent,
+    CacheKey,
+    ServiceMixin,
+    cache_tags,
+    decode_cursor,
+    encode_cursor,
+    pack_page,
+    unpack_page,
+)
 from src.db.cache import AbstractCache, get_cache
-from src.db.db import get_async_session
-from src.models import DishCreate, DishList, DishRead, DishUpdate
+from src.db.db import async_session, replica_session
+from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    BulkResult,
+    DishBulk,
+    DishCreate,
+    DishList,
+    DishRead,
+    DishUpdate,
+)
 
 __all__ = (
     "DishService",
@@ -20,28 +39,103 @@ from src.uow import SqlAlchemyUnitOfWork
 
 @dataclass
 class DishService(ServiceMixin):
-    cache_key: str = field(default="dish-list")
+    async def get_list(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Получить страницу блюд в виде JSON и курсор следующей страницы."""
+        page = await self.read_through(
+            CacheKey.DISH_PAGE.format(
+                submenu_id=submenu_id,
+                limit=limit,
+                cursor=cursor or "",
+            ),
+            partial(
+                DishService.build_list,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+                limit=limit,
+                cursor=cursor,
+            ),
+        )
+        return unpack_page(page)
 
-    async def get_list(self, submenu_id: uuid_pkg.UUID) -> DishList:
-        """Получить список блюд."""
+    async def build_list(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        limit: int,
+        cursor: str | None,
+    ) -> bytes:
+        cache_key = CacheKey.DISH_PAGE.format(
+            submenu_id=submenu_id,
+            limit=limit,
+            cursor=cursor or "",
+        )
         async with self.uow:
-            if cached_dishes := await self.cache.get(name=self.cache_key):
-                return cached_dishes
-
-            dishes = await self.uow.dish_repo.list(submenu_id=submenu_id)
-            if serialized_dishes := DishList.from_orm(dishes):
-                await self.cache.set(
-                    name=self.cache_key,
-                    value=serialized_dishes.json(),
+            # Лишняя строка показывает, есть ли следующая страница
+            dishes = await self.uow.dish_repo.list(
+                submenu_id=submenu_id,
+                limit=limit + 1,
+                after=decode_cursor(cursor),
+            )
+            next_cursor = None
+            if len(dishes) > limit:
+                next_cursor = encode_cursor(dishes[limit - 1])
+            serialized_dishes = DishList.from_orm(dishes[:limit])
+            # Вместе со страницей одним запросом прогреваем детальные ключи
+            entries = {
+                cache_key: pack_page(self.dump(serialized_dishes), next_cursor),
+            }
+            # Меню страницы - настоящее меню подменю, если блюда нашлись
+            page_menu_id = dishes[0].menu_id if dishes else menu_id
+            tags = {
+                cache_key: cache_tags(
+                    CacheKey.DISH_PAGE,
+                    menu_id=page_menu_id,
+                    submenu_id=submenu_id,
+                ),
+            }
+            for dish, serialized_dish in zip(dishes, serialized_dishes.__root__):
+                detail_key = CacheKey.DISH_DETAIL.format(dish_id=dish.id)
+                entries[detail_key] = self.dump(serialized_dish)
+                tags[detail_key] = cache_tags(
+                    CacheKey.DISH_DETAIL,
+                    menu_id=dish.menu_id,
+                    submenu_id=dish.submenu_id,
+                    dish_id=dish.id,
                 )
-        return serialized_dishes
+            await self.put_many(mapping=entries, tags=tags)
+        return entries[cache_key]
 
-    async def get_detail(self, dish_id: uuid_pkg.UUID) -> DishRead:
-        """Получить детальную информацию по блюду."""
-        async with self.uow:
-            if cached_dish := await self.cache.get(name=f"{dish_id}"):
-                return cached_dish
+    async def get_detail(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        dish_id: uuid_pkg.UUID,
+    ) -> bytes:
+        """Получить детальную информацию по блюду в виде JSON."""
+        return await self.read_through(
+            CacheKey.DISH_DETAIL.format(dish_id=dish_id),
+            partial(
+                DishService.build_detail,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+                dish_id=dish_id,
+            ),
+        )
 
+    async def build_detail(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        dish_id: uuid_pkg.UUID,
+    ) -> bytes:
+        cache_key = CacheKey.DISH_DETAIL.format(dish_id=dish_id)
+        async with self.uow:
             dish = await self.uow.dish_repo.get(dish_id=dish_id)
             if not dish:
                 raise HTTPException(
@@ -49,8 +143,18 @@ class DishService(ServiceMixin):
                     detail="dish not found",
                 )
 
-            if serialized_dish := DishRead.from_orm(dish):
-                await self.cache.set(name=f"{dish_id}", value=serialized_dish.json())
+            serialized_dish = self.dump(DishRead.from_orm(dish))
+            await self.put(
+                name=cache_key,
+                value=serialized_dish,
+                # Теги - по настоящим родителям блюда, а не по адресу
+                tags=cache_tags(
+                    CacheKey.DISH_DETAIL,
+                    menu_id=dish.menu_id,
+                    submenu_id=dish.submenu_id,
+                    dish_id=dish_id,
+                ),
+            )
         return serialized_dish
 
     async def create(
@@ -64,14 +168,63 @@ class DishService(ServiceMixin):
             data.menu_id = menu_id
             data.submenu_id = submenu_id
             new_dish = await self.uow.dish_repo.add(data=data)
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name=f"{submenu_id}")
-            await self.cache.delete(name="menu-list")
-            await self.cache.delete(name="submenu-list")
-            await self.cache.delete(name=self.cache_key)
-        return DishRead.from_orm(new_dish)
-
-    async def update(self, dish_id: uuid_pkg.UUID, data: DishUpdate) -> DishRead:
+            await self.invalidate(
+                CacheEvent.DISH_CREATE,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+            )
+        dish = DishRead.from_orm(new_dish)
+        await self.store(
+            CacheKey.DISH_DETAIL,
+            dish,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=dish.id,
+        )
+        self.refresh_list(menu_id=menu_id, submenu_id=submenu_id)
+        return dish
+
+    async def bulk_upsert(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        data: DishBulk,
+    ) -> BulkResult:
+        """Создать или обновить пакет блюд подменю одной транзакцией."""
+        async with self.uow:
+            submenu = await self.uow.submenu_repo.get(submenu_id=submenu_id)
+            if not submenu or submenu.parent_id != menu_id:
+                raise HTTPException(
+                    status_code=HTTPStatus.NOT_FOUND,
+                    detail="submenu not found",
+                )
+
+            values = [
+                {
+                    **dish.dict(),
+                    "menu_id": menu_id,
+                    "submenu_id": submenu_id,
+                    "is_removed": False,
+                }
+                for dish in data.__root__
+            ]
+            written = await self.uow.dish_repo.upsert_many(values=values)
+            await self.check_written(
+                values, written, "dishes belong to another submenu"
+            )
+            await self.invalidate(
+                CacheEvent.DISH_BULK,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+            )
+        return BulkResult(dishes=len(written))
+
+    async def update(
+        self,
+        submenu_id: uuid_pkg.UUID,
+        dish_id: uuid_pkg.UUID,
+        data: DishUpdate,
+    ) -> DishRead:
         """Обновить блюдо."""
         async with self.uow:
             updated_dish = await self.uow.dish_repo.update(dish_id=dish_id, data=data)
@@ -80,9 +233,38 @@ class DishService(ServiceMixin):
                     status_code=HTTPStatus.NOT_FOUND,
                     detail="dish not found",
                 )
-            await self.cache.delete(name=f"{dish_id}")
-            await self.cache.delete(name=self.cache_key)
-        return DishRead.from_orm(updated_dish)
+            await self.invalidate(
+                CacheEvent.DISH_UPDATE,
+                submenu_id=updated_dish.submenu_id,
+                dish_id=dish_id,
+            )
+        dish = DishRead.from_orm(updated_dish)
+        await self.store(
+            CacheKey.DISH_DETAIL,
+            dish,
+            menu_id=updated_dish.menu_id,
+            submenu_id=updated_dish.submenu_id,
+            dish_id=dish_id,
+        )
+        self.refresh_list(
+            menu_id=updated_dish.menu_id,
+            submenu_id=updated_dish.submenu_id,
+        )
+        return dish
+
+    def refresh_list(self, menu_id: uuid_pkg.UUID, submenu_id: uuid_pkg.UUID) -> None:
+        """Пересобрать первую страницу блюд: её и читают после записи."""
+        limit = settings.app.page_default_limit
+        self.refresh(
+            CacheKey.DISH_PAGE.format(submenu_id=submenu_id, limit=limit, cursor=""),
+            partial(
+                DishService.build_list,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+                limit=limit,
+                cursor=None,
+            ),
+        )
 
     async def delete(
         self,
@@ -92,17 +274,80 @@ class DishService(ServiceMixin):
     ) -> bool:
         """Удалить блюдо."""
         async with self.uow:
-            is_deleted = await self.uow.dish_repo.delete(dish_id=dish_id)
-            await self.cache.delete(name=f"{dish_id}")
-            await self.cache.delete(name=f"{submenu_id}")
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name=self.cache_key)
-        return is_deleted
+            if parents := await self.uow.dish_repo.delete(dish_id=dish_id):
+                await self.invalidate(
+                    CacheEvent.DISH_DELETE,
+                    menu_id=parents.menu_id,
+                    submenu_id=parents.submenu_id,
+                    dish_id=dish_id,
+                )
+        return True
+
+    async def restore(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        dish_id: uuid_pkg.UUID,
+    ) -> DishRead:
+        """Восстановить удалённое блюдо."""
+        async with self.uow:
+            restored = await self.uow.dish_repo.restore(
+                submenu_id=submenu_id,
+                dish_id=dish_id,
+            )
+            if not restored or not (
+                restored_dish := await self.uow.dish_repo.get(dish_id=dish_id)
+            ):
+                await self.uow.rollback()
+                raise HTTPException(
+                    status_code=HTTPStatus.NOT_FOUND,
+                    detail="removed dish not found",
+                )
+            await self.invalidate(
+                CacheEvent.DISH_RESTORE,
+                menu_id=restored_dish.menu_id,
+                submenu_id=submenu_id,
+                dish_id=dish_id,
+            )
+        dish = DishRead.from_orm(restored_dish)
+        await self.store(
+            CacheKey.DISH_DETAIL,
+            dish,
+            menu_id=restored_dish.menu_id,
+            submenu_id=submenu_id,
+            dish_id=dish_id,
+        )
+        self.refresh_list(menu_id=restored_dish.menu_id, submenu_id=submenu_id)
+        return dish
+
+    async def delete_many(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+        data: BulkDelete,
+    ) -> BulkDeleteResult:
+        """Удалить несколько блюд подменю одним запросом."""
+        async with self.uow:
+            deleted = await self.uow.dish_repo.delete_many(
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+                dish_ids=data.ids,
+            )
+            await self.invalidate_many(
+                CacheEvent.DISH_DELETE,
+                (
+                    {"menu_id": menu_id, "submenu_id": submenu_id, "dish_id": id_}
+                    for id_ in deleted
+                ),
+            )
+        return BulkDeleteResult(deleted=deleted)
 
 
 async def get_dish_service(
     cache: AbstractCache = Depends(get_cache),
-    session: AsyncSession = Depends(get_async_session),
 ) -> DishService:
-    uow = SqlAlchemyUnitOfWork(session=session)
+    uow = SqlAlchemyUnitOfWork(
+        session_factory=async_session,
+        replica_factory=replica_session,
+    )
     return DishService(cache=cache, uow=uow)
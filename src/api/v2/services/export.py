@@ -0,0 +1,53 @@
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+import orjson
+from fastapi import Depends
+
+from src.api.v2.services import ServiceMixin
+from src.db.cache import AbstractCache, get_cache
+from src.db.db import async_session
+
+__all__ = (
+    "ExportService",
+    "get_export_service",
+)
+
+from src.uow import SqlAlchemyUnitOfWork
+
+
+@dataclass
+class ExportService(ServiceMixin):
+    batch_size: int = 1000
+
+    async def export(self) -> AsyncIterator[bytes]:
+        """Выгрузить меню, подменю и блюда в NDJSON.
+
+        Строки читаются серверным курсором и отдаются порциями, поэтому
+        память не зависит от размера каталога. Три выборки читают один
+        снимок: запись во время выгрузки не оставит блюд без подменю.
+        """
+        async with self.uow:
+            await self.uow.snapshot()
+            for kind, repository in (
+                ("menu", self.uow.menu_repo),
+                ("submenu", self.uow.submenu_repo),
+                ("dish", self.uow.dish_repo),
+            ):
+                async for rows in repository.stream_all(batch_size=self.batch_size):
+                    yield b"".join(
+                        orjson.dumps(
+                            {"type": kind, **row},
+                            # Decimal цены - строкой, как в DishRead
+                            default=str,
+                            option=orjson.OPT_APPEND_NEWLINE,
+                        )
+                        for row in rows
+                    )
+
+
+async def get_export_service(
+    cache: AbstractCache = Depends(get_cache),
+) -> ExportService:
+    uow = SqlAlchemyUnitOfWork(session_factory=async_session)
+    return ExportService(cache=cache, uow=uow)
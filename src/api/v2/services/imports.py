@@ -0,0 +1,235 @@
+import codecs
+import csv
+import uuid as uuid_pkg
+from collections.abc import AsyncIterable, AsyncIterator
+from dataclasses import dataclass
+from functools import lru_cache
+from http import HTTPStatus
+from operator import attrgetter
+from typing import Any
+
+from fastapi import Depends, HTTPException
+from pydantic import validate_model
+from sqlmodel import SQLModel
+
+from src.api.v2.services import CacheEvent, ServiceMixin
+from src.db.cache import AbstractCache, get_cache
+from src.db.db import async_session
+from src.models import ImportResult, ImportRowError, MenuCreate
+from src.models.dish import DishBase
+from src.models.submenu import SubmenuBase
+
+__all__ = (
+    "ImportService",
+    "get_import_service",
+    "parse_row",
+    "read_records",
+)
+
+from src.uow import SqlAlchemyUnitOfWork
+
+# Пространство имён для id меню, у которых в файле нет id: повторный импорт
+# того же файла обновляет, а не дублирует. Id подменю и блюд выводятся
+# из id родителя и названия.
+MENU_NAMESPACE = uuid_pkg.UUID("e7032f23-ffe8-4cf8-9f62-2755e33a2442")
+REQUIRED_COLUMNS = ("menu_title",)
+
+
+def split_records(text: str) -> tuple[list[str], str]:
+    """Разбить текст на законченные записи CSV и незаконченный хвост.
+
+    Перевод строки внутри кавычек запись не завершает: у законченной
+    записи число кавычек чётное, экранированная кавычка "" даёт две.
+    """
+    records: list[str] = []
+    start = position = quotes = 0
+    while (end := text.find("\n", position)) != -1:
+        quotes += text.count('"', position, end)
+        position = end + 1
+        if quotes % 2 == 0:
+            records.append(text[start:position])
+            start, quotes = position, 0
+    return records, text[start:]
+
+
+async def read_records(chunks: AsyncIterable[bytes]) -> AsyncIterator[list[list[str]]]:
+    """Разобрать поток байтов CSV в записи, порцией на каждый кусок потока."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    tail = ""
+    try:
+        async for chunk in chunks:
+            records, tail = split_records(tail + decoder.decode(chunk))
+            if records:
+                yield list(csv.reader(records))
+        tail += decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="file is not valid UTF-8",
+        )
+    if tail.strip():
+        yield list(csv.reader([tail]))
+
+
+@lru_cache(maxsize=4096)
+def validate(
+    model: type[SQLModel],
+    prefix: str,
+    values: tuple[tuple[str, str], ...],
+) -> dict[str, Any]:
+    # Меню и подменю повторяются в каждой строке с блюдом: проверяем один раз.
+    # validate_model не создаёт экземпляр модели, на больших файлах это заметно
+    fields, _, error = validate_model(model, dict(values))
+    if error:
+        raise ValueError(
+            "; ".join(f"{prefix}_{e['loc'][0]}: {e['msg']}" for e in error.errors())
+        )
+    return fields
+
+
+def parse_object(
+    values: dict[str, str],
+    prefix: str,
+    model: type[SQLModel],
+) -> dict[str, Any] | None:
+    """Объект уровня prefix из строки файла, None - если его колонки пусты."""
+    fields = {name: values.get(f"{prefix}_{name}", "") for name in model.__fields__}
+    if not any(fields.values()) and not values.get(f"{prefix}_id"):
+        return None
+    # Пустая ячейка - нет значения, но пустое описание допустимо
+    fields = {"description": "", **{k: v for k, v in fields.items() if v}}
+    return validate(model, prefix, tuple(fields.items()))
+
+
+def object_id(
+    values: dict[str, str],
+    prefix: str,
+    namespace: uuid_pkg.UUID,
+    title: str,
+) -> uuid_pkg.UUID:
+    if value := values.get(f"{prefix}_id"):
+        try:
+            return uuid_pkg.UUID(value)
+        except ValueError:
+            raise ValueError(f"{prefix}_id: invalid uuid")
+    return derived_id(namespace, title)
+
+
+@lru_cache(maxsize=4096)
+def derived_id(namespace: uuid_pkg.UUID, title: str) -> uuid_pkg.UUID:
+    return uuid_pkg.uuid5(namespace, title)
+
+
+def parse_row(line: int, values: dict[str, str]) -> tuple:
+    """Запись для промежуточной таблицы импорта из строки файла.
+
+    Строка описывает меню и, если заполнены их колонки, подменю и блюдо.
+    Некорректная строка - ValueError с описанием ошибки.
+    """
+    values = {name: value.strip() for name, value in values.items() if name}
+    menu = parse_object(values, "menu", MenuCreate)
+    if menu is None:
+        raise ValueError("menu_title: field required")
+    submenu = parse_object(values, "submenu", SubmenuBase)
+    dish = parse_object(values, "dish", DishBase)
+    if dish and not submenu:
+        raise ValueError("dish without submenu")
+
+    menu_id = object_id(values, "menu", MENU_NAMESPACE, menu["title"])
+    submenu_id = dish_id = None
+    if submenu:
+        submenu_id = object_id(values, "submenu", menu_id, submenu["title"])
+    if dish:
+        dish_id = object_id(values, "dish", submenu_id, dish["title"])
+    submenu, dish = submenu or {}, dish or {}
+    return (
+        line,
+        menu_id,
+        menu["title"],
+        menu["description"],
+        submenu_id,
+        submenu.get("title"),
+        submenu.get("description"),
+        dish_id,
+        dish.get("title"),
+        dish.get("description"),
+        dish.get("price"),
+    )
+
+
+@dataclass
+class ImportService(ServiceMixin):
+    # Строк в одном COPY
+    batch_size: int = 5000
+
+    async def import_csv(self, chunks: AsyncIterable[bytes]) -> ImportResult:
+        """Загрузить каталог из CSV одной транзакцией.
+
+        Файл читается потоком: проверенные строки порциями копируются
+        в промежуточную таблицу, затем переносятся в каталог. Строки
+        с ошибками пропускаются и попадают в отчёт, кэш сбрасывается
+        один раз в конце.
+        """
+        errors: list[ImportRowError] = []
+        async with self.uow:
+            await self.uow.import_repo.create_staging()
+            async for records in self.parse(chunks, errors):
+                await self.uow.import_repo.copy_rows(records=records)
+            errors.extend(
+                ImportRowError(line=line, message=message)
+                for line, message in await self.uow.import_repo.reject_conflicts()
+            )
+            menu_ids, submenus, dishes = await self.uow.import_repo.merge()
+            await self.invalidate_many(
+                CacheEvent.CATALOG_IMPORT,
+                ({"menu_id": menu_id} for menu_id in menu_ids),
+            )
+        errors.sort(key=attrgetter("line"))
+        return ImportResult(
+            menus=len(menu_ids),
+            submenus=submenus,
+            dishes=dishes,
+            errors=errors,
+        )
+
+    async def parse(
+        self,
+        chunks: AsyncIterable[bytes],
+        errors: list[ImportRowError],
+    ) -> AsyncIterator[list[tuple]]:
+        """Проверенные строки файла порциями по batch_size, ошибки - в errors.
+
+        Номер строки считается по записям CSV, первая - заголовок.
+        """
+        header: list[str] | None = None
+        line = 0
+        batch: list[tuple] = []
+        async for rows in read_records(chunks):
+            for row in rows:
+                line += 1
+                if header is None:
+                    header = [name.strip() for name in row]
+                    if missing := set(REQUIRED_COLUMNS) - set(header):
+                        raise HTTPException(
+                            status_code=HTTPStatus.BAD_REQUEST,
+                            detail=f"missing columns: {', '.join(sorted(missing))}",
+                        )
+                    continue
+                if not any(row):
+                    continue
+                try:
+                    batch.append(parse_row(line, dict(zip(header, row))))
+                except ValueError as error:
+                    errors.append(ImportRowError(line=line, message=str(error)))
+            if len(batch) >= self.batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+async def get_import_service(
+    cache: AbstractCache = Depends(get_cache),
+) -> ImportService:
+    uow = SqlAlchemyUnitOfWork(session_factory=async_session)
+    return ImportService(cache=cache, uow=uow)
@@ -1,14 +1,36 @@
 import uuid as uuid_pkg
-from dataclasses import dataclass, field
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.v2.services import ServiceMixin
+from src import settings
+from src.api.v2.services import (
+    CacheEvent,
+    CacheKey,
+    ServiceMixin,
+    cache_tags,
+    decode_cursor,
+    encode_cursor,
+    pack_page,
+    unpack_page,
+)
 from src.db.cache import AbstractCache, get_cache
-from src.db.db import get_async_session
-from src.models import MenuCreate, MenuList, MenuRead, MenuUpdate
+from src.db.db import async_session, replica_session
+from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    DishRead,
+    MenuCreate,
+    MenuList,
+    MenuRead,
+    MenuTree,
+    MenuTreeList,
+    MenuUpdate,
+    SubmenuTree,
+)
 
 __all__ = (
     "MenuService",
@@ -20,25 +42,87 @@ from src.uow import SqlAlchemyUnitOfWork
 
 @dataclass
 class MenuService(ServiceMixin):
-    cache_key: str = field(default="menu-list")
-
-    async def get_list(self) -> MenuList:
-        """Получить список меню."""
+    async def get_list(
+        self,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Получить страницу меню в виде JSON и курсор следующей страницы."""
+        page = await self.read_through(
+            CacheKey.MENU_PAGE.format(limit=limit, cursor=cursor or ""),
+            partial(MenuService.build_list, limit=limit, cursor=cursor),
+        )
+        return unpack_page(page)
+
+    async def build_list(self, limit: int, cursor: str | None) -> bytes:
+        cache_key = CacheKey.MENU_PAGE.format(limit=limit, cursor=cursor or "")
         async with self.uow:
-            if cached_menus := await self.cache.get(name=self.cache_key):
-                return cached_menus
-
+            # Лишняя строка показывает, есть ли следующая страница
+            menus = await self.uow.menu_repo.list(
+                limit=limit + 1,
+                after=decode_cursor(cursor),
+            )
+            next_cursor = None
+            if len(menus) > limit:
+                next_cursor = encode_cursor(menus[limit - 1])
+            serialized_menus = MenuList.from_orm(menus[:limit])
+            # Вместе со страницей одним запросом прогреваем детальные ключи
+            entries = {
+                cache_key: pack_page(self.dump(serialized_menus), next_cursor),
+            }
+            tags = {cache_key: cache_tags(CacheKey.MENU_PAGE)}
+            for menu in serialized_menus.__root__:
+                detail_key = CacheKey.MENU_DETAIL.format(menu_id=menu.id)
+                entries[detail_key] = self.dump(menu)
+                tags[detail_key] = cache_tags(CacheKey.MENU_DETAIL, menu_id=menu.id)
+            await self.put_many(mapping=entries, tags=tags)
+        return entries[cache_key]
+
+    async def get_tree(self) -> bytes:
+        """Получить все меню с вложенными подменю и блюдами в виде JSON."""
+        return await self.read_through(CacheKey.MENU_TREE, MenuService.build_tree)
+
+    async def build_tree(self) -> bytes:
+        async with self.uow:
+            # Три запроса на всё дерево вместо обхода по каждому меню
             menus = await self.uow.menu_repo.list()
-            if serialized_menus := MenuList.from_orm(menus):
-                await self.cache.set(name=self.cache_key, value=serialized_menus.json())
-        return serialized_menus
-
-    async def get_detail(self, menu_id: uuid_pkg.UUID) -> MenuRead:
-        """Получить детальную информацию по меню."""
+            submenus = await self.uow.submenu_repo.list_all()
+            dishes = await self.uow.dish_repo.list_all()
+
+            dishes_by_submenu = defaultdict(list)
+            for dish in dishes:
+                dishes_by_submenu[dish.submenu_id].append(DishRead.from_orm(dish))
+
+            submenus_by_menu = defaultdict(list)
+            for submenu in submenus:
+                submenu_tree = SubmenuTree.from_orm(submenu)
+                submenu_tree.dishes = dishes_by_submenu[submenu.id]
+                submenus_by_menu[submenu.parent_id].append(submenu_tree)
+
+            menu_trees = []
+            for menu in menus:
+                menu_tree = MenuTree.from_orm(menu)
+                menu_tree.submenus = submenus_by_menu[menu.id]
+                menu_trees.append(menu_tree)
+
+            serialized_tree = self.dump(MenuTreeList.parse_obj(menu_trees))
+            await self.put(
+                name=CacheKey.MENU_TREE,
+                value=serialized_tree,
+                tags=cache_tags(CacheKey.MENU_TREE),
+            )
+        return serialized_tree
+
+    async def get_detail(self, menu_id: uuid_pkg.UUID) -> bytes:
+        """Получить детальную информацию по меню в виде JSON."""
+        return await self.read_through(
+            CacheKey.MENU_DETAIL.format(menu_id=menu_id),
+            partial(MenuService.build_detail, menu_id=menu_id),
+        )
+
+    async def build_detail(self, menu_id: uuid_pkg.UUID) -> bytes:
+        cache_key = CacheKey.MENU_DETAIL.format(menu_id=menu_id)
         async with self.uow:
-            if cached_menu := await self.cache.get(name=f"{menu_id}"):
-                return cached_menu
-
             menu = await self.uow.menu_repo.get(menu_id=menu_id)
             if not menu:
                 raise HTTPException(
@@ -46,16 +130,23 @@ class MenuService(ServiceMixin):
                     detail="menu not found",
                 )
 
-            if serialized_menu := MenuRead.from_orm(menu):
-                await self.cache.set(name=f"{menu_id}", value=serialized_menu.json())
+            serialized_menu = self.dump(MenuRead.from_orm(menu))
+            await self.put(
+                name=cache_key,
+                value=serialized_menu,
+                tags=cache_tags(CacheKey.MENU_DETAIL, menu_id=menu_id),
+            )
         return serialized_menu
 
     async def create(self, data: MenuCreate) -> MenuRead:
         """Создать меню."""
         async with self.uow:
             new_menu = await self.uow.menu_repo.add(data=data)
-            await self.cache.delete(name=self.cache_key)
-        return MenuRead.from_orm(new_menu)
+            await self.invalidate(CacheEvent.MENU_CREATE)
+        menu = MenuRead.from_orm(new_menu)
+        await self.store(CacheKey.MENU_DETAIL, menu, menu_id=menu.id)
+        self.refresh_list()
+        return menu
 
     async def update(self, menu_id: uuid_pkg.UUID, data: MenuUpdate) -> MenuRead:
         """Обновить меню."""
@@ -66,22 +157,58 @@ class MenuService(ServiceMixin):
                     status_code=HTTPStatus.NOT_FOUND,
                     detail="menu not found",
                 )
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name=self.cache_key)
-        return MenuRead.from_orm(updated_menu)
+            await self.invalidate(CacheEvent.MENU_UPDATE, menu_id=menu_id)
+        menu = MenuRead.from_orm(updated_menu)
+        await self.store(CacheKey.MENU_DETAIL, menu, menu_id=menu_id)
+        self.refresh_list()
+        return menu
+
+    def refresh_list(self) -> None:
+        """Пересобрать первую страницу меню: её и читают после записи."""
+        limit = settings.app.page_default_limit
+        self.refresh(
+            CacheKey.MENU_PAGE.format(limit=limit, cursor=""),
+            partial(MenuService.build_list, limit=limit, cursor=None),
+        )
 
     async def delete(self, menu_id: uuid_pkg.UUID) -> bool:
         """Удалить меню."""
         async with self.uow:
             is_deleted = await self.uow.menu_repo.delete(menu_id=menu_id)
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name=self.cache_key)
+            await self.invalidate(CacheEvent.MENU_DELETE, menu_id=menu_id)
         return is_deleted
 
+    async def restore(self, menu_id: uuid_pkg.UUID) -> MenuRead:
+        """Восстановить удалённое меню вместе с подменю и блюдами."""
+        async with self.uow:
+            if not await self.uow.menu_repo.restore(menu_id=menu_id):
+                raise HTTPException(
+                    status_code=HTTPStatus.NOT_FOUND,
+                    detail="removed menu not found",
+                )
+            restored_menu = await self.uow.menu_repo.get(menu_id=menu_id)
+            await self.invalidate(CacheEvent.MENU_RESTORE, menu_id=menu_id)
+        menu = MenuRead.from_orm(restored_menu)
+        await self.store(CacheKey.MENU_DETAIL, menu, menu_id=menu_id)
+        self.refresh_list()
+        return menu
+
+    async def delete_many(self, data: BulkDelete) -> BulkDeleteResult:
+        """Удалить несколько меню одним запросом."""
+        async with self.uow:
+            deleted = await self.uow.menu_repo.delete_many(menu_ids=data.ids)
+            await self.invalidate_many(
+                CacheEvent.MENU_DELETE,
+                ({"menu_id": menu_id} for menu_id in deleted),
+            )
+        return BulkDeleteResult(deleted=deleted)
+
 
 async def get_menu_service(
     cache: AbstractCache = Depends(get_cache),
-    session: AsyncSession = Depends(get_async_session),
 ) -> MenuService:
-    uow = SqlAlchemyUnitOfWork(session=session)
+    uow = SqlAlchemyUnitOfWork(
+        session_factory=async_session,
+        replica_factory=replica_session,
+    )
     return MenuService(cache=cache, uow=uow)
@@ -1,15 +1,270 @@
-from dataclasses import dataclass
+import asyncio
+import logging
+import time
+import uuid as uuid_pkg
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass, replace
+from functools import partial
+from http import HTTPStatus
+from typing import Any, NamedTuple
 
+import orjson
+from fastapi import HTTPException
+from pydantic.utils import ROOT_KEY
+from sqlmodel import SQLModel
+
+from src import settings
+from src.api.v2.services.cache_keys import CacheKey, cache_tags, invalidation_tags
 from src.db import dummy_cache
 from src.db.cache import AbstractCache
 from src.uow import AbstractUnitOfWork
 
+logger = logging.getLogger(__name__)
+
+Builder = Callable[[Any], Awaitable[bytes]]
+
+
+class Rebuild(NamedTuple):
+    """Пересборка ключа и поколение кэша, в котором она начата."""
+
+    task: asyncio.Task
+    generation: int
+
+
+# Пересборки ключей, идущие сейчас в этом воркере
+inflight: dict[str, Rebuild] = {}
+
 
 @dataclass
 class ServiceMixin:
     cache: AbstractCache
     uow: AbstractUnitOfWork
+    # Жёсткий срок жизни ключа: после него запрос ждёт пересборки
+    cache_expire: int = settings.redis.cache_expire_time
+    # Мягкий срок: после него отдаём старое значение и обновляем ключ
+    # в фоне, 0 - выключено
+    cache_stale_time: int = settings.redis.cache_stale_time
+    # Запись кладёт свежий объект в кэш и пересобирает первую страницу
+    # списка, а не только сбрасывает ключи до следующего чтения
+    cache_write_through: bool = settings.redis.cache_write_through
+    # Собирать ключи кэша с реплики; сразу после записи - с основной базы,
+    # иначе в кэш на весь срок попадёт то, что реплика ещё не получила
+    read_from_replica: bool = settings.postgres.replica_host is not None
+    replica_sticky_time: int = settings.postgres.replica_sticky_time
+    # Поколение кэша, в котором начата сборка ключа; None - сервис не собирает
+    generation: int | None = None
 
     def __post_init__(self):
         if self.cache is None:
             self.cache = dummy_cache.DummyCache()
+
+    @staticmethod
+    def dump(model: SQLModel) -> bytes:
+        """Сериализовать схему в JSON один раз - для кэша и для ответа."""
+        data = model.dict()
+        if model.__custom_root_type__:
+            data = data[ROOT_KEY]
+        return orjson.dumps(data)
+
+    def fork(self) -> "ServiceMixin":
+        """Копия сервиса со своей сессией, для фоновой работы."""
+        return replace(self, uow=self.uow.fork())
+
+    def is_stale(self, ttl: int | None) -> bool:
+        if not self.cache_stale_time or ttl is None:
+            return False
+        return self.cache_expire - ttl >= self.cache_stale_time
+
+    async def read_through(self, cache_key: str, build: Builder) -> bytes:
+        """Получить ключ из кэша, а при промахе собрать его один раз.
+
+        build вызывается с сервисом и сам записывает результат в кэш.
+        Одновременные промахи по одному ключу в воркере ждут одну задачу
+        сборки; между воркерами сборку ограничивает блокировка в кэше.
+        Устаревший по мягкому сроку ключ отдаётся сразу, а пересобирается
+        в фоне на отдельной сессии.
+        """
+        cached, ttl = await self.cache.get_raw_with_ttl(name=cache_key)
+        if cached:
+            if self.is_stale(ttl) and not is_building(cache_key):
+                task = self.start_rebuild(cache_key, build, self.fork())
+                task.add_done_callback(log_refresh_error)
+            return cached
+
+        task = self.start_rebuild(cache_key, build, self)
+        # Отмена запроса, начавшего сборку, не должна отменять её для остальных
+        return await asyncio.shield(task)
+
+    def start_rebuild(
+        self,
+        cache_key: str,
+        build: Builder,
+        service: "ServiceMixin",
+    ) -> asyncio.Task:
+        """Начать сборку ключа или присоединиться к уже идущей.
+
+        Сборка, начатая до последнего сброса кэша, вытесняется новой:
+        её результат уже не попадёт в кэш.
+        """
+        if is_building(cache_key):
+            return inflight[cache_key].task
+        generation = AbstractUnitOfWork.generation
+        service = replace(service, generation=generation)
+        task = asyncio.create_task(self.rebuild(cache_key, build, service))
+        inflight[cache_key] = Rebuild(task=task, generation=generation)
+        task.add_done_callback(partial(forget_rebuild, cache_key))
+        return task
+
+    async def rebuild(
+        self,
+        cache_key: str,
+        build: Builder,
+        service: "ServiceMixin",
+    ) -> bytes:
+        deadline = time.monotonic() + settings.redis.rebuild_lock_wait_time
+        while (token := await self.lock_rebuild(cache_key)) is None:
+            # Ключ собирает другой воркер: ждём его результат в кэше.
+            # Вытесненная сборка отпускает блокировку, не записав ключ, -
+            # тогда блокировку берём сами
+            await asyncio.sleep(0.05)
+            if cached := await self.cache.get_raw(name=cache_key):
+                return cached
+            if time.monotonic() >= deadline:
+                return await build(await service.reader())
+        try:
+            return await build(await service.reader())
+        finally:
+            await self.cache.release_lock(name=cache_key, token=token)
+
+    async def lock_rebuild(self, cache_key: str) -> str | None:
+        return await self.cache.acquire_lock(
+            name=cache_key,
+            expire=settings.redis.rebuild_lock_expire_time,
+        )
+
+    async def reader(self) -> "ServiceMixin":
+        """Сервис для сборки ключа: на реплике, если ей сейчас можно верить."""
+        if not self.read_from_replica:
+            return self
+        if await self.cache.get_raw(name=CacheKey.RECENT_WRITE):
+            return self
+        if (uow := await self.uow.replica()) is None:
+            return self
+        return replace(self, uow=uow)
+
+    async def mark_written(self) -> None:
+        """Отметить запись: следующие replica_sticky_time секунд читаем с основной базы."""
+        if self.read_from_replica:
+            await self.cache.set(
+                name=CacheKey.RECENT_WRITE,
+                value=b"1",
+                expire=self.replica_sticky_time,
+            )
+
+    async def store(self, key: str, model: SQLModel, **ids: uuid_pkg.UUID) -> None:
+        """Записать объект, только что записанный в базу, в его ключ кэша.
+
+        Вызывается после коммита: в кэш не попадает то, что откатилось.
+        Если после коммита кэш сбросила другая запись, её строка новее:
+        объект не пишем, ключ соберётся при следующем чтении.
+        """
+        if self.cache_write_through and not self.is_overwritten():
+            await self.cache.set(
+                name=key.format(**ids),
+                value=self.dump(model),
+                expire=self.cache_expire,
+                tags=cache_tags(key, **ids),
+            )
+
+    def is_overwritten(self) -> bool:
+        """После коммита этой записи кэш уже сбросила более поздняя."""
+        return self.uow.flushed_generation != AbstractUnitOfWork.generation
+
+    def is_superseded(self) -> bool:
+        """Кэш сбросили после начала сборки: собранное могло устареть."""
+        if self.generation is None:
+            return False
+        return self.generation < AbstractUnitOfWork.generation
+
+    async def put(self, name: str, value: bytes, tags: Iterable[str]) -> None:
+        """Записать собранный ключ, если с начала сборки кэш не сбрасывали."""
+        if not self.is_superseded():
+            await self.cache.set(
+                name=name,
+                value=value,
+                expire=self.cache_expire,
+                tags=tags,
+            )
+
+    async def put_many(
+        self,
+        mapping: dict[str, bytes],
+        tags: dict[str, Iterable[str]],
+    ) -> None:
+        """То же для нескольких ключей одной сборки."""
+        if not self.is_superseded():
+            await self.cache.set_many(
+                mapping=mapping,
+                expire=self.cache_expire,
+                tags=tags,
+            )
+
+    def refresh(self, cache_key: str, build: Builder) -> None:
+        """Пересобрать сброшенный записью ключ в фоне, после коммита."""
+        if self.cache_write_through and not is_building(cache_key):
+            task = self.start_rebuild(cache_key, build, self.fork())
+            task.add_done_callback(log_refresh_error)
+
+    async def check_written(
+        self,
+        values: list[dict],
+        written: list[uuid_pkg.UUID],
+        detail: str,
+    ) -> None:
+        """Откатить пакет, если часть строк не записана: их id заняты у другого родителя."""
+        if foreign := {row["id"] for row in values} - set(written):
+            await self.uow.rollback()
+            raise HTTPException(
+                status_code=HTTPStatus.CONFLICT,
+                detail={"message": detail, "ids": sorted(map(str, foreign))},
+            )
+
+    async def invalidate(self, event: str, **ids: uuid_pkg.UUID) -> None:
+        """Сбросить ключи кэша, зависящие от события, после коммита.
+
+        Теги копятся в unit of work и сбрасываются одной операцией
+        на всю транзакцию; при откате ничего не сбрасывается.
+        """
+        await self.mark_written()
+        self.uow.invalidate_after_commit(
+            self.cache,
+            invalidation_tags(event, **ids),
+        )
+
+    async def invalidate_many(
+        self,
+        event: str,
+        objects: Iterable[dict[str, uuid_pkg.UUID]],
+    ) -> None:
+        """То же для события над несколькими объектами."""
+        tags = {tag for ids in objects for tag in invalidation_tags(event, **ids)}
+        if tags:
+            await self.mark_written()
+            self.uow.invalidate_after_commit(self.cache, tags)
+
+
+def is_building(cache_key: str) -> bool:
+    """Ключ уже собирается в текущем поколении кэша."""
+    rebuild = inflight.get(cache_key)
+    return rebuild is not None and rebuild.generation == AbstractUnitOfWork.generation
+
+
+def forget_rebuild(cache_key: str, task: asyncio.Task) -> None:
+    # Вытесненная сборка не должна убрать из inflight ту, что её сменила
+    if (rebuild := inflight.get(cache_key)) is not None and rebuild.task is task:
+        del inflight[cache_key]
+
+
+def log_refresh_error(task: asyncio.Task) -> None:
+    if not task.cancelled() and (error := task.exception()) is not None:
+        logger.error("Background cache refresh failed", exc_info=error)
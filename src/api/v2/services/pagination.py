@@ -0,0 +1,51 @@
+import base64
+import binascii
+import uuid as uuid_pkg
+from datetime import datetime
+from http import HTTPStatus
+
+from fastapi import HTTPException
+
+from src.api.v2.repositories import Cursor
+from src.models.mixins import TimestampMixin
+
+__all__ = (
+    "decode_cursor",
+    "encode_cursor",
+    "pack_page",
+    "unpack_page",
+)
+
+
+def encode_cursor(row: TimestampMixin) -> str:
+    """Непрозрачный курсор на строку, после которой начнётся страница."""
+    value = f"{row.created_at.isoformat()}|{row.id}"
+    return base64.urlsafe_b64encode(value.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str | None) -> Cursor | None:
+    if not cursor:
+        return None
+    try:
+        value = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, row_id = value.decode().split("|")
+        return datetime.fromisoformat(created_at), uuid_pkg.UUID(row_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="invalid cursor",
+        )
+
+
+def pack_page(content: bytes, next_cursor: str | None) -> bytes:
+    """Уложить страницу и курсор следующей в одно значение кэша.
+
+    Курсор идёт первой строкой: orjson без отступов не пишет переводов
+    строки, поэтому JSON страницы отделяется без разбора.
+    """
+    return f"{next_cursor or ''}\n".encode() + content
+
+
+def unpack_page(data: bytes) -> tuple[bytes, str | None]:
+    next_cursor, _, content = data.partition(b"\n")
+    return content, next_cursor.decode() or None
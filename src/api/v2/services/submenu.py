@@ -1,14 +1,28 @@
 import uuid as uuid_pkg
-from dataclasses import dataclass, field
+from dataclasses import dataclass
+from functools import partial
 from http import HTTPStatus
 
 from fastapi import Depends, HTTPException
-from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.api.v2.services import ServiceMixin
+from src import settings
+from src.api.v2.services import (
+    CacheEvent,
+    CacheKey,
+    ServiceMixin,
+    cache_tags,
+    decode_cursor,
+    encode_cursor,
+    pack_page,
+    unpack_page,
+)
 from src.db.cache import AbstractCache, get_cache
-from src.db.db import get_async_session
+from src.db.db import async_session, replica_session
 from src.models import (
+    BulkDelete,
+    BulkDeleteResult,
+    BulkResult,
+    SubmenuBulk,
     SubmenuCreate,
     SubmenuDetail,
     SubmenuList,
@@ -26,28 +40,86 @@ from src.uow import SqlAlchemyUnitOfWork
 
 @dataclass
 class SubmenuService(ServiceMixin):
-    cache_key: str = field(default="submenu-list")
+    async def get_list(
+        self,
+        menu_id: uuid_pkg.UUID,
+        limit: int,
+        cursor: str | None = None,
+    ) -> tuple[bytes, str | None]:
+        """Получить страницу подменю в виде JSON и курсор следующей страницы."""
+        page = await self.read_through(
+            CacheKey.SUBMENU_PAGE.format(
+                menu_id=menu_id,
+                limit=limit,
+                cursor=cursor or "",
+            ),
+            partial(
+                SubmenuService.build_list,
+                menu_id=menu_id,
+                limit=limit,
+                cursor=cursor,
+            ),
+        )
+        return unpack_page(page)
 
-    async def get_list(self, menu_id: uuid_pkg.UUID) -> SubmenuList:
-        """Получить список подменю."""
+    async def build_list(
+        self,
+        menu_id: uuid_pkg.UUID,
+        limit: int,
+        cursor: str | None,
+    ) -> bytes:
+        cache_key = CacheKey.SUBMENU_PAGE.format(
+            menu_id=menu_id,
+            limit=limit,
+            cursor=cursor or "",
+        )
         async with self.uow:
-            if cached_submenus := await self.cache.get(name=self.cache_key):
-                return cached_submenus
-
-            submenus = await self.uow.submenu_repo.list(menu_id=menu_id)
-            if serialized_submenus := SubmenuList.from_orm(submenus):
-                await self.cache.set(
-                    name=self.cache_key,
-                    value=serialized_submenus.json(),
+            # Лишняя строка показывает, есть ли следующая страница
+            submenus = await self.uow.submenu_repo.list(
+                menu_id=menu_id,
+                limit=limit + 1,
+                after=decode_cursor(cursor),
+            )
+            next_cursor = None
+            if len(submenus) > limit:
+                next_cursor = encode_cursor(submenus[limit - 1])
+            serialized_submenus = SubmenuList.from_orm(submenus[:limit])
+            # Вместе со страницей одним запросом прогреваем детальные ключи
+            entries = {
+                cache_key: pack_page(self.dump(serialized_submenus), next_cursor),
+            }
+            tags = {cache_key: cache_tags(CacheKey.SUBMENU_PAGE, menu_id=menu_id)}
+            for submenu in serialized_submenus.__root__:
+                detail_key = CacheKey.SUBMENU_DETAIL.format(submenu_id=submenu.id)
+                entries[detail_key] = self.dump(submenu)
+                tags[detail_key] = cache_tags(
+                    CacheKey.SUBMENU_DETAIL,
+                    menu_id=menu_id,
+                    submenu_id=submenu.id,
                 )
-        return serialized_submenus
+            await self.put_many(mapping=entries, tags=tags)
+        return entries[cache_key]
 
-    async def get_detail(self, submenu_id: uuid_pkg.UUID) -> SubmenuDetail:
-        """Получить детальную информацию по подменю."""
-        async with self.uow:
-            if cached_submenu := await self.cache.get(name=f"{submenu_id}"):
-                return cached_submenu
+    async def get_detail(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+    ) -> bytes:
+        """Получить детальную информацию по подменю в виде JSON."""
+        return await self.read_through(
+            CacheKey.SUBMENU_DETAIL.format(submenu_id=submenu_id),
+            partial(
+                SubmenuService.build_detail, menu_id=menu_id, submenu_id=submenu_id
+            ),
+        )
 
+    async def build_detail(
+        self,
+        menu_id: uuid_pkg.UUID,
+        submenu_id: uuid_pkg.UUID,
+    ) -> bytes:
+        cache_key = CacheKey.SUBMENU_DETAIL.format(submenu_id=submenu_id)
+        async with self.uow:
             submenu = await self.uow.submenu_repo.get(submenu_id=submenu_id)
             if not submenu:
                 raise HTTPException(
@@ -55,11 +127,17 @@ class SubmenuService(ServiceMixin):
                     detail="submenu not found",
                 )
 
-            if serialized_submenu := SubmenuDetail.from_orm(submenu):
-                await self.cache.set(
-                    name=f"{submenu_id}",
-                    value=serialized_submenu.json(),
-                )
+            serialized_submenu = self.dump(SubmenuDetail.from_orm(submenu))
+            await self.put(
+                name=cache_key,
+                value=serialized_submenu,
+                # Теги - по настоящему меню подменю, а не по меню из адреса
+                tags=cache_tags(
+                    CacheKey.SUBMENU_DETAIL,
+                    menu_id=submenu.parent_id,
+                    submenu_id=submenu_id,
+                ),
+            )
         return serialized_submenu
 
     async def create(self, menu_id: uuid_pkg.UUID, data: SubmenuCreate) -> SubmenuRead:
@@ -67,13 +145,67 @@ class SubmenuService(ServiceMixin):
         async with self.uow:
             data.parent_id = menu_id
             new_submenu = await self.uow.submenu_repo.add(data=data)
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name="menu-list")
-            await self.cache.delete(name=self.cache_key)
-        return SubmenuRead.from_orm(new_submenu)
+            await self.invalidate(CacheEvent.SUBMENU_CREATE, menu_id=menu_id)
+        submenu = SubmenuRead.from_orm(new_submenu)
+        await self.store(
+            CacheKey.SUBMENU_DETAIL,
+            submenu,
+            menu_id=menu_id,
+            submenu_id=submenu.id,
+        )
+        self.refresh_list(menu_id=menu_id)
+        return submenu
+
+    async def bulk_upsert(
+        self, menu_id: uuid_pkg.UUID, data: SubmenuBulk
+    ) -> BulkResult:
+        """Создать или обновить подменю с блюдами одной транзакцией."""
+        async with self.uow:
+            if not await self.uow.menu_repo.get(menu_id=menu_id):
+                raise HTTPException(
+                    status_code=HTTPStatus.NOT_FOUND,
+                    detail="menu not found",
+                )
+
+            submenu_values = [
+                {
+                    **submenu.dict(exclude={"dishes"}),
+                    "parent_id": menu_id,
+                    "is_removed": False,
+                }
+                for submenu in data.__root__
+            ]
+            written_submenus = await self.uow.submenu_repo.upsert_many(
+                values=submenu_values,
+            )
+            await self.check_written(
+                submenu_values,
+                written_submenus,
+                "submenus belong to another menu",
+            )
+
+            dish_values = [
+                {
+                    **dish.dict(),
+                    "menu_id": menu_id,
+                    "submenu_id": submenu.id,
+                    "is_removed": False,
+                }
+                for submenu in data.__root__
+                for dish in submenu.dishes
+            ]
+            written_dishes = await self.uow.dish_repo.upsert_many(values=dish_values)
+            await self.check_written(
+                dish_values,
+                written_dishes,
+                "dishes belong to another submenu",
+            )
+            await self.invalidate(CacheEvent.SUBMENU_BULK, menu_id=menu_id)
+        return BulkResult(submenus=len(written_submenus), dishes=len(written_dishes))
 
     async def update(
         self,
+        menu_id: uuid_pkg.UUID,
         submenu_id: uuid_pkg.UUID,
         data: SubmenuUpdate,
     ) -> SubmenuRead:
@@ -88,23 +220,100 @@ class SubmenuService(ServiceMixin):
                     status_code=HTTPStatus.NOT_FOUND,
                     detail="submenu not found",
                 )
-            await self.cache.delete(name=f"{submenu_id}")
-            await self.cache.delete(name=self.cache_key)
-        return SubmenuRead.from_orm(updated_submenu)
+            await self.invalidate(
+                CacheEvent.SUBMENU_UPDATE,
+                menu_id=updated_submenu.parent_id,
+                submenu_id=submenu_id,
+            )
+        submenu = SubmenuRead.from_orm(updated_submenu)
+        await self.store(
+            CacheKey.SUBMENU_DETAIL,
+            submenu,
+            menu_id=updated_submenu.parent_id,
+            submenu_id=submenu_id,
+        )
+        self.refresh_list(menu_id=updated_submenu.parent_id)
+        return submenu
+
+    def refresh_list(self, menu_id: uuid_pkg.UUID) -> None:
+        """Пересобрать первую страницу подменю: её и читают после записи."""
+        limit = settings.app.page_default_limit
+        self.refresh(
+            CacheKey.SUBMENU_PAGE.format(menu_id=menu_id, limit=limit, cursor=""),
+            partial(
+                SubmenuService.build_list,
+                menu_id=menu_id,
+                limit=limit,
+                cursor=None,
+            ),
+        )
 
     async def delete(self, menu_id: uuid_pkg.UUID, submenu_id: uuid_pkg.UUID) -> bool:
         """Удалить подменю."""
         async with self.uow:
-            is_deleted = await self.uow.submenu_repo.delete(submenu_id=submenu_id)
-            await self.cache.delete(name=f"{submenu_id}")
-            await self.cache.delete(name=f"{menu_id}")
-            await self.cache.delete(name=self.cache_key)
-        return is_deleted
+            if parent_id := await self.uow.submenu_repo.delete(submenu_id=submenu_id):
+                await self.invalidate(
+                    CacheEvent.SUBMENU_DELETE,
+                    menu_id=parent_id,
+                    submenu_id=submenu_id,
+                )
+        return True
+
+    async def restore(
+        self, menu_id: uuid_pkg.UUID, submenu_id: uuid_pkg.UUID
+    ) -> SubmenuRead:
+        """Восстановить удалённое подменю вместе с блюдами."""
+        async with self.uow:
+            restored = await self.uow.submenu_repo.restore(
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+            )
+            if not restored or not (
+                restored_submenu := await self.uow.submenu_repo.get(
+                    submenu_id=submenu_id,
+                )
+            ):
+                await self.uow.rollback()
+                raise HTTPException(
+                    status_code=HTTPStatus.NOT_FOUND,
+                    detail="removed submenu not found",
+                )
+            await self.invalidate(
+                CacheEvent.SUBMENU_RESTORE,
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+            )
+        submenu = SubmenuRead.from_orm(restored_submenu)
+        await self.store(
+            CacheKey.SUBMENU_DETAIL,
+            submenu,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+        )
+        self.refresh_list(menu_id=menu_id)
+        return submenu
+
+    async def delete_many(
+        self, menu_id: uuid_pkg.UUID, data: BulkDelete
+    ) -> BulkDeleteResult:
+        """Удалить несколько подменю меню одним запросом."""
+        async with self.uow:
+            deleted = await self.uow.submenu_repo.delete_many(
+                menu_id=menu_id,
+                submenu_ids=data.ids,
+            )
+            await self.invalidate_many(
+                CacheEvent.SUBMENU_DELETE,
+                ({"menu_id": menu_id, "submenu_id": id_} for id_ in deleted),
+            )
+        return BulkDeleteResult(deleted=deleted)
 
 
 async def get_submenu_service(
     cache: AbstractCache = Depends(get_cache),
-    session: AsyncSession = Depends(get_async_session),
 ) -> SubmenuService:
-    uow = SqlAlchemyUnitOfWork(session=session)
+    uow = SqlAlchemyUnitOfWork(
+        session_factory=async_session,
+        replica_factory=replica_session,
+    )
     return SubmenuService(cache=cache, uow=uow)
@@ -0,0 +1,70 @@
+"""Импорт каталога из CSV.
+
+    python -m src.commands.import_csv menu.csv
+
+Формат файла - как у POST /api/v2/import/. Строки с ошибками
+пропускаются и выводятся с номерами.
+"""
+import argparse
+import asyncio
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import aioredis
+from fastapi import HTTPException
+
+from src import settings
+from src.api.v2.services import ImportService
+from src.db import invalidation, redis_cache, tiered_cache
+from src.db.db import async_engine, async_session
+from src.uow import SqlAlchemyUnitOfWork
+
+CHUNK_SIZE = 64 * 1024
+
+
+async def read_file(path: Path) -> AsyncIterator[bytes]:
+    with path.open("rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+async def main(path: Path) -> None:
+    redis = await aioredis.Redis(
+        host=settings.redis.host,
+        port=settings.redis.port,
+        db=settings.redis.db,
+        encoding=settings.redis.encoding,
+    )
+    # Через брокер сброс кэша дойдёт и до локальных кэшей воркеров
+    cache = tiered_cache.TieredCache(
+        backend=redis_cache.RedisCache(cache=redis),
+        broker=invalidation.RedisBroker(
+            redis=redis,
+            channel=settings.redis.invalidation_channel,
+        ),
+    )
+    service = ImportService(
+        cache=cache, uow=SqlAlchemyUnitOfWork(session_factory=async_session)
+    )
+    try:
+        result = await service.import_csv(read_file(path))
+    except HTTPException as error:
+        raise SystemExit(f"Import failed: {error.detail}")
+    finally:
+        await cache.close()
+        await async_engine.dispose()
+    for error in result.errors:
+        print(f"line {error.line}: {error.message}")
+    print(
+        f"Imported menus: {result.menus}, submenus: {result.submenus}, "
+        f"dishes: {result.dishes}, rejected lines: {len(result.errors)}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("path", type=Path, help="CSV-файл каталога")
+    asyncio.run(main(path=parser.parse_args().path))
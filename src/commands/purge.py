@@ -0,0 +1,67 @@
+"""Физическое удаление строк, помеченных удалёнными в API v2.
+
+Удаляются строки, помеченные раньше, чем purge_retention_time секунд
+назад; до этого их можно восстановить. Запускается по расписанию:
+    python -m src.commands.purge
+"""
+import asyncio
+from datetime import timedelta
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src import settings
+from src.db.db import async_engine
+from src.models import Dish, Menu, Submenu
+
+__all__ = ("purge_batch",)
+
+
+async def purge_batch(
+    connection: AsyncConnection,
+    model: type,
+    retention: timedelta,
+    batch_size: int,
+) -> int:
+    """Удалить порцию помеченных строк, вернуть их число.
+
+    Потомки удаляются каскадом в базе, счётчики родителей не меняются:
+    помеченные строки в них уже не учтены.
+    """
+    cutoff = sa.literal_column("current_timestamp(0)", sa.DateTime) - retention
+    batch = (
+        sa.select(model.id)
+        .where(model.is_removed, model.updated_at < cutoff)
+        .order_by(model.updated_at)
+        .limit(batch_size)
+        # Строки, которые сейчас восстанавливают, пропускаем до следующего раза
+        .with_for_update(skip_locked=True)
+    )
+    results = await connection.execute(
+        sa.delete(model).where(model.id.in_(batch.scalar_subquery())),
+    )
+    return results.rowcount
+
+
+async def main() -> None:
+    retention = timedelta(seconds=settings.app.purge_retention_time)
+    for model in (Dish, Submenu, Menu):
+        purged = 0
+        # Порция - своя транзакция: блокировки короткие, API не ждёт
+        while True:
+            async with async_engine.begin() as connection:
+                count = await purge_batch(
+                    connection,
+                    model,
+                    retention=retention,
+                    batch_size=settings.app.purge_batch_size,
+                )
+            purged += count
+            if count < settings.app.purge_batch_size:
+                break
+        print(f"{model.__tablename__}: purged {purged}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,112 @@
+"""Проверка счётчиков подменю и блюд, которые ведут триггеры в базе.
+
+Показать расхождения:
+    python -m src.commands.recount
+Пересчитать расходящиеся строки:
+    python -m src.commands.recount --repair
+"""
+import argparse
+import asyncio
+
+import sqlalchemy as sa
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from src.db.db import async_engine
+from src.models import Dish, Menu, Submenu
+
+__all__ = (
+    "find_drift",
+    "repair_drift",
+)
+
+# Считаются только не удалённые строки, как в триггерах
+submenu_dishes = (
+    sa.select(sa.func.count(Dish.id))
+    .where(Dish.submenu_id == Submenu.id, sa.not_(Dish.is_removed))
+    .scalar_subquery()
+)
+menu_submenus = (
+    sa.select(sa.func.count(Submenu.id))
+    .where(Submenu.parent_id == Menu.id, sa.not_(Submenu.is_removed))
+    .scalar_subquery()
+)
+menu_dishes = (
+    sa.select(sa.func.count(Dish.id))
+    .join(Submenu, Submenu.id == Dish.submenu_id)
+    .where(
+        Submenu.parent_id == Menu.id,
+        sa.not_(Submenu.is_removed),
+        sa.not_(Dish.is_removed),
+    )
+    .scalar_subquery()
+)
+submenu_drift = Submenu.dishes_count != submenu_dishes
+menu_drift = sa.or_(
+    Menu.submenus_count != menu_submenus,
+    Menu.dishes_count != menu_dishes,
+)
+
+
+async def find_drift(connection: AsyncConnection) -> list[sa.engine.Row]:
+    """Строки, у которых сохранённые счётчики не совпадают с фактическими."""
+    submenus = await connection.execute(
+        sa.select(
+            sa.literal("submenu").label("table"),
+            Submenu.id,
+            sa.literal(None).label("submenus_count"),
+            sa.literal(None).label("actual_submenus_count"),
+            Submenu.dishes_count,
+            submenu_dishes.label("actual_dishes_count"),
+        ).where(submenu_drift),
+    )
+    menus = await connection.execute(
+        sa.select(
+            sa.literal("menu").label("table"),
+            Menu.id,
+            Menu.submenus_count,
+            menu_submenus.label("actual_submenus_count"),
+            Menu.dishes_count,
+            menu_dishes.label("actual_dishes_count"),
+        ).where(menu_drift),
+    )
+    return [*submenus.all(), *menus.all()]
+
+
+async def repair_drift(connection: AsyncConnection) -> None:
+    """Пересчитать счётчики в расходящихся строках."""
+    # Пока идёт пересчёт, записи ждут: иначе триггер может применить
+    # изменение к значению, которое мы сейчас перезапишем
+    await connection.execute(
+        sa.text("LOCK TABLE menu, submenu, dish IN SHARE ROW EXCLUSIVE MODE"),
+    )
+    await connection.execute(
+        sa.update(Submenu).values(dishes_count=submenu_dishes).where(submenu_drift),
+    )
+    await connection.execute(
+        sa.update(Menu)
+        .values(submenus_count=menu_submenus, dishes_count=menu_dishes)
+        .where(menu_drift),
+    )
+
+
+async def main(repair: bool) -> None:
+    async with async_engine.begin() as connection:
+        drift = await find_drift(connection)
+        for row in drift:
+            print(
+                f"{row.table} {row.id}: "
+                f"submenus_count {row.submenus_count} -> {row.actual_submenus_count}, "
+                f"dishes_count {row.dishes_count} -> {row.actual_dishes_count}",
+            )
+        if drift and repair:
+            await repair_drift(connection)
+        print(
+            f"Rows with drift: {len(drift)}{', repaired' if drift and repair else ''}"
+        )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repair", action="store_true", help="исправить расхождения")
+    asyncio.run(main(repair=parser.parse_args().repair))
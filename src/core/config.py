@@ -13,6 +13,12 @@ class App(BaseSettings):
     api_doc_prefix: str
     debug: bool
     db_exclude_tables: list[str]
+    # Размер страницы списков v2 по умолчанию и максимальный
+    page_default_limit: int = 50
+    page_max_limit: int = 500
+    # Удалённые строки хранятся для восстановления, потом их удаляет purge
+    purge_retention_time: int = 7 * 24 * 60 * 60
+    purge_batch_size: int = 1000
 
 
 class Postgres(BaseSettings):
@@ -21,11 +27,48 @@ class Postgres(BaseSettings):
     dbname: str
     user: str
     password: str
+    # Логировать каждый SQL-запрос: только для отладки
+    echo: bool = False
+    # Пул соединений воркера: pool_size постоянных и до max_overflow сверх них
+    pool_size: int = 10
+    max_overflow: int = 10
+    pool_timeout: float = 30
+    # Переподключаться раньше, чем соединение закроет балансировщик или сервер
+    pool_recycle: int = 30 * 60
+    pool_pre_ping: bool = True
+    # Кэш скомпилированных запросов SQLAlchemy, записей на процесс
+    compiled_cache_size: int = 500
+    # Кэш подготовленных запросов asyncpg, записей на соединение, 0 - выключен
+    prepared_statement_cache_size: int = 500
+    # Параметры сессии Postgres, asyncpg задаёт их при подключении.
+    # idle_in_transaction_session_timeout не задаём: экспорт держит
+    # транзакцию с курсором, пока клиент читает поток, а импорт - пока
+    # загружается файл, и между запросами может пройти больше минуты
+    server_settings: dict[str, str] = {
+        "application_name": "fast-api-menu",
+        "statement_timeout": "30s",
+        "jit": "off",
+    }
+    # Реплика для чтения при сборке ключей кэша, None - читаем с основной базы
+    replica_host: str | None = None
+    replica_port: int = 5432
+    # Отставание реплики в секундах, при котором читаем с основной базы
+    replica_max_lag: float = 1
+    replica_lag_check_interval: float = 1
+    # Сколько секунд после записи читать с основной базы (read-your-writes)
+    replica_sticky_time: int = 2
 
     @property
     def async_dsn(self) -> str:
-        host: str = self.host
-        port: int = self.port
+        return self.dsn(self.host, self.port)
+
+    @property
+    def replica_async_dsn(self) -> str | None:
+        if self.replica_host is None:
+            return None
+        return self.dsn(self.replica_host, self.replica_port)
+
+    def dsn(self, host: str, port: int) -> str:
         dbname: str = self.dbname
         user: str = self.user
         password: str = self.password
@@ -38,7 +81,19 @@ class Redis(BaseSettings):
     db: int
     encoding: str
     cache_expire_time: int
+    # Мягкий срок жизни ключа: дальше отдаём старое и обновляем в фоне
+    cache_stale_time: int = 0
+    # Write-through: запись сразу обновляет кэш объекта и его списка
+    cache_write_through: bool = True
     max_connections: int
+    # Локальный (в памяти воркера) уровень кэша перед Redis, 0 - выключен
+    local_cache_max_size: int = 1024
+    local_cache_expire_time: int = 5
+    # Канал pub/sub для рассылки удалений между локальными кэшами воркеров
+    invalidation_channel: str = "cache-invalidation"
+    # Блокировка на пересборку ключа после промаха: одна на все воркеры
+    rebuild_lock_expire_time: int = 5
+    rebuild_lock_wait_time: float = 3
 
 
 class Settings(BaseSettings):
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Mapping, Sequence
 from typing import Any
 
 
@@ -8,13 +9,72 @@ class AbstractCache(ABC):
         raise NotImplementedError
 
     @abstractmethod
-    async def set(self, name: str, value: Any, expire: int = 0) -> None:
+    async def get_raw(self, name: str) -> bytes | None:
+        """Получить значение в сериализованном виде, без разбора JSON."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def get_raw_with_ttl(self, name: str) -> tuple[bytes | None, int | None]:
+        """Получить сериализованное значение и оставшееся время жизни в секундах.
+
+        Время жизни None, если ключа нет или срок у него не задан.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        expire: int = 0,
+        tags: Iterable[str] | None = None,
+    ) -> None:
         raise NotImplementedError
 
     @abstractmethod
     async def delete(self, name: str) -> None:
         raise NotImplementedError
 
+    @abstractmethod
+    async def get_many(self, names: Sequence[str]) -> list[Any | None]:
+        """Получить несколько ключей за один запрос, в порядке names."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire: int = 0,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        """Записать несколько ключей за один запрос; tags - теги по ключам."""
+        raise NotImplementedError
+
+    @abstractmethod
+    async def delete_many(self, names: Iterable[str]) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        """Удалить все ключи, помеченные хотя бы одним из тегов.
+
+        Возвращает имена удалённых ключей.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def acquire_lock(self, name: str, expire: int) -> str | None:
+        """Захватить блокировку на expire секунд.
+
+        Возвращает токен владельца или None, если блокировка занята.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    async def release_lock(self, name: str, token: str) -> None:
+        """Снять блокировку, если она всё ещё принадлежит владельцу токена."""
+        raise NotImplementedError
+
     @abstractmethod
     async def close(self) -> None:
         raise NotImplementedError
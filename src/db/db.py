@@ -1,22 +1,62 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from src import settings
+from src.db.metrics import compiled_cache_stats
+from src.db.replica import ReplicaMonitor
 
 __all__ = ("get_async_session",)
 
-async_engine = create_async_engine(
-    settings.postgres.async_dsn,
-    echo=True,
-    future=True,
-)
 
+def create_engine(dsn: str) -> AsyncEngine:
+    engine = create_async_engine(
+        dsn,
+        echo=settings.postgres.echo,
+        future=True,
+        pool_size=settings.postgres.pool_size,
+        max_overflow=settings.postgres.max_overflow,
+        pool_timeout=settings.postgres.pool_timeout,
+        pool_recycle=settings.postgres.pool_recycle,
+        pool_pre_ping=settings.postgres.pool_pre_ping,
+        query_cache_size=settings.postgres.compiled_cache_size,
+        connect_args={
+            "server_settings": settings.postgres.server_settings,
+            "prepared_statement_cache_size": (
+                settings.postgres.prepared_statement_cache_size
+            ),
+        },
+    )
+    compiled_cache_stats.track(engine.sync_engine)
+    return engine
 
-async def get_async_session() -> AsyncSession:
-    async_session = sessionmaker(
-        bind=async_engine,
+
+async_engine = create_engine(settings.postgres.async_dsn)
+
+# Фабрика сессий одна на процесс, а не на каждый запрос
+async_session = sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
+# Реплика только для чтения, если она настроена
+replica_engine: AsyncEngine | None = None
+replica_session: sessionmaker | None = None
+replica_monitor: ReplicaMonitor | None = None
+if replica_dsn := settings.postgres.replica_async_dsn:
+    replica_engine = create_engine(replica_dsn)
+    replica_session = sessionmaker(
+        bind=replica_engine,
         class_=AsyncSession,
         expire_on_commit=False,
     )
+    replica_monitor = ReplicaMonitor(
+        engine=replica_engine,
+        max_lag=settings.postgres.replica_max_lag,
+        check_interval=settings.postgres.replica_lag_check_interval,
+    )
+
+
+async def get_async_session() -> AsyncSession:
     async with async_session() as session:
         yield session
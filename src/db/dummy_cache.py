@@ -1,3 +1,4 @@
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass
 from typing import Any
 
@@ -11,11 +12,46 @@ class DummyCache(AbstractCache):
     async def get(self, name: str) -> dict | None:
         return None
 
-    async def set(self, name: str, value: Any, expire: int = 0):
+    async def get_raw(self, name: str) -> bytes | None:
+        return None
+
+    async def get_raw_with_ttl(self, name: str) -> tuple[bytes | None, int | None]:
+        return None, None
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        expire: int = 0,
+        tags: Iterable[str] | None = None,
+    ):
         return None
 
     async def delete(self, name: str) -> None:
         return None
 
+    async def get_many(self, names: Sequence[str]) -> list[Any | None]:
+        return [None] * len(names)
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire: int = 0,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        return None
+
+    async def delete_many(self, names: Iterable[str]) -> None:
+        return None
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        return []
+
+    async def acquire_lock(self, name: str, expire: int) -> str | None:
+        return name
+
+    async def release_lock(self, name: str, token: str) -> None:
+        return None
+
     async def close(self) -> None:
         return None
@@ -1,6 +1,12 @@
+import math
+import time
+import uuid as uuid_pkg
+from collections.abc import Iterable, Mapping, Sequence
 from dataclasses import dataclass, field
 from typing import Any
 
+import orjson
+
 from src.db.cache import AbstractCache
 
 __all__ = ("FakeCache",)
@@ -9,15 +15,82 @@ __all__ = ("FakeCache",)
 @dataclass
 class FakeCache(AbstractCache):
     cache: dict[str, Any] = field(default_factory=dict)
+    tags: dict[str, set[str]] = field(default_factory=dict)
+    locks: dict[str, str] = field(default_factory=dict)
+    expires: dict[str, float] = field(default_factory=dict)
 
     async def get(self, name: str) -> dict | None:
         return self.cache.get(name)
 
-    async def set(self, name: str, value: Any, expire: int = 0):
+    async def get_raw(self, name: str) -> bytes | None:
+        if (value := self.cache.get(name)) is None:
+            return None
+        if isinstance(value, str):
+            return value.encode()
+        return value if isinstance(value, bytes) else orjson.dumps(value)
+
+    async def get_raw_with_ttl(self, name: str) -> tuple[bytes | None, int | None]:
+        if (data := await self.get_raw(name=name)) is None:
+            return None, None
+        if (expires_at := self.expires.get(name)) is None:
+            return data, None
+        return data, max(math.ceil(expires_at - time.monotonic()), 0)
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        expire: int = 0,
+        tags: Iterable[str] | None = None,
+    ):
         self.cache.update({name: value})
+        if expire:
+            self.expires[name] = time.monotonic() + expire
+        else:
+            self.expires.pop(name, None)
+        for tag in tags or ():
+            self.tags.setdefault(tag, set()).add(name)
 
     async def delete(self, name: str) -> None:
-        self.cache.pop(name)
+        self.cache.pop(name, None)
+
+    async def get_many(self, names: Sequence[str]) -> list[Any | None]:
+        return [self.cache.get(name) for name in names]
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire: int = 0,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        tags = tags or {}
+        for name, value in mapping.items():
+            await self.set(name=name, value=value, expire=expire, tags=tags.get(name))
+
+    async def delete_many(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.cache.pop(name, None)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        names = set()
+        for tag in tags:
+            names.update(self.tags.pop(tag, set()))
+        for name in names:
+            self.cache.pop(name, None)
+        return list(names)
+
+    async def acquire_lock(self, name: str, expire: int) -> str | None:
+        if name in self.locks:
+            return None
+        token = self.locks[name] = uuid_pkg.uuid4().hex
+        return token
+
+    async def release_lock(self, name: str, token: str) -> None:
+        if self.locks.get(name) == token:
+            del self.locks[name]
 
     async def close(self) -> None:
         self.cache = {}
+        self.tags = {}
+        self.locks = {}
+        self.expires = {}
@@ -0,0 +1,63 @@
+import asyncio
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+
+from aioredis import Redis
+
+__all__ = (
+    "AbstractBroker",
+    "FakeBroker",
+    "RedisBroker",
+)
+
+
+class AbstractBroker(ABC):
+    """Канал рассылки сообщений об инвалидации между воркерами."""
+
+    @abstractmethod
+    async def publish(self, message: bytes) -> None:
+        raise NotImplementedError
+
+    @abstractmethod
+    def listen(self) -> AsyncIterator[bytes]:
+        raise NotImplementedError
+
+
+@dataclass
+class RedisBroker(AbstractBroker):
+    redis: Redis
+    channel: str = "cache-invalidation"
+
+    async def publish(self, message: bytes) -> None:
+        await self.redis.publish(self.channel, message)
+
+    async def listen(self) -> AsyncIterator[bytes]:
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(self.channel)
+        try:
+            async for message in pubsub.listen():
+                if message and message["type"] == "message":
+                    yield message["data"]
+        finally:
+            await pubsub.close()
+
+
+@dataclass
+class FakeBroker(AbstractBroker):
+    """Брокер в памяти процесса, для тестов."""
+
+    queues: list[asyncio.Queue] = field(default_factory=list)
+
+    async def publish(self, message: bytes) -> None:
+        for queue in self.queues:
+            queue.put_nowait(message)
+
+    async def listen(self) -> AsyncIterator[bytes]:
+        queue: asyncio.Queue = asyncio.Queue()
+        self.queues.append(queue)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.queues.remove(queue)
@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.default import CACHE_HIT, CACHE_MISS
+
+__all__ = (
+    "CompiledCacheStats",
+    "compiled_cache_stats",
+)
+
+
+@dataclass
+class CompiledCacheStats:
+    """Попадания запросов в кэш компиляции SQLAlchemy с запуска процесса."""
+
+    hits: int = 0
+    misses: int = 0
+    # Запросы без кэширования: exec_driver_sql, DDL
+    uncached: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        cached = self.hits + self.misses
+        return self.hits / cached if cached else 0.0
+
+    def track(self, engine: Engine) -> None:
+        event.listen(engine, "before_cursor_execute", self.record)
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        if context.cache_hit is CACHE_HIT:
+            self.hits += 1
+        elif context.cache_hit is CACHE_MISS:
+            self.misses += 1
+        else:
+            self.uncached += 1
+
+
+compiled_cache_stats = CompiledCacheStats()
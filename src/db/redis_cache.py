@@ -1,36 +1,151 @@
-from dataclasses import dataclass
+import uuid as uuid_pkg
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
 from typing import Any
 
 import orjson
 from aioredis import Redis
+from aioredis.client import Script
 
 from src import settings
 from src.db.cache import AbstractCache
 
 __all__ = ("RedisCache",)
 
+# Удаляет ключи всех переданных тегов и сами теги за один вызов,
+# возвращает имена ключей, которые были в тегах
+INVALIDATE_TAGS_SCRIPT = """
+local deleted = {}
+for _, tag in ipairs(KEYS) do
+    local names = redis.call("SMEMBERS", tag)
+    for i = 1, #names, 1000 do
+        local last = math.min(i + 999, #names)
+        redis.call("DEL", unpack(names, i, last))
+    end
+    for _, name in ipairs(names) do
+        table.insert(deleted, name)
+    end
+    redis.call("DEL", tag)
+end
+return deleted
+"""
+
+# Добавляет ключ в набор тега и только продлевает срок жизни набора:
+# набор живёт не меньше самого долгоживущего ключа в нём. EXPIRE ... GT
+# делает то же, но есть только с Redis 7
+TAG_KEY_SCRIPT = """
+redis.call("SADD", KEYS[1], ARGV[1])
+if redis.call("TTL", KEYS[1]) < tonumber(ARGV[2]) then
+    redis.call("EXPIRE", KEYS[1], ARGV[2])
+end
+"""
+
+# Снимает блокировку, только если её держит владелец токена
+RELEASE_LOCK_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def tag_key(tag: str) -> str:
+    return f"tag:{tag}"
+
+
+def lock_key(name: str) -> str:
+    return f"lock:{name}"
+
 
 @dataclass
 class RedisCache(AbstractCache):
     cache: Redis
+    invalidate_script: Script = field(init=False)
+    tag_key_script: Script = field(init=False)
+    release_lock_script: Script = field(init=False)
+
+    def __post_init__(self):
+        self.invalidate_script = self.cache.register_script(INVALIDATE_TAGS_SCRIPT)
+        self.tag_key_script = self.cache.register_script(TAG_KEY_SCRIPT)
+        self.release_lock_script = self.cache.register_script(RELEASE_LOCK_SCRIPT)
 
     async def get(self, name: str) -> Any | None:
         data = await self.cache.get(name=name)
         return orjson.loads(data) if data else None
 
+    async def get_raw(self, name: str) -> bytes | None:
+        return await self.cache.get(name=name)
+
+    async def get_raw_with_ttl(self, name: str) -> tuple[bytes | None, int | None]:
+        async with self.cache.pipeline(transaction=False) as pipe:
+            pipe.get(name=name)
+            pipe.ttl(name=name)
+            data, ttl = await pipe.execute()
+        # -2: ключа нет, -1: ключ без срока жизни
+        return data, ttl if ttl >= 0 else None
+
     async def set(
         self,
         name: str,
         value: Any,
         expire: int = settings.redis.cache_expire_time,
+        tags: Iterable[str] | None = None,
     ) -> None:
-        data = value
-        if not isinstance(value, bytes | str):
-            data = orjson.dumps(value)
-        await self.cache.set(name=name, value=data, ex=expire)
+        await self.set_many(
+            mapping={name: value},
+            expire=expire,
+            tags={name: tags} if tags else None,
+        )
 
     async def delete(self, name: str) -> None:
         await self.cache.delete(name)
 
+    async def get_many(self, names: Sequence[str]) -> list[Any | None]:
+        if not names:
+            return []
+        values = await self.cache.mget(names)
+        return [orjson.loads(data) if data else None for data in values]
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire: int = settings.redis.cache_expire_time,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        tags = tags or {}
+        async with self.cache.pipeline(transaction=True) as pipe:
+            for name, value in mapping.items():
+                data = value
+                if not isinstance(value, bytes | str):
+                    data = orjson.dumps(value)
+                pipe.set(name=name, value=data, ex=expire)
+                # Короткий срок нового ключа не должен укоротить набор тега:
+                # иначе набор истечёт раньше ключей, записанных до него
+                for tag in tags.get(name, ()):
+                    await self.tag_key_script(
+                        keys=[tag_key(tag)],
+                        args=[name, expire],
+                        client=pipe,
+                    )
+            await pipe.execute()
+
+    async def delete_many(self, names: Iterable[str]) -> None:
+        if names := list(names):
+            await self.cache.delete(*names)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        if not tags:
+            return []
+        names = await self.invalidate_script(keys=[tag_key(tag) for tag in tags])
+        return [name.decode() if isinstance(name, bytes) else name for name in names]
+
+    async def acquire_lock(self, name: str, expire: int) -> str | None:
+        token = uuid_pkg.uuid4().hex
+        is_acquired = await self.cache.set(lock_key(name), token, ex=expire, nx=True)
+        return token if is_acquired else None
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self.release_lock_script(keys=[lock_key(name)], args=[token])
+
     async def close(self) -> None:
         await self.cache.close()
@@ -0,0 +1,61 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+
+import sqlalchemy as sa
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = ("ReplicaMonitor",)
+
+logger = logging.getLogger(__name__)
+
+# Отставание реплики в секундах. Если всё полученное уже применено,
+# реплика не отстаёт, даже когда записей давно не было
+LAG_QUERY = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() THEN 0
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE extract(epoch FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+@dataclass
+class ReplicaMonitor:
+    """Можно ли сейчас читать с реплики.
+
+    Отставание измеряется не чаще раза в check_interval секунд на воркер;
+    недоступная реплика считается отстающей до следующей проверки.
+    """
+
+    engine: AsyncEngine
+    max_lag: float
+    check_interval: float
+    lag_query: str = LAG_QUERY
+    # Последнее измерение, None - реплика не ответила
+    lag: float | None = None
+    checked_at: float = float("-inf")
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+    async def is_usable(self) -> bool:
+        if self.is_outdated():
+            # Одновременные запросы ждут одну проверку
+            async with self.lock:
+                if self.is_outdated():
+                    self.lag = await self.measure()
+                    self.checked_at = time.monotonic()
+        return self.lag is not None and self.lag <= self.max_lag
+
+    def is_outdated(self) -> bool:
+        return time.monotonic() - self.checked_at >= self.check_interval
+
+    async def measure(self) -> float | None:
+        try:
+            async with self.engine.connect() as connection:
+                lag = await connection.scalar(sa.text(self.lag_query))
+        except (SQLAlchemyError, OSError, asyncio.TimeoutError):
+            logger.warning("Replica lag check failed", exc_info=True)
+            return None
+        return float(lag or 0)
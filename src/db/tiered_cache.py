@@ -0,0 +1,201 @@
+import asyncio
+import logging
+import math
+import time
+import uuid as uuid_pkg
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+import orjson
+
+from src.db.cache import AbstractCache
+from src.db.invalidation import AbstractBroker
+
+__all__ = ("TieredCache",)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class LocalEntry:
+    """Запись локального уровня: JSON и разобранное значение по требованию."""
+
+    expires_at: float
+    raw: bytes | None = None
+    value: Any | None = None
+    # Когда ключ истечёт в общем кэше, если это известно
+    backend_expires_at: float | None = None
+
+    def get_raw(self) -> bytes:
+        if self.raw is None:
+            self.raw = orjson.dumps(self.value)
+        return self.raw
+
+    def get_value(self) -> Any:
+        if self.value is None:
+            self.value = orjson.loads(self.raw)
+        return self.value
+
+
+@dataclass
+class TieredCache(AbstractCache):
+    """Двухуровневый кэш: LRU в памяти воркера перед общим кэшем (Redis).
+
+    Локальный уровень ограничен по размеру и по времени жизни записи.
+    Удаления рассылаются через broker, и остальные воркеры вычищают
+    у себя те же ключи в listen(); без брокера рассинхронизация между
+    воркерами ограничена expire секундами.
+    """
+
+    backend: AbstractCache
+    max_size: int = 1024
+    expire: int = 5
+    broker: AbstractBroker | None = None
+    origin: str = field(default_factory=lambda: uuid_pkg.uuid4().hex)
+    local: OrderedDict[str, LocalEntry] = field(default_factory=OrderedDict)
+
+    def get_local(self, name: str) -> LocalEntry | None:
+        if (entry := self.local.get(name)) is None:
+            return None
+        if entry.expires_at < time.monotonic():
+            del self.local[name]
+            return None
+        self.local.move_to_end(name)
+        return entry
+
+    def set_local(
+        self,
+        name: str,
+        value: Any,
+        backend_expire: int | None = None,
+    ) -> None:
+        if self.max_size <= 0:
+            return
+        now = time.monotonic()
+        entry = LocalEntry(expires_at=now + self.expire)
+        if backend_expire is not None:
+            entry.backend_expires_at = now + backend_expire
+        if isinstance(value, bytes | str):
+            entry.raw = value.encode() if isinstance(value, str) else value
+        else:
+            entry.value = value
+        self.local[name] = entry
+        self.local.move_to_end(name)
+        while len(self.local) > self.max_size:
+            self.local.popitem(last=False)
+
+    def evict_local(self, names: Iterable[str]) -> None:
+        for name in names:
+            self.local.pop(name, None)
+
+    async def broadcast(self, names: list[str]) -> None:
+        if self.broker is not None and names:
+            message = {"origin": self.origin, "names": names}
+            await self.broker.publish(orjson.dumps(message))
+
+    async def listen(self) -> None:
+        """Вычищать локальные ключи, удалённые другими воркерами."""
+        if self.broker is None:
+            return
+        while True:
+            try:
+                async for data in self.broker.listen():
+                    message = orjson.loads(data)
+                    if message["origin"] != self.origin:
+                        self.evict_local(message["names"])
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Cache invalidation listener failed, reconnecting")
+            # Пропущенные сообщения не восстановить, поэтому сбрасываем всё
+            self.local.clear()
+            await asyncio.sleep(1)
+
+    async def get(self, name: str) -> Any | None:
+        if (entry := self.get_local(name)) is not None:
+            return entry.get_value()
+        value = await self.backend.get(name=name)
+        if value is not None:
+            self.set_local(name, value)
+        return value
+
+    async def get_raw(self, name: str) -> bytes | None:
+        if (entry := self.get_local(name)) is not None:
+            return entry.get_raw()
+        data = await self.backend.get_raw(name=name)
+        if data is not None:
+            self.set_local(name, data)
+        return data
+
+    async def get_raw_with_ttl(self, name: str) -> tuple[bytes | None, int | None]:
+        entry = self.get_local(name)
+        if entry is not None and entry.backend_expires_at is not None:
+            ttl = max(math.ceil(entry.backend_expires_at - time.monotonic()), 0)
+            return entry.get_raw(), ttl
+        data, ttl = await self.backend.get_raw_with_ttl(name=name)
+        if data is not None:
+            self.set_local(name, data, backend_expire=ttl)
+        return data, ttl
+
+    async def set(
+        self,
+        name: str,
+        value: Any,
+        expire: int | None = None,
+        tags: Iterable[str] | None = None,
+    ) -> None:
+        kwargs = {} if expire is None else {"expire": expire}
+        await self.backend.set(name=name, value=value, tags=tags, **kwargs)
+        self.set_local(name, value, backend_expire=expire)
+
+    async def delete(self, name: str) -> None:
+        self.evict_local([name])
+        await self.backend.delete(name=name)
+        await self.broadcast([name])
+
+    async def get_many(self, names: Sequence[str]) -> list[Any | None]:
+        entries = [self.get_local(name) for name in names]
+        values = [entry and entry.get_value() for entry in entries]
+        missing = [name for name, value in zip(names, values) if value is None]
+        if missing:
+            fetched = dict(zip(missing, await self.backend.get_many(names=missing)))
+            for index, name in enumerate(names):
+                if values[index] is None and (value := fetched[name]) is not None:
+                    values[index] = value
+                    self.set_local(name, value)
+        return values
+
+    async def set_many(
+        self,
+        mapping: Mapping[str, Any],
+        expire: int | None = None,
+        tags: Mapping[str, Iterable[str]] | None = None,
+    ) -> None:
+        kwargs = {} if expire is None else {"expire": expire}
+        await self.backend.set_many(mapping=mapping, tags=tags, **kwargs)
+        for name, value in mapping.items():
+            self.set_local(name, value, backend_expire=expire)
+
+    async def delete_many(self, names: Iterable[str]) -> None:
+        names = list(names)
+        self.evict_local(names)
+        await self.backend.delete_many(names=names)
+        await self.broadcast(names)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        names = await self.backend.invalidate_tags(*tags)
+        self.evict_local(names)
+        await self.broadcast(names)
+        return names
+
+    async def acquire_lock(self, name: str, expire: int) -> str | None:
+        return await self.backend.acquire_lock(name=name, expire=expire)
+
+    async def release_lock(self, name: str, token: str) -> None:
+        await self.backend.release_lock(name=name, token=token)
+
+    async def close(self) -> None:
+        self.local.clear()
+        await self.backend.close()
@@ -1,3 +1,5 @@
+import asyncio
+
 import aioredis  # noqa
 import uvicorn
 from fastapi import FastAPI
@@ -9,11 +11,21 @@ from src.api.v1.resources import dishes as dishes_v1
 from src.api.v1.resources import menus as menus_v1
 from src.api.v1.resources import submenus as submenus_v1
 from src.api.v2.resources import dishes as dishes_v2
+from src.api.v2.resources import export as export_v2
+from src.api.v2.resources import imports as imports_v2
 from src.api.v2.resources import menus as menus_v2
 from src.api.v2.resources import submenus as submenus_v2
-from src.db import cache, dummy_cache, redis_cache  # noqa
+from src.db import (  # noqa
+    cache,
+    db,
+    dummy_cache,
+    invalidation,
+    redis_cache,
+    tiered_cache,
+)
+from src.db.metrics import compiled_cache_stats
 from src.middlewares import add_process_time_header
-from src.schemas import HealthCheck
+from src.schemas import DatabaseMetrics, HealthCheck
 
 app = FastAPI(
     title=settings.app.project_name,
@@ -40,6 +52,8 @@ app.include_router(router=dishes_v1.router, prefix="/api/v1")
 app.include_router(router=menus_v2.router, prefix="/api/v2")
 app.include_router(router=submenus_v2.router, prefix="/api/v2")
 app.include_router(router=dishes_v2.router, prefix="/api/v2")
+app.include_router(router=export_v2.router, prefix="/api/v2")
+app.include_router(router=imports_v2.router, prefix="/api/v2")
 
 
 @app.get("/", response_model=HealthCheck, tags=["status"])
@@ -51,19 +65,45 @@ async def health_check():
     }
 
 
+@app.get("/metrics/db", response_model=DatabaseMetrics, tags=["status"])
+async def database_metrics():
+    """Кэши запросов к базе в этом воркере."""
+    return {
+        "compiled_cache_size": settings.postgres.compiled_cache_size,
+        "compiled_cache_hits": compiled_cache_stats.hits,
+        "compiled_cache_misses": compiled_cache_stats.misses,
+        "compiled_cache_uncached": compiled_cache_stats.uncached,
+        "compiled_cache_hit_rate": compiled_cache_stats.hit_rate,
+        "prepared_statement_cache_size": (
+            settings.postgres.prepared_statement_cache_size
+        ),
+    }
+
+
 @app.on_event("startup")
 async def startup():
     """Подключаемся к базам при старте сервера"""
     # Redis cache
-    cache.cache = redis_cache.RedisCache(
-        cache=await aioredis.Redis(
-            host=settings.redis.host,
-            port=settings.redis.port,
-            db=settings.redis.db,
-            encoding=settings.redis.encoding,
-            max_connections=settings.redis.max_connections,
-        ),
+    redis = await aioredis.Redis(
+        host=settings.redis.host,
+        port=settings.redis.port,
+        db=settings.redis.db,
+        encoding=settings.redis.encoding,
+        max_connections=settings.redis.max_connections,
     )
+    cache.cache = redis_cache.RedisCache(cache=redis)
+    # Локальный кэш воркера перед Redis, удаления рассылаются через pub/sub
+    if settings.redis.local_cache_max_size > 0:
+        cache.cache = tiered_cache.TieredCache(
+            backend=cache.cache,
+            max_size=settings.redis.local_cache_max_size,
+            expire=settings.redis.local_cache_expire_time,
+            broker=invalidation.RedisBroker(
+                redis=redis,
+                channel=settings.redis.invalidation_channel,
+            ),
+        )
+        app.state.cache_listener = asyncio.create_task(cache.cache.listen())
     # Dummy cache
     # cache.cache = dummy_cache.DummyCache()
 
@@ -71,7 +111,13 @@ async def startup():
 @app.on_event("shutdown")
 async def shutdown():
     """Отключаемся от баз при выключении сервера"""
+    if listener := getattr(app.state, "cache_listener", None):
+        listener.cancel()
     await cache.cache.close()
+    # Закрываем соединения пула, не дожидаясь таймаутов на стороне Postgres
+    await db.async_engine.dispose()
+    if db.replica_engine is not None:
+        await db.replica_engine.dispose()
 
 
 if __name__ == "__main__":
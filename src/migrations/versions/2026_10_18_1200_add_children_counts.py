@@ -0,0 +1,212 @@
+"""add_children_counts
+
+Revision ID: 23b4721796c2
+Revises: f3bb62404e27
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "23b4721796c2"
+down_revision = "f3bb62404e27"
+branch_labels = None
+depends_on = None
+
+# Счётчики ведёт база, поэтому они верны для любых путей записи:
+# v1, v2, массовых вставок и COPY. Вставки и удаления считаются
+# одним UPDATE на оператор по таблицам переходов, перенос строки
+# к другому родителю - построчно, он бывает редко.
+#
+# Блюда в menu.dishes_count считаются через родителя подменю. Если
+# подменю удаляется каскадом в базе, его строки уже нет, когда
+# срабатывает триггер блюд, и меню уменьшается один раз - на
+# dishes_count удалённого подменю.
+SUBMENU_COUNTS_FUNCTION = """
+CREATE FUNCTION submenu_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count + delta.submenus,
+            dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT parent_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM new_rows
+            GROUP BY parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count - delta.submenus,
+            dishes_count = menu.dishes_count - delta.dishes
+        FROM (
+            SELECT parent_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM old_rows
+            GROUP BY parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSE
+        UPDATE menu
+        SET submenus_count = submenus_count - 1,
+            dishes_count = dishes_count - OLD.dishes_count
+        WHERE id = OLD.parent_id;
+        UPDATE menu
+        SET submenus_count = submenus_count + 1,
+            dishes_count = dishes_count + NEW.dishes_count
+        WHERE id = NEW.parent_id;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+DISH_COUNTS_FUNCTION = """
+CREATE FUNCTION dish_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes
+            FROM new_rows
+            GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+        UPDATE menu
+        SET dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu.parent_id, count(*) AS dishes
+            FROM new_rows
+            JOIN submenu ON submenu.id = new_rows.submenu_id
+            GROUP BY submenu.parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count - delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes
+            FROM old_rows
+            GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+        UPDATE menu
+        SET dishes_count = menu.dishes_count - delta.dishes
+        FROM (
+            SELECT submenu.parent_id, count(*) AS dishes
+            FROM old_rows
+            JOIN submenu ON submenu.id = old_rows.submenu_id
+            GROUP BY submenu.parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSE
+        UPDATE submenu SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id;
+        UPDATE submenu SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id;
+        UPDATE menu
+        SET dishes_count = dishes_count - 1
+        WHERE id = (SELECT parent_id FROM submenu WHERE id = OLD.submenu_id);
+        UPDATE menu
+        SET dishes_count = dishes_count + 1
+        WHERE id = (SELECT parent_id FROM submenu WHERE id = NEW.submenu_id);
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+TRIGGERS = (
+    """
+    CREATE TRIGGER submenu_counts_insert AFTER INSERT ON submenu
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER submenu_counts_delete AFTER DELETE ON submenu
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER submenu_counts_move AFTER UPDATE OF parent_id ON submenu
+    FOR EACH ROW WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+    EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_insert AFTER INSERT ON dish
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dish_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_delete AFTER DELETE ON dish
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION dish_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_move AFTER UPDATE OF submenu_id ON dish
+    FOR EACH ROW WHEN (OLD.submenu_id IS DISTINCT FROM NEW.submenu_id)
+    EXECUTE FUNCTION dish_counts()
+    """,
+)
+
+
+def upgrade() -> None:
+    for table_name, column_name in (
+        ("menu", "submenus_count"),
+        ("menu", "dishes_count"),
+        ("submenu", "dishes_count"),
+    ):
+        op.add_column(
+            table_name,
+            sa.Column(
+                column_name,
+                sa.Integer(),
+                server_default=sa.text("0"),
+                nullable=False,
+            ),
+        )
+
+    op.execute(SUBMENU_COUNTS_FUNCTION)
+    op.execute(DISH_COUNTS_FUNCTION)
+    for trigger in TRIGGERS:
+        op.execute(trigger)
+
+    # Триггеры созданы в той же транзакции, поэтому записи
+    # после заполнения уже будут учтены
+    op.execute(
+        """
+        UPDATE submenu
+        SET dishes_count = (
+            SELECT count(*) FROM dish WHERE dish.submenu_id = submenu.id
+        )
+        """,
+    )
+    op.execute(
+        """
+        UPDATE menu
+        SET submenus_count = (
+                SELECT count(*) FROM submenu WHERE submenu.parent_id = menu.id
+            ),
+            dishes_count = (
+                SELECT coalesce(sum(submenu.dishes_count), 0)
+                FROM submenu
+                WHERE submenu.parent_id = menu.id
+            )
+        """,
+    )
+
+
+def downgrade() -> None:
+    for table_name, trigger_name in (
+        ("dish", "dish_counts_move"),
+        ("dish", "dish_counts_delete"),
+        ("dish", "dish_counts_insert"),
+        ("submenu", "submenu_counts_move"),
+        ("submenu", "submenu_counts_delete"),
+        ("submenu", "submenu_counts_insert"),
+    ):
+        op.execute(f"DROP TRIGGER {trigger_name} ON {table_name}")
+    op.execute("DROP FUNCTION dish_counts()")
+    op.execute("DROP FUNCTION submenu_counts()")
+    op.drop_column("submenu", "dishes_count")
+    op.drop_column("menu", "dishes_count")
+    op.drop_column("menu", "submenus_count")
@@ -0,0 +1,41 @@
+"""add_keyset_indexes
+
+Revision ID: 0c52a86b0b50
+Revises: 23b4721796c2
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0c52a86b0b50"
+down_revision = "23b4721796c2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_menu_created_at_id",
+        "menu",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_submenu_parent_id_created_at_id",
+        "submenu",
+        ["parent_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dish_submenu_id_created_at_id",
+        "dish",
+        ["submenu_id", "created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dish_submenu_id_created_at_id", table_name="dish")
+    op.drop_index("ix_submenu_parent_id_created_at_id", table_name="submenu")
+    op.drop_index("ix_menu_created_at_id", table_name="menu")
@@ -0,0 +1,41 @@
+"""add_stream_order_indexes
+
+Revision ID: 5e1f0a9c7d42
+Revises: 0c52a86b0b50
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5e1f0a9c7d42"
+down_revision = "0c52a86b0b50"
+branch_labels = None
+depends_on = None
+
+# submenu.parent_id отдельный индекс не нужен: он первый столбец
+# ix_submenu_parent_id_created_at_id, и тот же индекс отвечает на
+# поиск подменю меню, подсчёт подменю и каскадное удаление.
+# Не хватало порядка (created_at, id) у подменю и блюд: выгрузка
+# каталога читает их целиком в этом порядке и без индекса сортирует
+# всю таблицу до первой строки ответа.
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_submenu_created_at_id",
+        "submenu",
+        ["created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_dish_created_at_id",
+        "dish",
+        ["created_at", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_dish_created_at_id", table_name="dish")
+    op.drop_index("ix_submenu_created_at_id", table_name="submenu")
@@ -0,0 +1,44 @@
+"""cascade_foreign_keys
+
+Revision ID: 9b3d6e2a4f18
+Revises: 5e1f0a9c7d42
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9b3d6e2a4f18"
+down_revision = "5e1f0a9c7d42"
+branch_labels = None
+depends_on = None
+
+# Дочерние строки удаляет база одним проходом по индексу родителя,
+# без загрузки поддерева в приложение. Имена ограничениям из
+# add_app_tables дала naming_convention из env.py; op.f - имя как есть.
+FOREIGN_KEYS = (
+    (op.f("fk_submenu_parent_id_menu"), "submenu", "menu", "parent_id"),
+    (op.f("fk_dish_menu_id_menu"), "dish", "menu", "menu_id"),
+    (op.f("fk_dish_submenu_id_submenu"), "dish", "submenu", "submenu_id"),
+)
+
+
+def recreate_foreign_keys(ondelete: str | None) -> None:
+    for name, source, referent, column in FOREIGN_KEYS:
+        op.drop_constraint(name, source, type_="foreignkey")
+        op.create_foreign_key(
+            name,
+            source,
+            referent,
+            [column],
+            ["id"],
+            ondelete=ondelete,
+        )
+
+
+def upgrade() -> None:
+    recreate_foreign_keys(ondelete="CASCADE")
+
+
+def downgrade() -> None:
+    recreate_foreign_keys(ondelete=None)
@@ -0,0 +1,239 @@
+"""soft_delete
+
+Revision ID: c4a7e91b2d05
+Revises: 9b3d6e2a4f18
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c4a7e91b2d05"
+down_revision = "9b3d6e2a4f18"
+branch_labels = None
+depends_on = None
+
+# Счётчики считают только не удалённые строки. Пометка is_removed
+# и её снятие меняют счётчики родителя так же, как удаление и вставка.
+# Удалённое подменю уже вычтено из меню вместе со своими блюдами,
+# поэтому изменения его блюд меню не трогают, а физическое удаление
+# помеченных строк (purge) счётчики не меняет.
+SUBMENU_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION submenu_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count + delta.submenus,
+            dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT parent_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM new_rows
+            WHERE NOT is_removed
+            GROUP BY parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count - delta.submenus,
+            dishes_count = menu.dishes_count - delta.dishes
+        FROM (
+            SELECT parent_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM old_rows
+            WHERE NOT is_removed
+            GROUP BY parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSE
+        IF NOT OLD.is_removed THEN
+            UPDATE menu
+            SET submenus_count = submenus_count - 1,
+                dishes_count = dishes_count - OLD.dishes_count
+            WHERE id = OLD.parent_id;
+        END IF;
+        IF NOT NEW.is_removed THEN
+            UPDATE menu
+            SET submenus_count = submenus_count + 1,
+                dishes_count = dishes_count + NEW.dishes_count
+            WHERE id = NEW.parent_id;
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+DISH_COUNTS_FUNCTION = """
+CREATE OR REPLACE FUNCTION dish_counts() RETURNS trigger LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes
+            FROM new_rows
+            WHERE NOT is_removed
+            GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+        UPDATE menu
+        SET dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu.parent_id, count(*) AS dishes
+            FROM new_rows
+            JOIN submenu ON submenu.id = new_rows.submenu_id
+            WHERE NOT new_rows.is_removed AND NOT submenu.is_removed
+            GROUP BY submenu.parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count - delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes
+            FROM old_rows
+            WHERE NOT is_removed
+            GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+        UPDATE menu
+        SET dishes_count = menu.dishes_count - delta.dishes
+        FROM (
+            SELECT submenu.parent_id, count(*) AS dishes
+            FROM old_rows
+            JOIN submenu ON submenu.id = old_rows.submenu_id
+            WHERE NOT old_rows.is_removed AND NOT submenu.is_removed
+            GROUP BY submenu.parent_id
+        ) AS delta
+        WHERE menu.id = delta.parent_id;
+    ELSE
+        IF NOT OLD.is_removed THEN
+            UPDATE submenu SET dishes_count = dishes_count - 1 WHERE id = OLD.submenu_id;
+            UPDATE menu
+            SET dishes_count = dishes_count - 1
+            WHERE id = (
+                SELECT parent_id FROM submenu
+                WHERE id = OLD.submenu_id AND NOT is_removed
+            );
+        END IF;
+        IF NOT NEW.is_removed THEN
+            UPDATE submenu SET dishes_count = dishes_count + 1 WHERE id = NEW.submenu_id;
+            UPDATE menu
+            SET dishes_count = dishes_count + 1
+            WHERE id = (
+                SELECT parent_id FROM submenu
+                WHERE id = NEW.submenu_id AND NOT is_removed
+            );
+        END IF;
+    END IF;
+    RETURN NULL;
+END
+$$;
+"""
+
+# Вместо триггеров переноса: перенос, пометка удаления и восстановление
+UPDATE_TRIGGERS = (
+    """
+    CREATE TRIGGER submenu_counts_update
+    AFTER UPDATE OF parent_id, is_removed ON submenu
+    FOR EACH ROW WHEN (
+        OLD.parent_id IS DISTINCT FROM NEW.parent_id
+        OR OLD.is_removed <> NEW.is_removed
+    )
+    EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_update
+    AFTER UPDATE OF submenu_id, is_removed ON dish
+    FOR EACH ROW WHEN (
+        OLD.submenu_id IS DISTINCT FROM NEW.submenu_id
+        OR OLD.is_removed <> NEW.is_removed
+    )
+    EXECUTE FUNCTION dish_counts()
+    """,
+)
+MOVE_TRIGGERS = (
+    """
+    CREATE TRIGGER submenu_counts_move AFTER UPDATE OF parent_id ON submenu
+    FOR EACH ROW WHEN (OLD.parent_id IS DISTINCT FROM NEW.parent_id)
+    EXECUTE FUNCTION submenu_counts()
+    """,
+    """
+    CREATE TRIGGER dish_counts_move AFTER UPDATE OF submenu_id ON dish
+    FOR EACH ROW WHEN (OLD.submenu_id IS DISTINCT FROM NEW.submenu_id)
+    EXECUTE FUNCTION dish_counts()
+    """,
+)
+
+# Чтения видят только не удалённые строки, поэтому индексы чтений
+# частичные: удалённые строки их не раздувают
+LIVE_INDEXES = (
+    ("ix_menu_created_at_id", "menu", ["created_at", "id"]),
+    (
+        "ix_submenu_parent_id_created_at_id",
+        "submenu",
+        ["parent_id", "created_at", "id"],
+    ),
+    ("ix_submenu_created_at_id", "submenu", ["created_at", "id"]),
+    (
+        "ix_dish_submenu_id_created_at_id",
+        "dish",
+        ["submenu_id", "created_at", "id"],
+    ),
+    ("ix_dish_created_at_id", "dish", ["created_at", "id"]),
+)
+# Очередь purge: помеченные строки по времени пометки
+REMOVED_INDEXES = (
+    ("ix_menu_removed_updated_at", "menu"),
+    ("ix_submenu_removed_updated_at", "submenu"),
+    ("ix_dish_removed_updated_at", "dish"),
+)
+
+
+def upgrade() -> None:
+    op.execute(SUBMENU_COUNTS_FUNCTION)
+    op.execute(DISH_COUNTS_FUNCTION)
+    op.execute("DROP TRIGGER submenu_counts_move ON submenu")
+    op.execute("DROP TRIGGER dish_counts_move ON dish")
+    for trigger in UPDATE_TRIGGERS:
+        op.execute(trigger)
+
+    for name, table_name, columns in LIVE_INDEXES:
+        op.drop_index(name, table_name=table_name)
+        op.create_index(
+            name,
+            table_name,
+            columns,
+            unique=False,
+            postgresql_where=sa.text("NOT is_removed"),
+        )
+    for name, table_name in REMOVED_INDEXES:
+        op.create_index(
+            name,
+            table_name,
+            ["updated_at"],
+            unique=False,
+            postgresql_where=sa.text("is_removed"),
+        )
+    # Каскадное удаление ищет подменю по parent_id среди всех строк,
+    # частичный индекс ему не подходит
+    op.create_index("ix_submenu_parent_id", "submenu", ["parent_id"], unique=False)
+
+
+def downgrade() -> None:
+    # Без помеченных строк новые функции счётчиков ведут себя как прежние,
+    # поэтому достаточно удалить помеченные строки и вернуть триггеры
+    for table_name in ("dish", "submenu", "menu"):
+        op.execute(f"DELETE FROM {table_name} WHERE is_removed")
+
+    op.drop_index("ix_submenu_parent_id", table_name="submenu")
+    for name, table_name in REMOVED_INDEXES:
+        op.drop_index(name, table_name=table_name)
+    for name, table_name, columns in LIVE_INDEXES:
+        op.drop_index(name, table_name=table_name)
+        op.create_index(name, table_name, columns, unique=False)
+
+    op.execute("DROP TRIGGER dish_counts_update ON dish")
+    op.execute("DROP TRIGGER submenu_counts_update ON submenu")
+    for trigger in MOVE_TRIGGERS:
+        op.execute(trigger)
@@ -1,3 +1,5 @@
 from .dish import *
 from .menu import *
 from .submenu import *
+from .tree import *
+from .bulk import *
@@ -0,0 +1,84 @@
+import uuid as uuid_pkg
+from collections import Counter
+
+from pydantic import root_validator
+from sqlmodel import Field, SQLModel
+
+from src.models.dish import DishBase
+from src.models.submenu import SubmenuBase
+
+__all__ = (
+    "BulkDelete",
+    "BulkDeleteResult",
+    "BulkResult",
+    "DishBulk",
+    "DishBulkItem",
+    "ImportResult",
+    "ImportRowError",
+    "SubmenuBulk",
+    "SubmenuBulkItem",
+)
+
+
+def check_unique(ids: list[uuid_pkg.UUID], name: str) -> None:
+    if duplicates := [str(id_) for id_, count in Counter(ids).items() if count > 1]:
+        raise ValueError(f"duplicate {name} ids: {', '.join(duplicates)}")
+
+
+class DishBulkItem(DishBase):
+    # Существующий id обновляет блюдо, без id создаётся новое
+    id: uuid_pkg.UUID = Field(default_factory=uuid_pkg.uuid4)
+
+
+class DishBulk(SQLModel):
+    __root__: list[DishBulkItem]
+
+    @root_validator(skip_on_failure=True)
+    def check_ids(cls, values):
+        check_unique([dish.id for dish in values["__root__"]], "dish")
+        return values
+
+
+class SubmenuBulkItem(SubmenuBase):
+    id: uuid_pkg.UUID = Field(default_factory=uuid_pkg.uuid4)
+    dishes: list[DishBulkItem] = Field(default_factory=list)
+
+
+class SubmenuBulk(SQLModel):
+    __root__: list[SubmenuBulkItem]
+
+    @root_validator(skip_on_failure=True)
+    def check_ids(cls, values):
+        submenus = values["__root__"]
+        check_unique([submenu.id for submenu in submenus], "submenu")
+        check_unique(
+            [dish.id for submenu in submenus for dish in submenu.dishes],
+            "dish",
+        )
+        return values
+
+
+class BulkResult(SQLModel):
+    submenus: int = 0
+    dishes: int = 0
+
+
+class ImportRowError(SQLModel):
+    line: int
+    message: str
+
+
+class ImportResult(SQLModel):
+    menus: int = 0
+    submenus: int = 0
+    dishes: int = 0
+    errors: list[ImportRowError] = Field(default_factory=list)
+
+
+class BulkDelete(SQLModel):
+    ids: list[uuid_pkg.UUID] = Field(min_items=1, max_items=1000)
+
+
+class BulkDeleteResult(SQLModel):
+    # Удалённые id; отсутствующие и чужие id пропускаются
+    deleted: list[uuid_pkg.UUID]
@@ -1,6 +1,7 @@
 import uuid as uuid_pkg
 
 from pydantic import condecimal
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.models.mixins import TimestampMixin, UUIDMixin
@@ -34,6 +35,29 @@ class DishBase(SQLModel):
 
 class Dish(TimestampMixin, DishBase, table=True):  # type: ignore
     __tablename__ = "dish"  # noqa
+    __table_args__ = (
+        # Постраничный список блюд подменю: ORDER BY created_at, id
+        Index(
+            "ix_dish_submenu_id_created_at_id",
+            "submenu_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_removed"),
+        ),
+        # Выгрузка всех блюд в том же порядке
+        Index(
+            "ix_dish_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_removed"),
+        ),
+        # Очередь purge
+        Index(
+            "ix_dish_removed_updated_at",
+            "updated_at",
+            postgresql_where=text("is_removed"),
+        ),
+    )
 
     is_removed: bool = Field(
         title="Флаг удаления",
@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.models.mixins import TimestampMixin, UUIDMixin
@@ -26,17 +27,48 @@ class MenuBase(SQLModel):
 
 class Menu(TimestampMixin, MenuBase, table=True):  # type: ignore
     __tablename__ = "menu"  # noqa
+    __table_args__ = (
+        # Постраничный список: ORDER BY created_at, id
+        Index(
+            "ix_menu_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_removed"),
+        ),
+        # Очередь purge
+        Index(
+            "ix_menu_removed_updated_at",
+            "updated_at",
+            postgresql_where=text("is_removed"),
+        ),
+    )
 
     is_removed: bool = Field(
         title="Флаг удаления",
         default=False,
         nullable=False,
     )
+    # Счётчики ведут триггеры в базе, см. миграцию add_children_counts
+    submenus_count: int = Field(
+        title="Количество подменю",
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("0")},
+    )
+    dishes_count: int = Field(
+        title="Количество блюд",
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("0")},
+    )
+    # Дочерние строки удаляет ON DELETE CASCADE в базе, см. миграцию
+    # cascade_foreign_keys: ORM не загружает их только ради удаления
     children: list["Submenu"] = Relationship(  # type: ignore
         back_populates="parent",
         sa_relationship_kwargs={
             "uselist": True,
             "cascade": "all, delete",
+            "passive_deletes": True,
         },
     )
     menu_dishes: list["Dish"] = Relationship(  # type: ignore
@@ -44,6 +76,7 @@ class Menu(TimestampMixin, MenuBase, table=True):  # type: ignore
         sa_relationship_kwargs={
             "uselist": True,
             "cascade": "all, delete",
+            "passive_deletes": True,
         },
     )
 
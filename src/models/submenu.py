@@ -1,5 +1,6 @@
 import uuid as uuid_pkg
 
+from sqlalchemy import Index, text
 from sqlmodel import Field, Relationship, SQLModel
 
 from src.models.mixins import TimestampMixin, UUIDMixin
@@ -29,26 +30,60 @@ class SubmenuBase(SQLModel):
 
 class Submenu(TimestampMixin, SubmenuBase, table=True):  # type: ignore
     __tablename__ = "submenu"  # noqa
+    __table_args__ = (
+        # Постраничный список подменю меню: ORDER BY created_at, id
+        Index(
+            "ix_submenu_parent_id_created_at_id",
+            "parent_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_removed"),
+        ),
+        # Выгрузка всех подменю в том же порядке
+        Index(
+            "ix_submenu_created_at_id",
+            "created_at",
+            "id",
+            postgresql_where=text("NOT is_removed"),
+        ),
+        # Очередь purge
+        Index(
+            "ix_submenu_removed_updated_at",
+            "updated_at",
+            postgresql_where=text("is_removed"),
+        ),
+    )
 
     is_removed: bool = Field(
         title="Флаг удаления",
         default=False,
         nullable=False,
     )
+    # Полный индекс нужен каскадному удалению: оно видит и удалённые строки
     parent_id: uuid_pkg.UUID = Field(
         title="Идентификатор родительского меню",
         default=None,
         nullable=True,
         foreign_key="menu.id",
+        index=True,
+    )
+    # Счётчик ведут триггеры в базе, см. миграцию add_children_counts
+    dishes_count: int = Field(
+        title="Количество блюд",
+        default=0,
+        nullable=False,
+        sa_column_kwargs={"server_default": text("0")},
     )
     parent: "Menu" = Relationship(  # type: ignore
         back_populates="children",
     )
+    # Блюда удаляет ON DELETE CASCADE в базе
     submenu_dishes: list["Dish"] = Relationship(  # type: ignore
         back_populates="submenu",
         sa_relationship_kwargs={
             "uselist": True,
             "cascade": "all, delete",
+            "passive_deletes": True,
         },
     )
 
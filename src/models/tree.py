@@ -0,0 +1,23 @@
+from sqlmodel import Field, SQLModel
+
+from src.models.dish import DishRead
+from src.models.menu import MenuRead
+from src.models.submenu import SubmenuRead
+
+__all__ = (
+    "MenuTree",
+    "MenuTreeList",
+    "SubmenuTree",
+)
+
+
+class SubmenuTree(SubmenuRead):
+    dishes: list[DishRead] = Field(default_factory=list)
+
+
+class MenuTree(MenuRead):
+    submenus: list[SubmenuTree] = Field(default_factory=list)
+
+
+class MenuTreeList(SQLModel):
+    __root__: list[MenuTree]
@@ -1,8 +1,9 @@
 import uuid as uuid_pkg
 
-from sqlalchemy import select
+from sqlalchemy import not_, select
+from sqlalchemy.sql import Select
 
-from src.models import Dish, DishCreate, DishUpdate
+from src.models import Dish, DishCreate, DishUpdate, Menu, Submenu
 
 __all__ = ("DishRepository",)
 
@@ -12,16 +13,31 @@ from src.repositories import AbstractRepository
 class DishRepository(AbstractRepository):
     model: type[Dish] = Dish  # type: ignore
 
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые блюда, у которых не удалены подменю и меню."""
+        return (
+            statement.join(Submenu, Submenu.id == Dish.submenu_id)
+            .join(Menu, Menu.id == Dish.menu_id)
+            .where(
+                not_(Dish.is_removed),
+                not_(Submenu.is_removed),
+                not_(Menu.is_removed),
+            )
+        )
+
     async def list(self, submenu_id: uuid_pkg.UUID) -> list[Dish]:
         statement = select(self.model).where(
             self.model.submenu_id == submenu_id,
         )
-        results = await self.session.execute(statement)
+        results = await self.session.execute(self.visible(statement))
         dishes: list[Dish] = results.scalars().all()
         return dishes
 
     async def get(self, dish_id: uuid_pkg.UUID) -> Dish | None:
-        dish: Dish | None = await self.session.get(self.model, dish_id)
+        statement = self.visible(select(self.model).where(self.model.id == dish_id))
+        results = await self.session.execute(statement=statement)
+        dish: Dish | None = results.scalar_one_or_none()
         return dish
 
     async def add(self, data: DishCreate) -> Dish:
@@ -41,9 +57,15 @@ class DishRepository(AbstractRepository):
             await self.session.refresh(updated_dish)
         return updated_dish
 
-    async def delete(self, dish_id: uuid_pkg.UUID) -> bool:
+    async def delete(
+        self,
+        dish_id: uuid_pkg.UUID,
+    ) -> tuple[uuid_pkg.UUID, uuid_pkg.UUID] | None:
+        """Удалить блюдо, вернуть его menu_id и submenu_id."""
         dish = await self.get(dish_id=dish_id)
-        if dish:
-            await self.session.delete(dish)
-            await self.session.commit()
-        return True
+        if not dish:
+            return None
+        parents = (dish.menu_id, dish.submenu_id)
+        await self.session.delete(dish)
+        await self.session.commit()
+        return parents
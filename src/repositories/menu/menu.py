@@ -2,6 +2,7 @@ import uuid as uuid_pkg
 
 import sqlalchemy as sa
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
 
 from src.models import Dish, Menu, MenuCreate, MenuUpdate, Submenu
 from src.repositories import AbstractRepository
@@ -12,6 +13,11 @@ __all__ = ("MenuRepository",)
 class MenuRepository(AbstractRepository):
     model: type[Menu] = Menu
 
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые меню."""
+        return statement.where(sa.not_(Menu.is_removed))
+
     async def list(self) -> list[Menu]:
         statement = (
             sa.select(
@@ -31,17 +37,24 @@ class MenuRepository(AbstractRepository):
                     0,
                 ).label("dishes_count"),
             )
+            # Удалённые подменю и блюда не попадают в счётчики
             .outerjoin(
                 Submenu,
-                self.model.id == Submenu.parent_id,
+                sa.and_(
+                    self.model.id == Submenu.parent_id,
+                    sa.not_(Submenu.is_removed),
+                ),
             )
             .outerjoin(
                 Dish,
-                Submenu.id == Dish.submenu_id,
+                sa.and_(
+                    Submenu.id == Dish.submenu_id,
+                    sa.not_(Dish.is_removed),
+                ),
             )
             .group_by(Menu.id)
         )
-        results = await self.session.execute(statement)
+        results = await self.session.execute(self.visible(statement))
         menus: list[Menu] = results.all()
         return menus
 
@@ -64,25 +77,32 @@ class MenuRepository(AbstractRepository):
                     0,
                 ).label("dishes_count"),
             )
+            # Удалённые подменю и блюда не попадают в счётчики
             .outerjoin(
                 Submenu,
-                self.model.id == Submenu.parent_id,
+                sa.and_(
+                    self.model.id == Submenu.parent_id,
+                    sa.not_(Submenu.is_removed),
+                ),
             )
             .outerjoin(
                 Dish,
-                Submenu.id == Dish.submenu_id,
+                sa.and_(
+                    Submenu.id == Dish.submenu_id,
+                    sa.not_(Dish.is_removed),
+                ),
             )
             .where(
                 self.model.id == menu_id,
             )
             .group_by(Menu.id)
         )
-        results = await self.session.execute(statement=statement)
+        results = await self.session.execute(statement=self.visible(statement))
         menu: Menu | None = results.one_or_none()
         return menu
 
     async def __get(self, menu_id: uuid_pkg.UUID) -> Menu | None:
-        statement = sa.select(self.model).where(self.model.id == menu_id)
+        statement = self.visible(sa.select(self.model).where(self.model.id == menu_id))
         results = await self.session.execute(statement=statement)
         menu: Menu | None = results.scalar_one_or_none()
         return menu
@@ -117,7 +137,7 @@ class MenuRepository(AbstractRepository):
                 self.model.id == menu_id,
             )
         )
-        menu = await self.session.scalar(statement)
+        menu = await self.session.scalar(self.visible(statement))
         if menu:
             await self.session.delete(menu)
             await self.session.commit()
@@ -35,7 +35,8 @@ class FakeSubmenuRepository(AbstractRepository):
                 setattr(updated_submenu, k, v)
         return updated_submenu
 
-    async def delete(self, submenu_id: uuid_pkg.UUID) -> bool:
+    async def delete(self, submenu_id: uuid_pkg.UUID) -> uuid_pkg.UUID | None:
         if deleted_submenu := await self.get(submenu_id=submenu_id):
             self.batches.remove(deleted_submenu)
-        return True
+            return deleted_submenu.parent_id
+        return None
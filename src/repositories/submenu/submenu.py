@@ -1,9 +1,10 @@
 import uuid as uuid_pkg
 
-from sqlalchemy import func, select
+from sqlalchemy import and_, func, not_, select
 from sqlalchemy.orm import joinedload
+from sqlalchemy.sql import Select
 
-from src.models import Submenu, SubmenuCreate, SubmenuUpdate
+from src.models import Dish, Menu, Submenu, SubmenuCreate, SubmenuUpdate
 from src.repositories import AbstractRepository
 
 __all__ = ("SubmenuRepository",)
@@ -12,23 +13,33 @@ __all__ = ("SubmenuRepository",)
 class SubmenuRepository(AbstractRepository):
     model: type[Submenu] = Submenu  # type: ignore
 
+    @staticmethod
+    def visible(statement: Select) -> Select:
+        """Только не удалённые подменю не удалённых меню."""
+        return statement.join(Menu, Menu.id == Submenu.parent_id).where(
+            not_(Submenu.is_removed),
+            not_(Menu.is_removed),
+        )
+
     async def list(self, menu_id: uuid_pkg.UUID) -> list[Submenu]:
         statement = (
             select(
                 self.model.id,
                 self.model.title,
                 self.model.description,
-                func.count(self.model.submenu_dishes).label("dishes_count"),
+                func.count(Dish.id).label("dishes_count"),
             )
+            # Удалённые блюда не попадают в счётчик
             .outerjoin(
-                self.model.submenu_dishes,
+                Dish,
+                and_(self.model.id == Dish.submenu_id, not_(Dish.is_removed)),
             )
             .where(
                 self.model.parent_id == menu_id,
             )
             .group_by(self.model.id)
         )
-        results = await self.session.execute(statement)
+        results = await self.session.execute(self.visible(statement))
         submenus: list[Submenu] = results.all()
         return submenus
 
@@ -38,22 +49,24 @@ class SubmenuRepository(AbstractRepository):
                 self.model.id,
                 self.model.title,
                 self.model.description,
-                func.count(self.model.submenu_dishes).label("dishes_count"),
+                func.count(Dish.id).label("dishes_count"),
             )
+            # Удалённые блюда не попадают в счётчик
             .outerjoin(
-                self.model.submenu_dishes,
+                Dish,
+                and_(self.model.id == Dish.submenu_id, not_(Dish.is_removed)),
             )
             .where(
                 self.model.id == submenu_id,
             )
             .group_by(self.model.id)
         )
-        results = await self.session.execute(statement=statement)
+        results = await self.session.execute(statement=self.visible(statement))
         submenu: Submenu | None = results.one_or_none()
         return submenu
 
     async def __get(self, submenu_id: uuid_pkg.UUID) -> Submenu | None:
-        statement = select(self.model).where(self.model.id == submenu_id)
+        statement = self.visible(select(self.model).where(self.model.id == submenu_id))
         results = await self.session.execute(statement=statement)
         submenu: Submenu | None = results.scalar_one_or_none()
         return submenu
@@ -79,7 +92,8 @@ class SubmenuRepository(AbstractRepository):
             await self.session.refresh(updated_submenu)
         return updated_submenu
 
-    async def delete(self, submenu_id: uuid_pkg.UUID) -> bool:
+    async def delete(self, submenu_id: uuid_pkg.UUID) -> uuid_pkg.UUID | None:
+        """Удалить подменю, вернуть id его меню, None - если нечего."""
         statement = (
             select(
                 self.model,
@@ -91,8 +105,10 @@ class SubmenuRepository(AbstractRepository):
                 self.model.id == submenu_id,
             )
         )
-        submenu = await self.session.scalar(statement)
-        if submenu:
-            await self.session.delete(submenu)
-            await self.session.commit()
-        return True
+        submenu = await self.session.scalar(self.visible(statement))
+        if not submenu:
+            return None
+        parent_id = submenu.parent_id
+        await self.session.delete(submenu)
+        await self.session.commit()
+        return parent_id
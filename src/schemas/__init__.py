@@ -1,2 +1,3 @@
 from .healthcheck import *
 from .status_message import *
+from .metrics import *
@@ -0,0 +1,12 @@
+__all__ = ("DatabaseMetrics",)
+
+from src.schemas.base import CamelJsonModel
+
+
+class DatabaseMetrics(CamelJsonModel):
+    compiled_cache_size: int
+    compiled_cache_hits: int
+    compiled_cache_misses: int
+    compiled_cache_uncached: int
+    compiled_cache_hit_rate: float
+    prepared_statement_cache_size: int
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from typing import ClassVar
 
+from src.db.cache import AbstractCache
 from src.repositories import AbstractRepository
 
 
@@ -7,6 +10,15 @@ class AbstractUnitOfWork(ABC):
     menu_repo: AbstractRepository
     submenu_repo: AbstractRepository
     dish_repo: AbstractRepository
+    # Поколение кэша в воркере: растёт с каждым сбросом тегов. Сборка ключа,
+    # начатая в прошлом поколении, могла прочитать данные до записи
+    generation: ClassVar[int] = 0
+
+    def __init__(self):
+        # Теги кэша, которые сбросятся после успешного коммита, по кэшам
+        self.invalidations: list[tuple[AbstractCache, set[str]]] = []
+        # Поколение кэша, открытое сбросом тегов этой записи; None - не сбрасывали
+        self.flushed_generation: int | None = None
 
     async def __aenter__(self, *args):
         return self
@@ -15,7 +27,50 @@ class AbstractUnitOfWork(ABC):
         try:
             await self.commit()
         except Exception:
+            # Запись не состоялась: сервис не должен продолжать как после
+            # успеха и класть объект в кэш
             await self.rollback()
+            self.invalidations.clear()
+            raise
+        await self.flush_invalidations()
+
+    def invalidate_after_commit(
+        self, cache: AbstractCache, tags: Iterable[str]
+    ) -> None:
+        """Поставить теги кэша в очередь на сброс после коммита.
+
+        Пока транзакция не закоммичена, читатель может снова положить
+        в кэш старые данные, поэтому сброс ждёт коммита.
+        """
+        for queued_cache, queued_tags in self.invalidations:
+            if queued_cache is cache:
+                queued_tags.update(tags)
+                return
+        self.invalidations.append((cache, set(tags)))
+
+    async def flush_invalidations(self) -> None:
+        """Сбросить накопленные теги одной операцией на кэш."""
+        invalidations, self.invalidations = self.invalidations, []
+        if any(tags for _, tags in invalidations):
+            # До сброса: начатая раньше сборка уже не запишет свой ключ
+            AbstractUnitOfWork.generation += 1
+            self.flushed_generation = AbstractUnitOfWork.generation
+        for cache, tags in invalidations:
+            if tags:
+                await cache.invalidate_tags(*tags)
+
+    @abstractmethod
+    def fork(self) -> "AbstractUnitOfWork":
+        """Новый unit of work со своей сессией, для работы вне запроса."""
+        raise NotImplementedError
+
+    async def snapshot(self) -> None:
+        """Читать все запросы транзакции из одного снимка базы, без записи."""
+        return None
+
+    async def replica(self) -> "AbstractUnitOfWork | None":
+        """Unit of work на реплике для чтения, None - читать с основной базы."""
+        return None
 
     @abstractmethod
     async def commit(self):
@@ -1,24 +1,127 @@
+from collections.abc import Callable
+from functools import cached_property
+
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.orm.query import FromStatement
 
-from src.api.v2.repositories import DishRepository, MenuRepository, SubmenuRepository
+from src.api.v2.repositories import (
+    DishRepository,
+    ImportRepository,
+    MenuRepository,
+    SubmenuRepository,
+)
+from src.db import db
 from src.uow import AbstractUnitOfWork
 
+SessionFactory = Callable[[], AsyncSession]
+
+# Флаг в session.info: в текущей транзакции что-то записано
+WRITTEN = "written"
+
+
+@event.listens_for(Session, "do_orm_execute")
+def mark_written_statement(state: ORMExecuteState) -> None:
+    statement = state.statement
+    # UPDATE ... RETURNING, разобранный в модели через from_statement
+    if isinstance(statement, FromStatement):
+        statement = statement.element
+    if not statement.is_select:
+        state.session.info[WRITTEN] = True
+
+
+@event.listens_for(Session, "after_flush")
+def mark_written_flush(session: Session, flush_context) -> None:
+    session.info[WRITTEN] = True
+
 
 class SqlAlchemyUnitOfWork(AbstractUnitOfWork):
-    def __init__(self, session: AsyncSession):
-        self.session = session
-        self.menu_repo: MenuRepository = MenuRepository(session=self.session)
-        self.submenu_repo: SubmenuRepository = SubmenuRepository(
-            session=self.session,
+    """Unit of work с ленивой сессией.
+
+    Сессия создаётся при первом обращении к репозиторию, поэтому запрос,
+    который целиком обслужен кэшем, не трогает пул соединений. Транзакция
+    без записей не коммитится: сессия просто закрывается.
+    """
+
+    def __init__(
+        self,
+        session_factory: SessionFactory = db.async_session,
+        replica_factory: SessionFactory | None = None,
+    ):
+        super().__init__()
+        self.session_factory = session_factory
+        self.replica_factory = replica_factory
+
+    @cached_property
+    def session(self) -> AsyncSession:
+        return self.session_factory()
+
+    @cached_property
+    def menu_repo(self) -> MenuRepository:
+        return MenuRepository(session=self.session)
+
+    @cached_property
+    def submenu_repo(self) -> SubmenuRepository:
+        return SubmenuRepository(session=self.session)
+
+    @cached_property
+    def dish_repo(self) -> DishRepository:
+        return DishRepository(session=self.session)
+
+    @cached_property
+    def import_repo(self) -> ImportRepository:
+        return ImportRepository(session=self.session)
+
+    @property
+    def has_session(self) -> bool:
+        return "session" in self.__dict__
+
+    def has_writes(self) -> bool:
+        session = self.session
+        return bool(
+            session.info.get(WRITTEN) or session.new or session.dirty or session.deleted
         )
-        self.dish_repo: DishRepository = DishRepository(session=self.session)
 
     async def __aexit__(self, *args):
-        await super().__aexit__(*args)
-        await self.session.close()
+        if not self.has_session:
+            return await self.flush_invalidations()
+        try:
+            if self.has_writes():
+                await super().__aexit__(*args)
+            else:
+                await self.flush_invalidations()
+        finally:
+            await self.session.close()
+
+    def fork(self) -> "SqlAlchemyUnitOfWork":
+        return SqlAlchemyUnitOfWork(
+            session_factory=self.session_factory,
+            replica_factory=self.replica_factory,
+        )
+
+    async def snapshot(self) -> None:
+        # Вызывается до первого запроса: уровень изоляции задаётся
+        # при начале транзакции и сбрасывается при возврате соединения в пул
+        await self.session.connection(
+            execution_options={
+                "isolation_level": "REPEATABLE READ",
+                "postgresql_readonly": True,
+            },
+        )
+
+    async def replica(self) -> "SqlAlchemyUnitOfWork | None":
+        if self.replica_factory is None or db.replica_monitor is None:
+            return None
+        if not await db.replica_monitor.is_usable():
+            return None
+        return SqlAlchemyUnitOfWork(session_factory=self.replica_factory)
 
     async def commit(self):
         await self.session.commit()
+        self.session.info.pop(WRITTEN, None)
 
     async def rollback(self):
         await self.session.rollback()
+        self.session.info.pop(WRITTEN, None)
+        self.invalidations.clear()
@@ -0,0 +1,85 @@
+import uuid
+from datetime import datetime
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.api.v2.repositories import DishRepository, MenuRepository, SubmenuRepository
+
+
+class Explain(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def compile_explain(element, compiler, **kwargs):
+    return f"EXPLAIN {compiler.process(element.statement, **kwargs)}"
+
+
+class EmptyResult:
+    def scalars(self):
+        return self
+
+    def mappings(self):
+        return self
+
+    def all(self):
+        return []
+
+    async def partitions(self):
+        for rows in ():
+            yield rows
+
+
+class RecordingSession:
+    """Сессия, которая запоминает запросы репозитория, не выполняя их."""
+
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement, params=None, *args, **kwargs):
+        self.statements.append((statement, params or {}))
+        return EmptyResult()
+
+    async def stream(self, statement, params=None, *args, **kwargs):
+        self.statements.append((statement, params or {}))
+        return EmptyResult()
+
+
+async def hot_statements():
+    """Запросы v2, которые выполняются на каждом чтении или выгрузке."""
+    session = RecordingSession()
+    menus = MenuRepository(session=session)
+    submenus = SubmenuRepository(session=session)
+    dishes = DishRepository(session=session)
+    after = (datetime.utcnow(), uuid.uuid4())
+
+    await menus.list(limit=50)
+    await menus.list(limit=50, after=after)
+    await submenus.list(menu_id=uuid.uuid4(), limit=50)
+    await submenus.list(menu_id=uuid.uuid4(), limit=50, after=after)
+    await dishes.list(submenu_id=uuid.uuid4(), limit=50)
+    await dishes.list(submenu_id=uuid.uuid4(), limit=50, after=after)
+    for repository in (menus, submenus, dishes):
+        async for _ in repository.stream_all(batch_size=1000):
+            pass
+    return session.statements
+
+
+@pytest.mark.asyncio
+async def test_hot_queries_use_indexes(async_session: AsyncSession):
+    # На пустых или маленьких таблицах последовательное чтение дешевле,
+    # поэтому запрещаем его: если подходящего индекса нет, план всё равно
+    # останется Seq Scan
+    await async_session.execute(text("SET LOCAL enable_seqscan = off"))
+    for statement, params in await hot_statements():
+        results = await async_session.execute(Explain(statement), params)
+        plan = "\n".join(results.scalars().all())
+        assert "Seq Scan" not in plan, f"{statement}\n{plan}"
+    await async_session.rollback()
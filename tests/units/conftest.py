@@ -0,0 +1,61 @@
+from dataclasses import dataclass, field
+
+import pytest
+
+from src.db.fake_cache import FakeCache
+from src.uow import AbstractUnitOfWork
+
+
+@dataclass
+class RecordingCache(FakeCache):
+    """FakeCache, который запоминает каждый вызов invalidate_tags."""
+
+    invalidations: list[tuple[str, ...]] = field(default_factory=list)
+
+    async def invalidate_tags(self, *tags: str) -> list[str]:
+        self.invalidations.append(tags)
+        return await super().invalidate_tags(*tags)
+
+
+class FakeUnitOfWork(AbstractUnitOfWork):
+    """Unit of work без базы: репозитории тест задаёт атрибутами *_repo."""
+
+    def __init__(self):
+        super().__init__()
+        self.entered = 0
+        self.rolled_back = False
+        self.replica_uow: AbstractUnitOfWork | None = None
+        self.forks: list[FakeUnitOfWork] = []
+
+    async def __aenter__(self, *args):
+        self.entered += 1
+        return self
+
+    def fork(self):
+        # Форк работает с теми же репозиториями, но своим unit of work
+        forked = FakeUnitOfWork()
+        for name, repo in vars(self).items():
+            if name.endswith("_repo"):
+                setattr(forked, name, repo)
+        self.forks.append(forked)
+        return forked
+
+    async def replica(self):
+        return self.replica_uow
+
+    async def commit(self):
+        return None
+
+    async def rollback(self):
+        self.rolled_back = True
+        self.invalidations.clear()
+
+
+@pytest.fixture
+def cache() -> RecordingCache:
+    return RecordingCache()
+
+
+@pytest.fixture
+def uow() -> FakeUnitOfWork:
+    return FakeUnitOfWork()
@@ -0,0 +1,93 @@
+import uuid
+from http import HTTPStatus
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.v2.services import DishService, MenuService
+from src.models import BulkDelete, DishBulk
+
+
+class FakeSubmenuRepository:
+    def __init__(self, submenu):
+        self.submenu = submenu
+
+    async def get(self, submenu_id):
+        return self.submenu
+
+
+class FakeDishRepository:
+    def __init__(self, foreign_ids=()):
+        self.foreign_ids = set(foreign_ids)
+        self.batches = []
+
+    async def upsert_many(self, values):
+        self.batches.append(values)
+        return [row["id"] for row in values if row["id"] not in self.foreign_ids]
+
+
+def make_dishes(count):
+    return DishBulk.parse_obj(
+        [{"title": f"dish {i}", "description": "", "price": 1} for i in range(count)],
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_writes_once_and_invalidates_once(cache, uow):
+    menu_id, submenu_id = uuid.uuid4(), uuid.uuid4()
+    uow.submenu_repo = FakeSubmenuRepository(SimpleNamespace(parent_id=menu_id))
+    uow.dish_repo = dish_repo = FakeDishRepository()
+
+    result = await DishService(cache=cache, uow=uow).bulk_upsert(
+        menu_id=menu_id,
+        submenu_id=submenu_id,
+        data=make_dishes(3),
+    )
+
+    assert result.dishes == 3
+    assert len(dish_repo.batches) == 1
+    assert {row["submenu_id"] for row in dish_repo.batches[0]} == {submenu_id}
+    assert len(cache.invalidations) == 1
+
+
+@pytest.mark.asyncio
+async def test_bulk_upsert_rejects_dishes_of_other_submenu(cache, uow):
+    menu_id = uuid.uuid4()
+    data = make_dishes(2)
+    uow.submenu_repo = FakeSubmenuRepository(SimpleNamespace(parent_id=menu_id))
+    uow.dish_repo = FakeDishRepository(foreign_ids=[data.__root__[0].id])
+
+    with pytest.raises(HTTPException) as error:
+        await DishService(cache=cache, uow=uow).bulk_upsert(
+            menu_id=menu_id,
+            submenu_id=uuid.uuid4(),
+            data=data,
+        )
+
+    assert error.value.status_code == HTTPStatus.CONFLICT
+    assert uow.rolled_back
+    assert cache.invalidations == []
+
+
+class FakeMenuRepository:
+    def __init__(self, existing):
+        self.existing = existing
+
+    async def delete_many(self, menu_ids):
+        return [menu_id for menu_id in menu_ids if menu_id in self.existing]
+
+
+@pytest.mark.asyncio
+async def test_delete_many_invalidates_deleted_menus_at_once(cache, uow):
+    first, second, missing = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    uow.menu_repo = FakeMenuRepository(existing={first, second})
+
+    result = await MenuService(cache=cache, uow=uow).delete_many(
+        data=BulkDelete(ids=[first, second, missing]),
+    )
+
+    assert result.deleted == [first, second]
+    [tags] = cache.invalidations
+    assert f"scope:menu:{first}" in tags and f"scope:menu:{second}" in tags
+    assert not any(str(missing) in tag for tag in tags)
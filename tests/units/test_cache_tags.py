@@ -0,0 +1,125 @@
+import uuid
+
+import pytest
+
+from src.api.v1.services import MenuService as V1MenuService
+from src.api.v2.services import (
+    CacheEvent,
+    CacheKey,
+    MenuService,
+    SubmenuService,
+    cache_tags,
+    invalidation_tags,
+)
+from src.models import Menu, MenuUpdate, Submenu
+
+
+class SubmenuRepository:
+    def __init__(self, submenu):
+        self.submenu = submenu
+
+    async def get(self, submenu_id):
+        return self.submenu
+
+
+class RemovedMenuRepository:
+    async def restore(self, menu_id):
+        return True
+
+    async def get(self, menu_id):
+        return Menu(id=menu_id, title="t", description="d")
+
+
+class V1MenuRepository:
+    async def update(self, menu_id, data):
+        return Menu(id=menu_id, title=data.title, description="d")
+
+
+@pytest.mark.asyncio
+async def test_dish_delete_keeps_other_submenus_cached(cache):
+    menu_id, submenu_id, other_submenu_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    for sid in (submenu_id, other_submenu_id):
+        await cache.set(
+            name=CacheKey.DISH_PAGE.format(submenu_id=sid, limit=10, cursor=""),
+            value=b"\n[]",
+            tags=cache_tags(CacheKey.DISH_PAGE, menu_id=menu_id, submenu_id=sid),
+        )
+
+    await cache.invalidate_tags(
+        *invalidation_tags(
+            CacheEvent.DISH_DELETE,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=uuid.uuid4(),
+        ),
+    )
+
+    page = {"limit": 10, "cursor": ""}
+    assert CacheKey.DISH_PAGE.format(submenu_id=submenu_id, **page) not in cache.cache
+    assert CacheKey.DISH_PAGE.format(submenu_id=other_submenu_id, **page) in cache.cache
+
+
+@pytest.mark.asyncio
+async def test_menu_delete_drops_whole_subtree(cache):
+    menu_id, submenu_id, dish_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    ids = {"menu_id": menu_id, "submenu_id": submenu_id, "dish_id": dish_id}
+    ids.update(limit=10, cursor="")
+    for key in (CacheKey.SUBMENU_DETAIL, CacheKey.DISH_PAGE, CacheKey.DISH_DETAIL):
+        await cache.set(
+            name=key.format(**ids), value=b"{}", tags=cache_tags(key, **ids)
+        )
+
+    await cache.invalidate_tags(
+        *invalidation_tags(CacheEvent.MENU_DELETE, menu_id=menu_id),
+    )
+
+    assert cache.cache == {}
+
+
+@pytest.mark.asyncio
+async def test_detail_is_tagged_with_real_parent_not_path(cache, uow):
+    menu_id, submenu_id = uuid.uuid4(), uuid.uuid4()
+    submenu = Submenu(id=submenu_id, title="t", description="d", parent_id=menu_id)
+    uow.submenu_repo = SubmenuRepository(submenu)
+    service = SubmenuService(cache=cache, uow=uow)
+
+    await service.get_detail(menu_id=uuid.uuid4(), submenu_id=submenu_id)
+    await cache.invalidate_tags(
+        *invalidation_tags(CacheEvent.MENU_DELETE, menu_id=menu_id),
+    )
+
+    assert cache.cache == {}
+
+
+@pytest.mark.asyncio
+async def test_v1_write_drops_v2_keys(cache):
+    menu_id = uuid.uuid4()
+    detail_key = CacheKey.MENU_DETAIL.format(menu_id=menu_id)
+    await cache.set(
+        name=detail_key,
+        value=b"{}",
+        tags=cache_tags(CacheKey.MENU_DETAIL, menu_id=menu_id),
+    )
+    service = V1MenuService(cache=cache, repository=V1MenuRepository())
+
+    await service.update(menu_id=menu_id, data=MenuUpdate(title="new"))
+
+    assert detail_key not in cache.cache
+
+
+@pytest.mark.asyncio
+async def test_restore_drops_children_cached_while_hidden(cache, uow):
+    menu_id = uuid.uuid4()
+    page_key = CacheKey.SUBMENU_PAGE.format(menu_id=menu_id, limit=50, cursor="")
+    await cache.set(
+        name=page_key,
+        value=b"\n[]",
+        tags=cache_tags(CacheKey.SUBMENU_PAGE, menu_id=menu_id),
+    )
+    uow.menu_repo = RemovedMenuRepository()
+
+    await MenuService(cache=cache, uow=uow).restore(menu_id=menu_id)
+
+    assert page_key not in cache.cache
+    [tags] = cache.invalidations
+    assert f"scope:menu:{menu_id}" in tags
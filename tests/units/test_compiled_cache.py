@@ -0,0 +1,19 @@
+import sqlalchemy as sa
+
+from src.db.metrics import CompiledCacheStats
+
+STATEMENT = sa.select(sa.bindparam("value", type_=sa.Integer))
+
+
+def test_prebuilt_statement_hits_compiled_cache():
+    engine = sa.create_engine("sqlite://", future=True)
+    stats = CompiledCacheStats()
+    stats.track(engine)
+
+    with engine.connect() as connection:
+        for value in range(3):
+            assert connection.execute(STATEMENT, {"value": value}).scalar() == value
+        connection.exec_driver_sql("select 1")
+
+    assert (stats.hits, stats.misses, stats.uncached) == (2, 1, 1)
+    assert stats.hit_rate == 2 / 3
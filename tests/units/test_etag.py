@@ -0,0 +1,32 @@
+import http
+
+from starlette.requests import Request
+
+from src.api.v2.resources.responses import conditional_response, make_etag
+
+
+def make_request(**headers: str) -> Request:
+    raw_headers = [(key.encode(), value.encode()) for key, value in headers.items()]
+    return Request({"type": "http", "headers": raw_headers})
+
+
+def test_matching_etag_returns_not_modified():
+    content = b'[{"id": 1}]'
+    response = conditional_response(
+        make_request(**{"if-none-match": f'"other", W/{make_etag(content)}'}),
+        content,
+    )
+
+    assert response.status_code == http.HTTPStatus.NOT_MODIFIED
+    assert response.body == b""
+    assert response.headers["etag"] == make_etag(content)
+
+
+def test_changed_content_returns_body():
+    response = conditional_response(
+        make_request(**{"if-none-match": make_etag(b"[]")}),
+        b'[{"id": 1}]',
+    )
+
+    assert response.status_code == http.HTTPStatus.OK
+    assert response.body == b'[{"id": 1}]'
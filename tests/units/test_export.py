@@ -0,0 +1,39 @@
+import uuid
+from decimal import Decimal
+
+import orjson
+import pytest
+
+from src.api.v2.services import ExportService
+
+
+class StreamingRepository:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def stream_all(self, batch_size):
+        for row in self.rows:
+            yield [row]
+
+
+@pytest.mark.asyncio
+async def test_export_writes_one_object_per_line(uow):
+    menu_id, submenu_id = uuid.uuid4(), uuid.uuid4()
+    uow.menu_repo = StreamingRepository(
+        [{"id": menu_id, "title": "menu"}, {"id": uuid.uuid4(), "title": "other"}],
+    )
+    uow.submenu_repo = StreamingRepository(
+        [{"id": submenu_id, "menu_id": menu_id, "title": "submenu"}],
+    )
+    uow.dish_repo = StreamingRepository(
+        [{"id": uuid.uuid4(), "submenu_id": submenu_id, "price": Decimal("1.50")}],
+    )
+    service = ExportService(cache=None, uow=uow)
+
+    chunks = [chunk async for chunk in service.export()]
+    lines = [orjson.loads(line) for line in b"".join(chunks).splitlines()]
+
+    assert len(chunks) == 4
+    assert [line["type"] for line in lines] == ["menu", "menu", "submenu", "dish"]
+    assert lines[2]["menu_id"] == str(menu_id)
+    assert lines[3]["price"] == "1.50"
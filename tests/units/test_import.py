@@ -0,0 +1,64 @@
+import uuid
+from decimal import Decimal
+
+import pytest
+
+from src.api.v2.services import ImportService
+
+CSV = (
+    "menu_title,menu_description,submenu_title,submenu_description,"
+    "dish_title,dish_description,dish_price\r\n"
+    'Menu,"first line\nsecond line",Soups,,Borsch,"with ""smetana""",12.50\r\n'
+    "Menu,,Soups,,Solyanka,,not a price\r\n"
+    ",,Soups,,,,\r\n"
+    "Menu,,,,Tea,,1\r\n"
+    "Menu,,Soups,,,,\r\n"
+)
+
+
+class FakeImportRepository:
+    def __init__(self):
+        self.records = []
+
+    async def create_staging(self):
+        return None
+
+    async def copy_rows(self, records):
+        self.records.extend(records)
+
+    async def reject_conflicts(self):
+        return []
+
+    async def merge(self):
+        menu_ids = list({record[1] for record in self.records})
+        submenus = len({record[4] for record in self.records})
+        dishes = len({record[7] for record in self.records if record[7]})
+        return menu_ids, submenus, dishes
+
+
+async def chunks(data: bytes, size: int):
+    # Куски режут записи, кавычки и многобайтовые символы посередине
+    for start in range(0, len(data), size):
+        yield data[start:][:size]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 7, 4096])
+async def test_import_streams_rows_and_reports_errors(cache, uow, size):
+    uow.import_repo = FakeImportRepository()
+    service = ImportService(cache=cache, uow=uow, batch_size=2)
+
+    result = await service.import_csv(chunks(("﻿" + CSV).encode(), size))
+
+    assert [error.line for error in result.errors] == [3, 4, 5]
+    assert result.errors[0].message.startswith("dish_price")
+    assert result.errors[2].message == "dish without submenu"
+    borsch, soups = uow.import_repo.records
+    assert borsch[3] == "first line\nsecond line"
+    assert borsch[9] == 'with "smetana"'
+    assert borsch[10] == Decimal("12.50")
+    # Без id в файле id выводятся из названий: повторный импорт обновляет
+    assert soups[1] == borsch[1] and soups[4] == borsch[4]
+    assert borsch[4] == uuid.uuid5(borsch[1], "Soups")
+    assert (result.menus, result.submenus, result.dishes) == (1, 1, 1)
+    assert len(cache.invalidations) == 1
@@ -0,0 +1,53 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+
+from src.api.v2.services import MenuService, decode_cursor, encode_cursor
+
+
+class PagedMenuRepository:
+    def __init__(self, rows):
+        self.rows = rows
+
+    async def list(self, limit=None, after=None):
+        rows = [
+            row
+            for row in self.rows
+            if after is None or (row.created_at, row.id) > after
+        ]
+        return rows[:limit]
+
+
+def test_cursor_round_trip():
+    row = SimpleNamespace(created_at=datetime(2023, 1, 8, 15, 18), id=uuid.uuid4())
+
+    assert decode_cursor(encode_cursor(row)) == (row.created_at, row.id)
+    with pytest.raises(HTTPException):
+        decode_cursor("not a cursor")
+
+
+@pytest.mark.asyncio
+async def test_pages_follow_next_cursor(cache, uow):
+    rows = [
+        SimpleNamespace(
+            id=uuid.UUID(int=index),
+            created_at=datetime(2023, 1, 8),
+            title=f"menu {index}",
+            description="",
+            submenus_count=0,
+            dishes_count=0,
+        )
+        for index in range(3)
+    ]
+    uow.menu_repo = PagedMenuRepository(rows)
+    service = MenuService(cache=cache, uow=uow)
+
+    first_page, next_cursor = await service.get_list(limit=2)
+    last_page, last_cursor = await service.get_list(limit=2, cursor=next_cursor)
+
+    assert first_page.count(b'"title"') == 2
+    assert b'"menu 2"' in last_page
+    assert last_cursor is None
@@ -0,0 +1,118 @@
+import asyncio
+import uuid
+
+import orjson
+import pytest
+
+from src import settings
+from src.api.v2.services import CacheKey, MenuService
+from src.api.v2.services.mixins import inflight
+from src.models import Menu, MenuUpdate
+
+
+class SlowMenuRepository:
+    def __init__(self):
+        self.calls = 0
+
+    async def list(self, limit=None, after=None):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return []
+
+    async def update(self, menu_id, data):
+        return Menu(id=menu_id, title=data.title, description="old")
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_build_key_once(cache, uow):
+    uow.menu_repo = SlowMenuRepository()
+    services = [MenuService(cache=cache, uow=uow) for _ in range(20)]
+
+    results = await asyncio.gather(
+        *(service.get_list(limit=10) for service in services)
+    )
+
+    assert uow.menu_repo.calls == 1
+    assert set(results) == {(b"[]", None)}
+    assert cache.locks == {}
+
+
+@pytest.mark.asyncio
+async def test_stale_hit_is_served_and_refreshed_in_background(cache, uow):
+    uow.menu_repo = SlowMenuRepository()
+    cache_key = CacheKey.MENU_PAGE.format(limit=10, cursor="")
+    await cache.set(name=cache_key, value=b"\nold", expire=300)
+    cache.expires[cache_key] -= 100
+    service = MenuService(cache=cache, uow=uow, cache_expire=300, cache_stale_time=60)
+
+    assert await service.get_list(limit=10) == (b"old", None)
+    await asyncio.gather(*(rebuild.task for rebuild in inflight.values()))
+
+    assert uow.entered == 0
+    assert uow.forks[0].entered == 1
+    assert uow.menu_repo.calls == 1
+    assert cache.cache[cache_key] == b"\n[]"
+
+
+@pytest.mark.asyncio
+async def test_update_writes_detail_and_rebuilds_first_page(cache, uow):
+    uow.menu_repo = SlowMenuRepository()
+    menu_id = uuid.uuid4()
+    service = MenuService(cache=cache, uow=uow, cache_write_through=True)
+
+    await service.update(menu_id=menu_id, data=MenuUpdate(title="new"))
+    await asyncio.gather(*(rebuild.task for rebuild in inflight.values()))
+
+    limit = settings.app.page_default_limit
+    detail = orjson.loads(await service.get_detail(menu_id=menu_id))
+    assert detail["title"] == "new"
+    assert uow.forks[0].entered == 1
+    assert uow.menu_repo.calls == 1
+    assert CacheKey.MENU_PAGE.format(limit=limit, cursor="") in cache.cache
+
+
+@pytest.mark.asyncio
+async def test_rebuild_started_before_write_is_superseded(cache, uow):
+    uow.menu_repo = SlowMenuRepository()
+    service = MenuService(cache=cache, uow=uow)
+    cache_key = CacheKey.MENU_PAGE.format(limit=10, cursor="")
+    old_read = asyncio.create_task(service.get_list(limit=10))
+    await asyncio.sleep(0.005)
+
+    uow.invalidate_after_commit(cache, ["menu-write"])
+    await uow.flush_invalidations()
+    new_read = asyncio.create_task(service.get_list(limit=10))
+
+    assert await old_read == (b"[]", None)
+    assert await new_read == (b"[]", None)
+    assert uow.menu_repo.calls == 2
+    assert cache.cache[cache_key] == b"\n[]"
+    assert inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_earlier_update_does_not_overwrite_later_one(cache, uow):
+    uow.menu_repo = SlowMenuRepository()
+    menu_id = uuid.uuid4()
+    first_uow = uow.fork()
+    flush = first_uow.flush_invalidations
+
+    async def flush_then_stall():
+        # Первая запись закоммичена, но до store успевает пройти вторая
+        await flush()
+        await asyncio.sleep(0.01)
+
+    first_uow.flush_invalidations = flush_then_stall
+    first = MenuService(cache=cache, uow=first_uow, cache_write_through=True)
+    second = MenuService(cache=cache, uow=uow, cache_write_through=True)
+
+    first_update = asyncio.create_task(
+        first.update(menu_id=menu_id, data=MenuUpdate(title="first")),
+    )
+    await asyncio.sleep(0.001)
+    await second.update(menu_id=menu_id, data=MenuUpdate(title="second"))
+    await first_update
+    await asyncio.gather(*(rebuild.task for rebuild in inflight.values()))
+
+    detail = orjson.loads(cache.cache[CacheKey.MENU_DETAIL.format(menu_id=menu_id)])
+    assert detail["title"] == "second"
@@ -0,0 +1,124 @@
+from functools import partial
+
+import pytest
+
+from src.db.redis_cache import (
+    INVALIDATE_TAGS_SCRIPT,
+    RELEASE_LOCK_SCRIPT,
+    TAG_KEY_SCRIPT,
+    RedisCache,
+    tag_key,
+)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return None
+
+    def set(self, name, value, ex):
+        self.commands.append(partial(self.redis.store, name, value, ex))
+
+    async def execute(self):
+        return [command() for command in self.commands]
+
+
+class FakeRedis:
+    """Redis в памяти с командами RedisCache; Lua-скрипты - их Python-двойники."""
+
+    def __init__(self):
+        self.values = {}
+        self.sets = {}
+        self.ttls = {}
+
+    def register_script(self, source):
+        run = {
+            INVALIDATE_TAGS_SCRIPT: self.invalidate_tags,
+            TAG_KEY_SCRIPT: self.tag_key,
+            RELEASE_LOCK_SCRIPT: None,
+        }[source]
+
+        async def script(keys, args=(), client=None):
+            if isinstance(client, FakePipeline):
+                client.commands.append(partial(run, keys, args))
+                return client
+            return run(keys, args)
+
+        return script
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def store(self, name, value, ex):
+        self.values[name] = value if isinstance(value, bytes) else value.encode()
+        self.ttls[name] = ex
+
+    async def mget(self, names):
+        return [self.values.get(name) for name in names]
+
+    async def delete(self, *names):
+        for name in names:
+            self.values.pop(name, None)
+            self.ttls.pop(name, None)
+
+    def tag_key(self, keys, args):
+        [key], [name, expire] = keys, args
+        self.sets.setdefault(key, set()).add(name)
+        if self.ttls.get(key, -1) < expire:
+            self.ttls[key] = expire
+
+    def invalidate_tags(self, keys, args):
+        deleted = []
+        for key in keys:
+            names = self.sets.pop(key, set())
+            for name in names:
+                self.values.pop(name, None)
+            deleted.extend(name.encode() for name in names)
+            self.ttls.pop(key, None)
+        return deleted
+
+
+@pytest.mark.asyncio
+async def test_short_lived_key_does_not_shorten_tag_set():
+    redis = FakeRedis()
+    cache = RedisCache(cache=redis)
+
+    await cache.set(name="menu:1", value=b"{}", expire=300, tags=["scope:menu:1"])
+    await cache.set(name="menu:1:page", value=b"[]", expire=30, tags=["scope:menu:1"])
+
+    assert redis.ttls[tag_key("scope:menu:1")] == 300
+    assert sorted(await cache.invalidate_tags("scope:menu:1")) == [
+        "menu:1",
+        "menu:1:page",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_batched_round_trip_with_tags():
+    redis = FakeRedis()
+    cache = RedisCache(cache=redis)
+
+    await cache.set_many(
+        mapping={"menu:1": {"title": "one"}, "menu:2": b'{"title":"two"}'},
+        expire=60,
+        tags={"menu:1": ["menus"], "menu:2": ["menus", "menu:2"]},
+    )
+    assert await cache.get_many(["menu:1", "menu:2", "menu:3"]) == [
+        {"title": "one"},
+        {"title": "two"},
+        None,
+    ]
+    assert redis.sets[tag_key("menus")] == {"menu:1", "menu:2"}
+
+    await cache.delete_many(["menu:1"])
+    assert await cache.get_many(["menu:1", "menu:2"]) == [None, {"title": "two"}]
+
+    assert await cache.invalidate_tags("menu:2") == ["menu:2"]
+    assert await cache.get_many(["menu:2"]) == [None]
+    assert await cache.get_many([]) == []
@@ -0,0 +1,46 @@
+import pytest
+
+from src.api.v2.services import MenuService
+from src.db.replica import ReplicaMonitor
+
+
+class StubMonitor(ReplicaMonitor):
+    def __init__(self, lags, **kwargs):
+        super().__init__(engine=None, **kwargs)
+        self.lags = list(lags)
+
+    async def measure(self):
+        return self.lags.pop(0)
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_a_write(cache, uow):
+    uow.replica_uow = replica = uow.fork()
+    service = MenuService(cache=cache, uow=uow, read_from_replica=True)
+
+    assert (await service.reader()).uow is replica
+    await service.mark_written()
+    assert (await service.reader()).uow is service.uow
+
+
+@pytest.mark.asyncio
+async def test_lagging_replica_is_skipped(cache, uow):
+    service = MenuService(cache=cache, uow=uow, read_from_replica=True)
+    assert (await service.reader()) is service
+
+
+@pytest.mark.asyncio
+async def test_monitor_checks_lag_once_per_interval():
+    monitor = StubMonitor([0.5, 3], max_lag=1, check_interval=60)
+    assert await monitor.is_usable()
+    assert await monitor.is_usable()
+    assert monitor.lags == [3]
+
+    monitor.checked_at -= 60
+    assert not await monitor.is_usable()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_replica_is_not_used():
+    monitor = StubMonitor([None], max_lag=1, check_interval=60)
+    assert not await monitor.is_usable()
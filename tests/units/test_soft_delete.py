@@ -0,0 +1,63 @@
+import uuid
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.api.v2.repositories import DishRepository, restore, soft_delete
+from src.models import Dish, Submenu
+from src.repositories import DishRepository as V1DishRepository
+from src.repositories import SubmenuRepository as V1SubmenuRepository
+
+
+def compile_sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_soft_delete_only_marks_live_rows():
+    sql = compile_sql(soft_delete(Dish, Dish.id == uuid.uuid4()))
+    assert sql.startswith("UPDATE dish SET")
+    assert "dish.is_removed = false" in sql
+    assert "RETURNING dish.id" in sql
+
+
+def test_restore_only_unmarks_removed_rows():
+    sql = compile_sql(restore(Dish, Dish.id == uuid.uuid4()))
+    assert "dish.is_removed = true" in sql
+
+
+def test_dish_is_hidden_with_its_parents():
+    sql = compile_sql(DishRepository.visible(Dish.__table__.select()))
+    for table in ("dish", "submenu", "menu"):
+        assert f"NOT {table}.is_removed" in sql
+
+
+def test_v1_reads_hide_removed_rows_and_parents():
+    dish_sql = compile_sql(V1DishRepository.visible(Dish.__table__.select()))
+    submenu_sql = compile_sql(V1SubmenuRepository.visible(Submenu.__table__.select()))
+    for table in ("dish", "submenu", "menu"):
+        assert f"NOT {table}.is_removed" in dish_sql
+    for table in ("submenu", "menu"):
+        assert f"NOT {table}.is_removed" in submenu_sql
+
+
+class CapturingSession:
+    def __init__(self):
+        self.statements = []
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=list))
+
+
+@pytest.mark.asyncio
+async def test_dish_delete_many_is_scoped_by_menu():
+    session = CapturingSession()
+    await DishRepository(session=session).delete_many(
+        menu_id=uuid.uuid4(),
+        submenu_id=uuid.uuid4(),
+        dish_ids=[uuid.uuid4()],
+    )
+    [statement] = session.statements
+    sql = compile_sql(statement)
+    assert "dish.menu_id = " in sql and "dish.submenu_id = " in sql
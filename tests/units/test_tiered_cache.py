@@ -0,0 +1,65 @@
+import asyncio
+
+import pytest
+
+from src.db.fake_cache import FakeCache
+from src.db.invalidation import FakeBroker
+from src.db.tiered_cache import TieredCache
+
+
+@pytest.mark.asyncio
+async def test_local_tier_is_bounded_lru():
+    backend = FakeCache()
+    cache = TieredCache(backend=backend, max_size=2)
+    for name in ("a", "b", "c"):
+        await backend.set(name=name, value={"name": name})
+        await cache.get(name=name)
+
+    assert list(cache.local) == ["b", "c"]
+
+    await cache.get(name="b")
+    await backend.set(name="d", value={"name": "d"})
+    await cache.get(name="d")
+
+    assert list(cache.local) == ["b", "d"]
+
+
+@pytest.mark.asyncio
+async def test_local_entries_expire():
+    backend = FakeCache()
+    cache = TieredCache(backend=backend, expire=-1)
+    await backend.set(name="menus", value=[1])
+    assert await cache.get(name="menus") == [1]
+
+    backend.cache["menus"] = [2]
+
+    assert await cache.get(name="menus") == [2]
+
+
+@pytest.mark.asyncio
+async def test_invalidate_tags_evicts_local_copies():
+    backend = FakeCache()
+    cache = TieredCache(backend=backend)
+    await cache.set(name="menus", value=[1], tags=["menus"])
+    assert await cache.get(name="menus") == [1]
+
+    await cache.invalidate_tags("menus")
+
+    assert await cache.get(name="menus") is None
+
+
+@pytest.mark.asyncio
+async def test_deletes_are_broadcast_to_other_workers():
+    backend, broker = FakeCache(), FakeBroker()
+    writer = TieredCache(backend=backend, broker=broker)
+    reader = TieredCache(backend=backend, broker=broker)
+    listener = asyncio.create_task(reader.listen())
+    await asyncio.sleep(0)
+
+    await backend.set(name="menus", value=[1], tags=["menus"])
+    assert await reader.get(name="menus") == [1]
+    await writer.invalidate_tags("menus")
+    await asyncio.sleep(0)
+
+    assert "menus" not in reader.local
+    listener.cancel()
@@ -0,0 +1,52 @@
+import uuid
+
+import orjson
+import pytest
+
+from src.api.v2.services import CacheKey, MenuService
+from src.models import Dish, Menu, Submenu
+
+
+class ListRepository:
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = 0
+
+    async def list(self):
+        self.calls += 1
+        return self.rows
+
+    async def list_all(self):
+        self.calls += 1
+        return self.rows
+
+
+@pytest.mark.asyncio
+async def test_tree_is_assembled_from_three_flat_lists(cache, uow):
+    menu = Menu(id=uuid.uuid4(), title="menu", description="")
+    empty_menu = Menu(id=uuid.uuid4(), title="empty", description="")
+    soups = Submenu(id=uuid.uuid4(), title="soups", description="", parent_id=menu.id)
+    tea = Submenu(id=uuid.uuid4(), title="tea", description="", parent_id=menu.id)
+    borsch = Dish(
+        id=uuid.uuid4(),
+        title="borsch",
+        description="",
+        price="12.50",
+        menu_id=menu.id,
+        submenu_id=soups.id,
+    )
+    uow.menu_repo = ListRepository([menu, empty_menu])
+    uow.submenu_repo = ListRepository([soups, tea])
+    uow.dish_repo = ListRepository([borsch])
+
+    tree = orjson.loads(await MenuService(cache=cache, uow=uow).get_tree())
+
+    assert [item["title"] for item in tree] == ["menu", "empty"]
+    assert [item["title"] for item in tree[0]["submenus"]] == ["soups", "tea"]
+    assert tree[0]["submenus"][0]["dishes"][0]["price"] == "12.50"
+    assert tree[0]["submenus"][1]["dishes"] == []
+    assert tree[1]["submenus"] == []
+    # Одна выборка на уровень, а не на каждое меню
+    repos = (uow.menu_repo, uow.submenu_repo, uow.dish_repo)
+    assert [repo.calls for repo in repos] == [1, 1, 1]
+    assert CacheKey.MENU_TREE in cache.cache
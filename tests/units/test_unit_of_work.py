@@ -0,0 +1,128 @@
+import pytest
+
+from src.api.v2.services import MenuService
+from src.models import MenuCreate
+from src.uow import SqlAlchemyUnitOfWork
+from src.uow.sqlalchemy import WRITTEN
+
+
+class FakeSession:
+    def __init__(self, calls=None, fail_commit=False):
+        self.info = {}
+        self.new = self.dirty = self.deleted = ()
+        self.calls = [] if calls is None else calls
+        self.fail_commit = fail_commit
+
+    async def commit(self):
+        self.calls.append("commit")
+        if self.fail_commit:
+            raise ConnectionError
+
+    async def rollback(self):
+        self.calls.append("rollback")
+
+    async def close(self):
+        self.calls.append("close")
+
+    async def connection(self, execution_options):
+        self.calls.append(("connection", execution_options))
+
+    def add(self, instance):
+        self.info[WRITTEN] = True
+
+
+class SessionFactory:
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.sessions = []
+
+    def __call__(self):
+        self.sessions.append(FakeSession(**self.kwargs))
+        return self.sessions[-1]
+
+
+class RecordingCache:
+    def __init__(self, calls):
+        self.calls = calls
+
+    async def invalidate_tags(self, *tags):
+        self.calls.append(("invalidate", set(tags)))
+        return []
+
+
+@pytest.mark.asyncio
+async def test_session_is_not_created_without_repository_access():
+    factory = SessionFactory()
+    async with SqlAlchemyUnitOfWork(session_factory=factory):
+        pass
+    assert factory.sessions == []
+
+
+@pytest.mark.asyncio
+async def test_read_only_work_is_closed_without_commit():
+    factory = SessionFactory()
+    uow = SqlAlchemyUnitOfWork(session_factory=factory)
+    async with uow:
+        assert uow.menu_repo.session is uow.dish_repo.session
+    assert factory.sessions[0].calls == ["close"]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_reads_one_read_only_transaction():
+    factory = SessionFactory()
+    uow = SqlAlchemyUnitOfWork(session_factory=factory)
+    async with uow:
+        await uow.snapshot()
+    options = {"isolation_level": "REPEATABLE READ", "postgresql_readonly": True}
+    assert factory.sessions[0].calls == [("connection", options), "close"]
+
+
+@pytest.mark.asyncio
+async def test_written_work_is_committed():
+    factory = SessionFactory()
+    uow = SqlAlchemyUnitOfWork(session_factory=factory)
+    async with uow:
+        uow.menu_repo.session.info[WRITTEN] = True
+    assert factory.sessions[0].calls == ["commit", "close"]
+    assert WRITTEN not in factory.sessions[0].info
+
+
+@pytest.mark.asyncio
+async def test_invalidations_are_flushed_once_after_commit():
+    calls = []
+    cache = RecordingCache(calls)
+    uow = SqlAlchemyUnitOfWork(session_factory=SessionFactory(calls=calls))
+    async with uow:
+        uow.menu_repo.session.info[WRITTEN] = True
+        uow.invalidate_after_commit(cache, ["menus", "menu:1"])
+        uow.invalidate_after_commit(cache, ["menus", "menus:tree"])
+        assert calls == []
+    assert calls == [
+        "commit",
+        ("invalidate", {"menus", "menu:1", "menus:tree"}),
+        "close",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_drops_invalidations():
+    calls = []
+    uow = SqlAlchemyUnitOfWork(
+        session_factory=SessionFactory(calls=calls, fail_commit=True),
+    )
+    with pytest.raises(ConnectionError):
+        async with uow:
+            uow.menu_repo.session.info[WRITTEN] = True
+            uow.invalidate_after_commit(RecordingCache(calls), ["menus"])
+    assert calls == ["commit", "rollback", "close"]
+
+
+@pytest.mark.asyncio
+async def test_failed_commit_is_not_written_through(cache):
+    uow = SqlAlchemyUnitOfWork(session_factory=SessionFactory(fail_commit=True))
+    service = MenuService(cache=cache, uow=uow, cache_write_through=True)
+
+    with pytest.raises(ConnectionError):
+        await service.create(data=MenuCreate(title="menu", description=""))
+
+    assert cache.cache == {}